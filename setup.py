@@ -13,6 +13,7 @@ setuptools.setup(
         "allure-pytest==2.13.5",
         "allure-python-commons==2.13.5",
         "annotated-types==0.7.0",
+        "anyio==4.8.0",
         "argcomplete==3.5.2",
         "attrs==24.3.0",
         "autoflake==2.3.1",
@@ -25,6 +26,9 @@ setuptools.setup(
         "email_validator==2.2.0",
         "Faker==33.1.0",
         "genson==1.3.0",
+        "h11==0.14.0",
+        "httpcore==1.0.7",
+        "httpx==0.28.1",
         "idna==3.10",
         "inflect==5.6.2",
         "iniconfig==2.0.0",
@@ -45,9 +49,16 @@ setuptools.setup(
         "PyYAML==6.0.2",
         "requests==2.32.3",
         "six==1.17.0",
+        "sniffio==1.3.1",
         "typing_extensions==4.12.2",
         "urllib3==2.3.0",
     ],
+    extras_require={
+        "fast": [
+            "ijson==3.3.0",
+            "orjson==3.10.12",
+        ],
+    },
     entry_points={
       "console_scripts": [
         "my-api-client=my_codegen.main:main",
@@ -0,0 +1,94 @@
+"""
+Сравнение однопроходного SwaggerProcessor.extract_endpoints с прежним алгоритмом,
+который заново анализировал операцию для каждого её тега.
+
+    python -m my_codegen.benchmarks.extract_endpoints --operations 5000 --tags-per-operation 3
+"""
+import argparse
+import time
+from typing import Callable, List
+
+from my_codegen.benchmarks.synthetic_spec import build_spec
+from my_codegen.codegen.data_models import Endpoint, Parameter
+from my_codegen.swagger.processor import HTTP_METHODS, SwaggerProcessor
+
+
+class PerTagSwaggerProcessor(SwaggerProcessor):
+    """
+    Эталон "как было": анализ операции повторяется для каждого тега,
+    параметры сканируются отдельно для path и для query.
+    """
+
+    def extract_endpoints(self) -> List[Endpoint]:
+        endpoints: List[Endpoint] = []
+        for path, methods in self.swagger.get('paths', {}).items():
+            methods = self.resolver.deref(methods)
+            for http_method, details in methods.items():
+                if http_method not in HTTP_METHODS:
+                    continue
+                for tag in details.get('tags', ['default']):
+                    parameters = [self.resolver.deref(p) for p in details.get('parameters', [])]
+                    request_body = self.resolver.deref(details.get('requestBody', {}))
+                    expected_status, return_type = self._extract_response_info(details.get('responses', {}))
+                    endpoints.append(Endpoint(
+                        tag=tag,
+                        name=self._determine_method_name(http_method, path, details),
+                        http_method=http_method.upper(),
+                        path=path,
+                        path_params=self._extract_parameters(parameters, 'path'),
+                        query_params=self._extract_parameters(parameters, 'query'),
+                        payload_type=self._extract_payload_type(request_body),
+                        expected_status=expected_status,
+                        return_type=return_type,
+                        description=details.get('description', details.get('summary', '')),
+                    ))
+        return endpoints
+
+    def _extract_parameters(self, parameters, location) -> List[Parameter]:
+        return [
+            Parameter(
+                name=param.get('name'),
+                type=self._map_openapi_type_to_python(param.get('schema', {})),
+                required=param.get('required', False),
+            )
+            for param in parameters
+            if param.get('in') == location
+        ]
+
+
+def best_of(func: Callable[[], object], repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="extract_endpoints benchmark")
+    parser.add_argument("--operations", type=int, default=5000)
+    parser.add_argument("--schemas", type=int, default=500)
+    parser.add_argument("--tags-per-operation", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    spec = build_spec(args.operations, args.schemas, args.tags_per_operation)
+    single_pass = SwaggerProcessor(spec)
+    per_tag = PerTagSwaggerProcessor(spec, single_pass.resolver)
+
+    count = len(single_pass.extract_endpoints())
+    baseline = best_of(per_tag.extract_endpoints, args.repeat)
+    current = best_of(single_pass.extract_endpoints, args.repeat)
+    started = time.perf_counter()
+    first = next(single_pass.iter_endpoints())
+    first_latency = time.perf_counter() - started
+
+    print(f"operations={args.operations} tags/op={args.tags_per_operation} endpoints={count}")
+    print(f"per-tag (old):      {baseline * 1000:8.1f} ms")
+    print(f"single pass (new):  {current * 1000:8.1f} ms  x{baseline / current:.2f}")
+    print(f"iter_endpoints() first item after {first_latency * 1000:.3f} ms ({first.name})")
+
+
+if __name__ == "__main__":
+    main()
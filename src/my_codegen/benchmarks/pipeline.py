@@ -0,0 +1,282 @@
+"""
+Поэтапный бенчмарк пайплайна генерации на синтетической спецификации: время каждой стадии
+(load, extract_endpoints, datamodel-codegen, fix_models_inheritance, generate_clients,
+format, facades), пик памяти и сравнение с сохранённым baseline.
+
+    python -m my_codegen.benchmarks.pipeline --paths 500 --schemas 300 --ref-depth 3 --save-baseline bench.json
+    python -m my_codegen.benchmarks.pipeline --paths 500 --schemas 300 --ref-depth 3 --baseline bench.json
+
+С --baseline код возврата 1, если какая-то стадия медленнее baseline больше чем на --threshold.
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional
+
+from my_codegen.benchmarks.synthetic_spec import build_spec
+from my_codegen.codegen.client_generator import ClientGenerator
+from my_codegen.codegen.facade_generator import FacadeGenerator
+from my_codegen.codegen.generate_app_facade import api_class_name, generate_app_facade
+from my_codegen.codegen.model_generator import ModelGenerator
+from my_codegen.swagger.loader import SwaggerLoader
+from my_codegen.swagger.processor import SwaggerProcessor
+from my_codegen.swagger.resolver import RefResolver
+from my_codegen.utils.memory import peak_children_rss_mb, peak_rss_mb
+
+STAGES = (
+    "load",
+    "extract_endpoints",
+    "datamodel_codegen",
+    "fix_models_inheritance",
+    "generate_clients",
+    "format",
+    "facades",
+)
+# Стадии короче этого не считаются регрессией: на них решает шум, а не код
+MIN_REGRESSION_SECONDS = 0.05
+MIN_REGRESSION_MB = 1.0
+
+
+@dataclass
+class StageResult:
+    seconds: float
+    # Пик Python-аллокаций стадии (tracemalloc); None без --trace-memory
+    peak_mb: Optional[float] = None
+
+
+@dataclass
+class BenchmarkResult:
+    params: Dict[str, Any]
+    stages: Dict[str, StageResult] = field(default_factory=dict)
+    peak_rss_mb: float = 0.0
+    peak_children_rss_mb: float = 0.0
+
+    @property
+    def total(self) -> float:
+        return sum(stage.seconds for stage in self.stages.values())
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data["total"] = self.total
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "BenchmarkResult":
+        return cls(
+            params=data.get("params", {}),
+            stages={name: StageResult(**stage) for name, stage in data.get("stages", {}).items()},
+            peak_rss_mb=data.get("peak_rss_mb", 0.0),
+            peak_children_rss_mb=data.get("peak_children_rss_mb", 0.0),
+        )
+
+
+class StageTimer:
+    def __init__(self, trace_memory: bool = False):
+        self.trace_memory = trace_memory
+        self.stages: Dict[str, StageResult] = {}
+
+    @contextmanager
+    def stage(self, name: str):
+        if self.trace_memory:
+            tracemalloc.start()
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            peak = None
+            if self.trace_memory:
+                peak = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+                tracemalloc.stop()
+            self.stages[name] = StageResult(elapsed, peak)
+
+
+def run_pipeline(spec: Dict[str, Any],
+                 work_dir: str,
+                 format_workers: Optional[int] = None,
+                 trace_memory: bool = False) -> Dict[str, StageResult]:
+    """
+    Те же шаги, что _generate_service в main.py, но без манифеста (каждая стадия работает
+    всегда) и с замером каждой стадии отдельно.
+    """
+    swagger_path = os.path.join(work_dir, "swagger.json")
+    with open(swagger_path, "w", encoding="utf-8") as f:
+        json.dump(spec, f)
+    base_output_dir = os.path.join(work_dir, "http_clients")
+    timer = StageTimer(trace_memory)
+
+    with timer.stage("load"):
+        loader = SwaggerLoader(swagger_path)
+        loader.load()
+        resolver = RefResolver(loader.swagger, base_uri=swagger_path)
+        service_name = loader.get_service_name()
+
+    service_dir = os.path.join(base_output_dir, service_name)
+    endpoints_dir = os.path.join(service_dir, "endpoints")
+    os.makedirs(endpoints_dir, exist_ok=True)
+
+    with timer.stage("extract_endpoints"):
+        processor = SwaggerProcessor(resolver.spec, resolver)
+        endpoints = processor.extract_endpoints()
+        imports = processor.extract_imports()
+
+    model_gen = ModelGenerator(swagger_path, os.path.join(service_dir, "models"))
+    with timer.stage("datamodel_codegen"):
+        model_gen.generate_models()
+
+    with timer.stage("fix_models_inheritance"):
+        model_gen.fix_models_inheritance()
+
+    client_gen = ClientGenerator(endpoints=endpoints, imports=imports, template_name="client_template.j2")
+    with timer.stage("generate_clients"):
+        file_to_class = client_gen.generate_clients(endpoints_dir, service_name)
+
+    model_files = model_gen.model_files()
+    with timer.stage("format"):
+        model_gen.post_process_code(
+            service_dir,
+            model_files + client_gen.written_files,
+            max_workers=format_workers,
+            unused_imports_paths=model_files,
+        )
+
+    with timer.stage("facades"):
+        FacadeGenerator(api_class_name(service_name), "facade_template.j2").generate_facade(
+            file_to_class, service_dir, "facade.py"
+        )
+        generate_app_facade("app_facade.j2", os.path.join(base_output_dir, "api_facade.py"), base_output_dir)
+
+    return timer.stages
+
+
+def run_benchmark(params: Dict[str, Any],
+                  repeat: int = 1,
+                  format_workers: Optional[int] = None,
+                  trace_memory: bool = False,
+                  keep_dir: Optional[str] = None) -> BenchmarkResult:
+    """
+    repeat прогонов, по каждой стадии берётся лучший (минимальный) результат.
+    """
+    spec = build_spec(
+        operations=params["paths"] * 4,
+        schemas=params["schemas"],
+        tags_per_operation=params["tags_per_operation"],
+        tags=params["tags"],
+        ref_depth=params["ref_depth"],
+    )
+    result = BenchmarkResult(params=params)
+    for _ in range(max(1, repeat)):
+        work_dir = tempfile.mkdtemp(prefix="my-codegen-bench-")
+        try:
+            stages = run_pipeline(spec, work_dir, format_workers, trace_memory)
+            for name, stage in stages.items():
+                best = result.stages.get(name)
+                if best is None or stage.seconds < best.seconds:
+                    result.stages[name] = stage
+            if keep_dir:
+                shutil.rmtree(keep_dir, ignore_errors=True)
+                shutil.copytree(work_dir, keep_dir)
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+    result.peak_rss_mb = peak_rss_mb()
+    result.peak_children_rss_mb = peak_children_rss_mb()
+    return result
+
+
+def compare(current: BenchmarkResult, baseline: BenchmarkResult, threshold: float) -> List[str]:
+    """
+    Список регрессий: стадия медленнее (или, при замерах памяти, прожорливее) baseline
+    больше чем в 1 + threshold раз.
+    """
+    regressions = []
+    if current.params != baseline.params:
+        regressions.append(f"parameters differ from baseline: {baseline.params} != {current.params}")
+        return regressions
+    for name, base in baseline.stages.items():
+        stage = current.stages.get(name)
+        if stage is None:
+            continue
+        if stage.seconds > base.seconds * (1 + threshold) and stage.seconds - base.seconds > MIN_REGRESSION_SECONDS:
+            regressions.append(
+                f"{name}: {stage.seconds:.3f}s vs baseline {base.seconds:.3f}s "
+                f"(+{(stage.seconds / base.seconds - 1) * 100:.0f}%)"
+            )
+        if stage.peak_mb is not None and base.peak_mb is not None \
+                and stage.peak_mb > base.peak_mb * (1 + threshold) \
+                and stage.peak_mb - base.peak_mb > MIN_REGRESSION_MB:
+            regressions.append(f"{name}: peak {stage.peak_mb:.1f} MB vs baseline {base.peak_mb:.1f} MB")
+    return regressions
+
+
+def format_report(result: BenchmarkResult, baseline: Optional[BenchmarkResult] = None) -> str:
+    lines = [f"params: {result.params}"]
+    for name in STAGES:
+        stage = result.stages.get(name)
+        if stage is None:
+            continue
+        line = f"  {name:<24}{stage.seconds * 1000:10.1f} ms"
+        if stage.peak_mb is not None:
+            line += f"  peak {stage.peak_mb:8.1f} MB"
+        base = baseline.stages.get(name) if baseline else None
+        if base is not None and base.seconds:
+            line += f"  x{stage.seconds / base.seconds:.2f} vs baseline"
+        lines.append(line)
+    lines.append(f"  {'total':<24}{result.total * 1000:10.1f} ms")
+    lines.append(f"peak RSS {result.peak_rss_mb:.0f} MB, largest child process {result.peak_children_rss_mb:.0f} MB")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Code generation pipeline benchmark")
+    parser.add_argument("--paths", type=int, default=250, help="Number of paths (4 operations each)")
+    parser.add_argument("--schemas", type=int, default=200)
+    parser.add_argument("--tags", type=int, default=20, help="Number of distinct tags (client classes)")
+    parser.add_argument("--tags-per-operation", type=int, default=2, help="Tag fan-out of each operation")
+    parser.add_argument("--ref-depth", type=int, default=1, help="Depth of nested $ref chains per schema")
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per stage; the best one is reported")
+    parser.add_argument("--format-workers", type=int, default=None)
+    parser.add_argument("--trace-memory", action="store_true", help="Per-stage tracemalloc peak (slows stages down)")
+    parser.add_argument("--baseline", help="Baseline JSON to compare against")
+    parser.add_argument("--save-baseline", help="Write this run as a baseline JSON")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed slowdown vs baseline (0.2 = 20%%)")
+    parser.add_argument("--keep-dir", help="Copy the generated output of the last run here")
+    args = parser.parse_args(argv)
+
+    params = {
+        "paths": args.paths,
+        "schemas": args.schemas,
+        "tags": args.tags,
+        "tags_per_operation": args.tags_per_operation,
+        "ref_depth": args.ref_depth,
+    }
+    result = run_benchmark(params, args.repeat, args.format_workers, args.trace_memory, args.keep_dir)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = BenchmarkResult.from_dict(json.load(f))
+    print(format_report(result, baseline))
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump(result.to_dict(), f, indent=2)
+        print(f"baseline written to {args.save_baseline}")
+
+    if baseline is not None:
+        regressions = compare(result, baseline, args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+        print(f"no regressions beyond {args.threshold * 100:.0f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+from typing import Any, Dict
+
+
+def build_spec(operations: int = 1000,
+               schemas: int = 200,
+               tags_per_operation: int = 2,
+               tags: int = 20,
+               ref_depth: int = 1) -> Dict[str, Any]:
+    """
+    Синтетическая OpenAPI 3 спецификация: operations операций (по 4 на путь),
+    schemas схем, каждая операция размечена tags_per_operation тегами.
+    ref_depth > 1 добавляет каждой схеме цепочку вложенных схем ModelNDetail1..(ref_depth - 1)
+    через $ref - глубина ссылок, которую разворачивают резолвер и datamodel-codegen.
+    """
+    schemas = max(schemas, 1)
+    components = {
+        f"Model{i}": {
+            "type": "object",
+            "required": ["id"],
+            "properties": {
+                "id": {"type": "string", "format": "uuid"},
+                "name": {"type": "string"},
+                "parent": {"$ref": f"#/components/schemas/Model{(i + 1) % schemas}"},
+            },
+        }
+        for i in range(schemas)
+    }
+    for i in range(schemas if ref_depth > 1 else 0):
+        chain = [f"Model{i}"] + [f"Model{i}Detail{level}" for level in range(1, ref_depth)]
+        for parent, child in zip(chain, chain[1:]):
+            components.setdefault(parent, {"type": "object", "properties": {}})
+            components[parent]["properties"]["detail"] = {"$ref": f"#/components/schemas/{child}"}
+            components[child] = {
+                "type": "object",
+                "properties": {"value": {"type": "string"}, "level": {"type": "integer"}},
+            }
+    parameters = {
+        "Limit": {"name": "limit", "in": "query", "schema": {"type": "integer"}},
+        "Offset": {"name": "offset", "in": "query", "schema": {"type": "integer"}},
+    }
+
+    paths: Dict[str, Any] = {}
+    methods = ("get", "post", "put", "delete")
+    for op in range(operations):
+        resource = op // len(methods)
+        http_method = methods[op % len(methods)]
+        model_ref = {"$ref": f"#/components/schemas/Model{op % schemas}"}
+        path_item = paths.setdefault(f"/resource{resource}/{{item_id}}", {
+            "parameters": [{"name": "item_id", "in": "path", "required": True, "schema": {"type": "string"}}],
+        })
+        operation = {
+            "tags": [f"tag{(op + t) % tags}" for t in range(tags_per_operation)],
+            "operationId": f"{http_method}_resource{resource}",
+            "summary": f"{http_method} resource {resource}",
+            "parameters": [{"$ref": "#/components/parameters/Limit"}, {"$ref": "#/components/parameters/Offset"}],
+            "responses": {
+                "200": {
+                    "description": "ok",
+                    "content": {"application/json": {"schema": {"type": "array", "items": model_ref}}},
+                },
+            },
+        }
+        if http_method in ("post", "put"):
+            operation["requestBody"] = {"content": {"application/json": {"schema": model_ref}}}
+        path_item[http_method] = operation
+
+    return {
+        "openapi": "3.0.1",
+        "info": {"title": "Synthetic", "version": "1.0"},
+        "paths": paths,
+        "components": {"schemas": components, "parameters": parameters},
+    }
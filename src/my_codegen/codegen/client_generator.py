@@ -1,16 +1,29 @@
 import os
-from typing import Dict, List
+from dataclasses import asdict
+from typing import Dict, Iterable, List, Optional
 from jinja2 import Environment, PackageLoader
 from my_codegen.codegen.data_models import Endpoint, SubPath
+from my_codegen.codegen.manifest import BuildManifest, hash_payload
 
 import re
 
+IDENTIFIER_PATTERN = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+TYPING_NAMES = {"Any", "Optional", "List", "Dict", "Union", "str", "int", "float", "bool", "bytes", "None"}
+
 
 class ClientGenerator:
-    def __init__(self, endpoints: List[Endpoint], imports: List[str], template_name: str):
+    def __init__(self,
+                 endpoints: List[Endpoint],
+                 imports: List[str],
+                 template_name: str,
+                 is_async: bool = False,
+                 parse_mode: Optional[str] = None):
         self.endpoints = endpoints
         self.imports = imports
+        self._known_models = set(imports)
         self.template_name = template_name
+        self.is_async = is_async
+        self.parse_mode = parse_mode
 
         self.env = Environment(
             loader=PackageLoader("my_codegen", "templates"),
@@ -18,18 +31,44 @@ class ClientGenerator:
             lstrip_blocks=True
         )
         self.template = self.env.get_template(self.template_name)
+        self.written_files: List[str] = []
 
-    def generate_clients(self, output_dir: str, service_name: str) -> Dict[str, str]:
+    def generate_clients(self,
+                         output_dir: str,
+                         service_name: str,
+                         manifest: Optional[BuildManifest] = None) -> Dict[str, str]:
         """
         Проходит по всем эндпоинтам, группирует по тегам, рендерит файлы.
         Возвращает { filename: className } для фасада.
+        Если передан manifest, теги с неизменившимися эндпоинтами не перерисовываются;
+        пути реально записанных файлов складываются в self.written_files.
         """
         os.makedirs(output_dir, exist_ok=True)
         grouped = self._group_endpoints_by_tag(self.endpoints)
         file_to_class = {}
+        self.written_files = []
+        models_import_path = f"http_clients.{service_name}.models"
 
         for tag, eps in grouped.items():
             class_name = self.class_name_from_tag(tag)
+            filename = f"{class_name.lower()}_client.py"
+            full_path = os.path.join(output_dir, filename)
+            file_to_class[filename] = class_name
+            imports = self.collect_model_imports(eps)
+
+            if manifest is not None:
+                digest = hash_payload({
+                    "endpoints": [asdict(ep) for ep in eps],
+                    "imports": imports,
+                    "models_import_path": models_import_path,
+                    "service_name": service_name,
+                    "template": self.template_name,
+                    "is_async": self.is_async,
+                    "parse_mode": self.parse_mode,
+                })
+                if manifest.client_fresh(tag, digest, full_path):
+                    continue
+
             base_path = self._determine_base_path(eps)
             sub_paths = self._collect_sub_paths(eps, base_path)
 
@@ -38,21 +77,39 @@ class ClientGenerator:
                 base_path=base_path,
                 sub_paths=sub_paths,
                 methods=eps,
-                imports=self.imports,
-                models_import_path=f"http_clients.{service_name}.models",
-                service_name=f"/{service_name}"
-
+                imports=imports,
+                models_import_path=models_import_path,
+                service_name=f"/{service_name}",
+                is_async=self.is_async,
+                parse_mode=self.parse_mode,
             )
 
-            filename = f"{class_name.lower()}_client.py"
-            full_path = os.path.join(output_dir, filename)
             with open(full_path, "w", encoding="utf-8") as f:
                 f.write(rendered)
-
-            file_to_class[filename] = class_name
+            self.written_files.append(full_path)
 
         return file_to_class
 
+    def models_by_tag(self) -> Dict[str, List[str]]:
+        """
+        { tag: модели, которые напрямую использует клиент тега }.
+        """
+        grouped = self._group_endpoints_by_tag(self.endpoints)
+        return {tag: self.collect_model_imports(eps) for tag, eps in grouped.items()}
+
+    def collect_model_imports(self, eps: Iterable[Endpoint]) -> List[str]:
+        """
+        Точный набор моделей, которые упоминаются в сигнатурах и возвратах эндпоинтов тега:
+        payload_type, return_type и типы обязательных path-параметров.
+        """
+        used = set()
+        for ep in eps:
+            type_hints = [ep.payload_type or "", ep.return_type]
+            type_hints.extend(p.type for p in ep.path_params if p.required)
+            for hint in type_hints:
+                used.update(IDENTIFIER_PATTERN.findall(hint))
+        return sorted(name for name in used - TYPING_NAMES if name in self._known_models)
+
     @staticmethod
     def class_name_from_tag(tag: str) -> str:
         """Простая логика: заменяем '-' -> '_', split и склеиваем в CamelCase."""
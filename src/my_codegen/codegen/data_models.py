@@ -1,6 +1,10 @@
+import re
 from dataclasses import dataclass, field
 from typing import List, Optional
 
+BUILTIN_TYPE_NAMES = {'Any', 'str', 'int', 'float', 'bool', 'bytes', 'None'}
+MODEL_NAME_PATTERN = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
+
 
 @dataclass
 class Parameter:
@@ -26,6 +30,21 @@ class Endpoint:
     def sanitized_path(self) -> str:
         return self.path if self.path.startswith("/") else f"/{self.path}"
 
+    @property
+    def returns_list(self) -> bool:
+        return self.return_type.startswith('List[')
+
+    @property
+    def return_model(self) -> Optional[str]:
+        """
+        Имя модели, в которую нужно завернуть ответ (для List[Model] - Model).
+        None для Any, примитивов, Dict[...] и Union[...]: такой ответ отдаётся как есть.
+        """
+        inner = self.return_type[5:-1] if self.returns_list else self.return_type
+        if MODEL_NAME_PATTERN.match(inner) and inner not in BUILTIN_TYPE_NAMES:
+            return inner
+        return None
+
     @property
     def method_parameters(self) -> List[str]:
         return [f"{p.name}: {p.type}" for p in self.path_params if p.required]
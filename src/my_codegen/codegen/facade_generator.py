@@ -4,9 +4,10 @@ from jinja2 import Environment, PackageLoader
 
 
 class FacadeGenerator:
-    def __init__(self, facade_class_name: str, template_name: str):
+    def __init__(self, facade_class_name: str, template_name: str, is_async: bool = False):
         self.facade_class_name = facade_class_name
         self.template_name = template_name
+        self.is_async = is_async
         self.env = Environment(
             loader=PackageLoader("my_codegen", "templates"),
             trim_blocks=True,
@@ -33,6 +34,7 @@ class FacadeGenerator:
         rendered = self.template.render(
             facade_class_name=self.facade_class_name,
             imports=imports_data,
+            is_async=self.is_async,
             docstring_indent="    "
         )
         facade_path = os.path.join(output_dir, file_name)
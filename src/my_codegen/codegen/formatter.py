@@ -0,0 +1,64 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Collection, Dict, List, Optional
+
+import autoflake
+import black
+
+BLACK_MODE = black.Mode()
+
+
+def format_source(source: str, remove_unused_imports: bool = True) -> str:
+    """
+    То же, что `autoflake --remove-all-unused-imports` + `black`, но через их Python API.
+    """
+    if remove_unused_imports:
+        source = autoflake.fix_code(source, remove_all_unused_imports=True)
+    return black.format_str(source, mode=BLACK_MODE)
+
+
+def format_file(path: str, remove_unused_imports: bool = True) -> Optional[str]:
+    """
+    Форматирует файл на месте. Файл перезаписывается только если содержимое поменялось.
+    Возвращает текст ошибки или None, если всё прошло успешно.
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            source = f.read()
+        formatted = format_source(source, remove_unused_imports)
+        if formatted != source:
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(formatted)
+    except Exception as e:  # noqa: BLE001 - ошибка одного файла не должна ронять остальные
+        return f"{type(e).__name__}: {e}"
+    return None
+
+
+def _format_file_task(args) -> Optional[str]:
+    return format_file(*args)
+
+
+def format_files(paths: List[str],
+                 unused_imports_paths: Optional[Collection[str]] = None,
+                 max_workers: Optional[int] = None) -> Dict[str, str]:
+    """
+    Форматирует переданные файлы, раскидывая их по пулу процессов.
+    autoflake запускается только для файлов из unused_imports_paths (None - для всех).
+    Возвращает { path: error } для файлов, которые отформатировать не удалось.
+    """
+    if not paths:
+        return {}
+    workers = min(max_workers or os.cpu_count() or 1, len(paths))
+    tasks = [
+        (path, unused_imports_paths is None or path in unused_imports_paths)
+        for path in paths
+    ]
+
+    if workers <= 1:
+        results = [_format_file_task(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            chunksize = max(1, len(tasks) // (workers * 4))
+            results = list(pool.map(_format_file_task, tasks, chunksize=chunksize))
+
+    return {path: error for path, error in zip(paths, results) if error is not None}
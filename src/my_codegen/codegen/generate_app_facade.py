@@ -3,6 +3,13 @@ from typing import List, Dict
 from jinja2 import Environment, PackageLoader
 
 
+def api_class_name(service_name: str) -> str:
+    """
+    pet_store -> PetStoreApi. Один и тот же класс и в facade.py сервиса, и в api_facade.py.
+    """
+    return "".join(word.capitalize() for word in service_name.split("_")) + "Api"
+
+
 def find_services_with_facade(base_dir: str = "http_clients") -> List[Dict[str, str]]:
     services_info = []
     for item in os.listdir(base_dir):
@@ -10,10 +17,7 @@ def find_services_with_facade(base_dir: str = "http_clients") -> List[Dict[str,
         if os.path.isdir(service_path):
             facade_file = os.path.join(service_path, "facade.py")
             if os.path.exists(facade_file):
-                api_class = (
-                    "".join(word.capitalize() for word in item.split("_")) + "Api"
-                )
-                services_info.append({"service_name": item, "api_class": api_class})
+                services_info.append({"service_name": item, "api_class": api_class_name(item)})
     return services_info
 
 
@@ -0,0 +1,191 @@
+import hashlib
+import json
+import os
+from typing import Any, Dict, Iterable, List, Optional
+
+import my_codegen
+
+MANIFEST_FILE = ".codegen-manifest.json"
+PACKAGE_DIR = os.path.dirname(my_codegen.__file__)
+TEMPLATES_DIR = os.path.join(PACKAGE_DIR, "templates")
+# Шаблоны, из которых собираются модели (пакет models/ при раскладке modular)
+MODELS_TEMPLATES = ("models_init.j2",)
+# Код, от которого зависит результат генерации: __version__ при правках не меняется
+GENERATOR_SOURCES = ("main.py", "codegen", "swagger")
+
+
+def hash_payload(payload: Any) -> str:
+    """
+    Стабильный sha256 от JSON-представления объекта (ключи сортируются).
+    """
+    raw = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def hash_templates(templates_dir: str = TEMPLATES_DIR, names: Optional[Iterable[str]] = None) -> str:
+    """
+    Хэш содержимого jinja-шаблонов (всех или только names): любое изменение шаблона
+    инвалидирует то, что из него собрано.
+    """
+    selected = set(names) if names is not None else None
+    digest = hashlib.sha256()
+    for name in sorted(os.listdir(templates_dir)):
+        if not name.endswith(".j2") or (selected is not None and name not in selected):
+            continue
+        digest.update(name.encode("utf-8"))
+        with open(os.path.join(templates_dir, name), "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def hash_sources(package_dir: str = PACKAGE_DIR, sources: Iterable[str] = GENERATOR_SOURCES) -> str:
+    """
+    Хэш исходников генератора: правка генератора без смены версии тоже пересобирает всё.
+    """
+    paths: List[str] = []
+    for source in sources:
+        path = os.path.join(package_dir, source)
+        if os.path.isdir(path):
+            paths.extend(
+                os.path.join(root, name)
+                for root, _, names in os.walk(path)
+                for name in names if name.endswith(".py")
+            )
+        elif os.path.exists(path):
+            paths.append(path)
+    digest = hashlib.sha256()
+    for path in sorted(paths):
+        digest.update(os.path.relpath(path, package_dir).replace(os.sep, "/").encode("utf-8"))
+        with open(path, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+class BuildManifest:
+    """
+    Манифест сборки сервиса: http_clients/<service>/.codegen-manifest.json.
+    Хранит хэши входных данных каждой стадии, чтобы при повторном запуске
+    пропускать стадии и клиентские файлы, входы которых не поменялись.
+    """
+
+    def __init__(self, service_dir: str, force: bool = False):
+        self.path = os.path.join(service_dir, MANIFEST_FILE)
+        self.previous: Dict[str, Any] = {} if force else self._read(self.path)
+        self.current: Dict[str, Any] = {
+            "generator_version": my_codegen.__version__,
+            "generator_source": hash_sources(),
+            "templates": hash_templates(),
+            "models_templates": hash_templates(names=MODELS_TEMPLATES),
+            "spec": None,
+            "external_refs": [],
+            "models": None,
+            "tags": {},
+        }
+
+    @staticmethod
+    def _read(path: str) -> Dict[str, Any]:
+        if not os.path.exists(path):
+            return {}
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _same_toolchain(self, templates: str) -> bool:
+        """
+        Тот же генератор (версия и исходники) и те же шаблоны стадии: templates - ключ
+        манифеста с их хэшем ("templates" для клиентов, "models_templates" для моделей).
+        """
+        return all(
+            self.previous.get(key) == self.current[key]
+            for key in ("generator_version", "generator_source", templates)
+        )
+
+    def spec_fresh(self, spec_digest: str) -> bool:
+        """
+        True, если прошлая сборка целиком сделана из той же спецификации (и с теми же
+        настройками - spec_digest их учитывает) тем же генератором и её файлы на месте:
+        тогда сервис можно не парсить вовсе.
+        """
+        if not self._same_toolchain("templates") or self.previous.get("spec") != spec_digest:
+            return False
+        service_dir = os.path.dirname(self.path)
+        models_exist = os.path.exists(os.path.join(service_dir, "models.py")) or os.path.exists(
+            os.path.join(service_dir, "models", "__init__.py")
+        )
+        files = [os.path.join(service_dir, "facade.py")]
+        files += [
+            os.path.join(service_dir, "endpoints", info["file"])
+            for info in self.previous.get("tags", {}).values()
+        ]
+        return models_exist and all(os.path.exists(path) for path in files)
+
+    def record_spec(self, spec_digest: str, external_refs: List[str] = ()) -> None:
+        self.current["spec"] = spec_digest
+        self.current["external_refs"] = list(external_refs)
+
+    def external_refs(self) -> List[str]:
+        """
+        Внешние $ref-документы прошлой сборки: их хэши входят в spec_digest.
+        """
+        return list(self.previous.get("external_refs", []))
+
+    def models_fresh(self, schemas_digest: str, models_path: str) -> bool:
+        """
+        True, если модели сгенерированы из тех же components.schemas (и настроек раскладки)
+        тем же генератором по тем же шаблонам моделей.
+        """
+        self.current["models"] = schemas_digest
+        return (
+            self._same_toolchain("models_templates")
+            and self.previous.get("models") == schemas_digest
+            and os.path.exists(models_path)
+        )
+
+    def client_fresh(self, tag: str, tag_digest: str, file_path: str) -> bool:
+        """
+        Регистрирует клиента тега в текущем манифесте и сообщает, можно ли не перерисовывать файл.
+        """
+        filename = os.path.basename(file_path)
+        self.current["tags"][tag] = {"hash": tag_digest, "file": filename}
+        previous = self.previous.get("tags", {}).get(tag, {})
+        return (
+            self._same_toolchain("templates")
+            and previous.get("hash") == tag_digest
+            and previous.get("file") == filename
+            and os.path.exists(file_path)
+        )
+
+    def forget(self, file_path: str) -> None:
+        """
+        Убирает файл из текущего манифеста, чтобы следующий запуск сгенерировал его заново.
+        """
+        filename = os.path.basename(file_path)
+        self.current["spec"] = None
+        in_models_package = os.path.basename(os.path.dirname(file_path)) == "models"
+        if filename == "models.py" or in_models_package:
+            self.current["models"] = None
+        self.current["tags"] = {
+            tag: info for tag, info in self.current["tags"].items() if info["file"] != filename
+        }
+
+    def stale_files(self) -> List[str]:
+        """
+        Файлы клиентов тегов, которые были в прошлой сборке, но исчезли из спецификации.
+        """
+        current_files = {info["file"] for info in self.current["tags"].values()}
+        return sorted(
+            info["file"]
+            for tag, info in self.previous.get("tags", {}).items()
+            if info.get("file") and info["file"] not in current_files
+        )
+
+    def save(self) -> None:
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(self.current, f, indent=2, sort_keys=True)
+            f.write("\n")
+
+
+def schemas_digest(swagger: Dict[str, Any]) -> str:
+    return hash_payload(swagger.get("components", {}).get("schemas", {}))
@@ -1,5 +1,11 @@
 import os
 import re
+import shutil
+from typing import Dict, List, Optional
+
+from my_codegen.codegen.formatter import format_files
+from my_codegen.codegen.model_splitter import ModelSplitter
+from my_codegen.utils.logger import logger
 from my_codegen.utils.shell import run_command
 
 
@@ -11,8 +17,11 @@ class ModelGenerator:
     def generate_models(self) -> None:
         """
         Запускает datamodel-codegen, чтобы сгенерировать Pydantic-модели на основе Swagger.
-        Результат - файл {self.models_file}.py.
+        Результат - файл {self.models_file}.py (пакет {self.models_file}/ от прошлой
+        модульной сборки удаляется, иначе он перекрыл бы models.py при импорте).
         """
+        if os.path.isdir(self.models_file):
+            shutil.rmtree(self.models_file)
         model_cmd = (
             f"datamodel-codegen --input {self.swagger_path} "
             "--input-file-type openapi "
@@ -25,16 +34,38 @@ class ModelGenerator:
         )
         run_command(model_cmd)
 
+    def split_models(self, group_by: str = "schema", tag_models: Optional[Dict[str, List[str]]] = None) -> List[str]:
+        """
+        Разбивает {self.models_file}.py на пакет {self.models_file}/ с ленивой загрузкой подмодулей.
+        Возвращает пути модулей с моделями.
+        """
+        splitter = ModelSplitter(self.models_file + ".py", self.models_file, group_by, tag_models)
+        return splitter.split()
+
+    def model_files(self) -> List[str]:
+        """
+        Файлы с моделями: models.py или модули пакета models/ (кроме ленивого __init__.py).
+        """
+        if os.path.isdir(self.models_file):
+            return sorted(
+                os.path.join(self.models_file, name)
+                for name in os.listdir(self.models_file)
+                if name.endswith(".py") and name != "__init__.py"
+            )
+        models_path = self.models_file + ".py"
+        return [models_path] if os.path.exists(models_path) else []
+
     def fix_models_inheritance(self) -> None:
         """
-        Заменяет наследование BaseModel -> BaseConfigModel в итоговом файле моделей,
+        Заменяет наследование BaseModel -> BaseConfigModel в каждом файле моделей,
         а также правит импорт, убирая 'BaseModel' из 'from pydantic import ...'
         и добавляя при необходимости 'from http_clients.pydantic_config import BaseConfigModel'.
         """
-        models_path = self.models_file + ".py"
-        if not os.path.exists(models_path):
-            return
+        for models_path in self.model_files():
+            self._fix_file_inheritance(models_path)
 
+    @staticmethod
+    def _fix_file_inheritance(models_path: str) -> None:
         with open(models_path, 'r', encoding='utf-8') as f:
             lines = f.readlines()
 
@@ -86,17 +117,25 @@ class ModelGenerator:
         with open(models_path, 'w', encoding='utf-8') as f:
             f.writelines(new_lines)
 
-    def post_process_code(self, output_dir: str) -> None:
+    def post_process_code(self,
+                          output_dir: str,
+                          paths: Optional[List[str]] = None,
+                          max_workers: Optional[int] = None,
+                          unused_imports_paths: Optional[List[str]] = None) -> Dict[str, str]:
         """
-        Запускает autoflake и black для автоформатирования и удаления неиспользуемых импортов.
+        Удаляет неиспользуемые импорты (autoflake) и форматирует (black) in-process, параллельно.
+        Если передан paths, обрабатываются только эти файлы, иначе все *.py в output_dir.
+        autoflake нужен только там, где импорты не посчитаны точно (unused_imports_paths, None - везде).
+        Ошибки не прерывают генерацию: возвращается { path: error } по каждому упавшему файлу.
         """
-        autoflake_cmd = (
-            "autoflake "
-            "--remove-all-unused-imports "
-            "--recursive "
-            "--in-place "
-            f"'{output_dir}'"
-        )
-        black_cmd = f"black '{output_dir}'"
-        run_command(autoflake_cmd)
-        run_command(black_cmd)
+        if paths is None:
+            paths = [
+                os.path.join(root, name)
+                for root, _, files in os.walk(output_dir)
+                for name in files
+                if name.endswith(".py")
+            ]
+        errors = format_files(paths, unused_imports_paths, max_workers=max_workers)
+        for path, error in errors.items():
+            logger.error(f"Failed to format '{path}': {error}")
+        return errors
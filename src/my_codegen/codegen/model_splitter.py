@@ -0,0 +1,260 @@
+import ast
+import os
+import re
+from typing import Dict, List, Optional, Set
+
+from jinja2 import Environment, PackageLoader
+
+SHARED_MODULE = "shared"
+UNUSED_MODULE = "other"
+
+
+def snake_case(name: str) -> str:
+    name = re.sub(r"(?<=[a-z0-9])([A-Z])", r"_\1", name)
+    name = re.sub(r"[^a-zA-Z0-9]+", "_", name).strip("_").lower()
+    return name if name and not name[0].isdigit() else f"m_{name}"
+
+
+class ModelSplitter:
+    """
+    Разбивает models.py от datamodel-codegen на пакет models/ с модулем на группу схем
+    и ленивым __init__ (PEP 562 __getattr__): подмодуль импортируется при первом
+    обращении к имени, так что клиент тянет только те модели, которые использует.
+
+    group_by="schema": модуль на схему; взаимно рекурсивные схемы (компонента сильной
+    связности графа зависимостей) лежат в одном модуле, чтобы не было циклических импортов.
+    group_by="tag": модуль на тег для схем, нужных только одному тегу, общий "shared"
+    для схем нескольких тегов и "other" для схем, которые не использует ни один эндпоинт.
+    """
+
+    def __init__(self,
+                 models_path: str,
+                 package_dir: str,
+                 group_by: str = "schema",
+                 tag_models: Optional[Dict[str, List[str]]] = None):
+        if group_by not in ("schema", "tag"):
+            raise ValueError(f"Unknown models grouping: {group_by}")
+        self.models_path = models_path
+        self.package_dir = package_dir
+        self.group_by = group_by
+        self.tag_models = tag_models or {}
+        self.env = Environment(
+            loader=PackageLoader("my_codegen", "templates"),
+            trim_blocks=True,
+            lstrip_blocks=True
+        )
+
+    def split(self) -> List[str]:
+        """
+        Пишет пакет и возвращает пути модулей с моделями (без __init__.py).
+        """
+        with open(self.models_path, "r", encoding="utf-8") as f:
+            source = f.read()
+        lines = source.splitlines(keepends=True)
+        tree = ast.parse(source)
+
+        header_end = 0
+        definitions: Dict[str, str] = {}
+        order: List[str] = []
+        trailing: Dict[str, List[str]] = {}
+        for node in tree.body:
+            start = min([node.lineno] + [d.lineno for d in getattr(node, "decorator_list", [])])
+            text = "".join(lines[start - 1:node.end_lineno])
+            if isinstance(node, (ast.Import, ast.ImportFrom)) and not definitions:
+                header_end = node.end_lineno
+                continue
+            name = self._defined_name(node)
+            if name is not None:
+                definitions[name] = text
+                order.append(name)
+            elif order:
+                owner = self._statement_owner(node)
+                # Непонятно чья строка - оставляем рядом с предыдущим определением
+                trailing.setdefault(owner if owner in definitions else order[-1], []).append(text)
+            else:
+                header_end = node.end_lineno
+        header = "".join(lines[:header_end])
+
+        dependencies = {
+            name: self._referenced_names(node, definitions) - {name}
+            for node in tree.body
+            for name in [self._defined_name(node)]
+            if name is not None
+        }
+        modules = self._assign_modules(order, dependencies)
+
+        os.makedirs(self.package_dir, exist_ok=True)
+        written = []
+        for module_name, names in self._group(order, modules).items():
+            path = os.path.join(self.package_dir, f"{module_name}.py")
+            written.append(path)
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(self._render_module(header, names, definitions, dependencies, modules, trailing))
+
+        init_template = self.env.get_template("models_init.j2")
+        with open(os.path.join(self.package_dir, "__init__.py"), "w", encoding="utf-8") as f:
+            f.write(init_template.render(
+                modules=self._group(order, modules),
+                name_to_module={name: modules[name] for name in order},
+            ))
+        os.remove(self.models_path)
+        return written
+
+    # -- parsing --
+    @staticmethod
+    def _defined_name(node: ast.stmt) -> Optional[str]:
+        if isinstance(node, ast.ClassDef):
+            return node.name
+        if isinstance(node, ast.Assign) and len(node.targets) == 1 and isinstance(node.targets[0], ast.Name):
+            return node.targets[0].id
+        if isinstance(node, ast.AnnAssign) and isinstance(node.target, ast.Name):
+            return node.target.id
+        return None
+
+    @staticmethod
+    def _statement_owner(node: ast.stmt) -> Optional[str]:
+        """
+        Для `Foo.update_forward_refs()` и подобных - имя модели, к которой относится строка.
+        """
+        for child in ast.walk(node):
+            if isinstance(child, ast.Attribute) and isinstance(child.value, ast.Name):
+                return child.value.id
+        return None
+
+    @staticmethod
+    def _referenced_names(node: ast.stmt, definitions: Dict[str, str]) -> Set[str]:
+        names = set()
+        for child in ast.walk(node):
+            if isinstance(child, ast.Name) and child.id in definitions:
+                names.add(child.id)
+            elif isinstance(child, ast.Constant) and isinstance(child.value, str) and child.value in definitions:
+                # forward-ссылки в кавычках: Optional['Foo']
+                names.add(child.value)
+        return names
+
+    # -- grouping --
+    @staticmethod
+    def _strongly_connected(order: List[str], dependencies: Dict[str, Set[str]]) -> List[List[str]]:
+        """
+        Алгоритм Тарьяна без рекурсии: списки взаимно зависимых моделей.
+        """
+        position = {name: i for i, name in enumerate(order)}
+        index: Dict[str, int] = {}
+        lowlink: Dict[str, int] = {}
+        on_stack: Set[str] = set()
+        stack: List[str] = []
+        components: List[List[str]] = []
+        counter = 0
+
+        for root in order:
+            if root in index:
+                continue
+            work = [(root, iter(sorted(dependencies[root])))]
+            index[root] = lowlink[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack.add(root)
+            while work:
+                node, children = work[-1]
+                for child in children:
+                    if child not in index:
+                        index[child] = lowlink[child] = counter
+                        counter += 1
+                        stack.append(child)
+                        on_stack.add(child)
+                        work.append((child, iter(sorted(dependencies[child]))))
+                        break
+                    if child in on_stack:
+                        lowlink[node] = min(lowlink[node], index[child])
+                else:
+                    work.pop()
+                    if work:
+                        parent = work[-1][0]
+                        lowlink[parent] = min(lowlink[parent], lowlink[node])
+                    if lowlink[node] == index[node]:
+                        component = []
+                        while True:
+                            member = stack.pop()
+                            on_stack.discard(member)
+                            component.append(member)
+                            if member == node:
+                                break
+                        components.append(sorted(component, key=position.__getitem__))
+        return components
+
+    def _assign_modules(self, order: List[str], dependencies: Dict[str, Set[str]]) -> Dict[str, str]:
+        components = self._strongly_connected(order, dependencies)
+        modules: Dict[str, str] = {}
+        taken: Set[str] = set()
+
+        def unique(module_name: str) -> str:
+            candidate, suffix = module_name, 1
+            while candidate in taken or candidate in ("__init__",):
+                suffix += 1
+                candidate = f"{module_name}_{suffix}"
+            taken.add(candidate)
+            return candidate
+
+        if self.group_by == "schema":
+            for component in components:
+                module_name = unique(snake_case(component[0]))
+                for name in component:
+                    modules[name] = module_name
+            return modules
+
+        users: Dict[str, Set[str]] = {name: set() for name in order}
+        for tag, roots in self.tag_models.items():
+            pending = [name for name in roots if name in users]
+            seen: Set[str] = set()
+            while pending:
+                name = pending.pop()
+                if name in seen:
+                    continue
+                seen.add(name)
+                users[name].add(tag)
+                pending.extend(dependencies[name])
+
+        tag_modules = {tag: unique(f"tag_{snake_case(tag)}") for tag in sorted(self.tag_models)}
+        for component in components:
+            tags = set().union(*(users[name] for name in component))
+            if len(tags) == 1:
+                module_name = tag_modules[next(iter(tags))]
+            elif tags:
+                module_name = SHARED_MODULE
+            else:
+                module_name = UNUSED_MODULE
+            for name in component:
+                modules[name] = module_name
+        return modules
+
+    @staticmethod
+    def _group(order: List[str], modules: Dict[str, str]) -> Dict[str, List[str]]:
+        grouped: Dict[str, List[str]] = {}
+        for name in order:
+            grouped.setdefault(modules[name], []).append(name)
+        return grouped
+
+    # -- rendering --
+    @staticmethod
+    def _render_module(header: str,
+                       names: List[str],
+                       definitions: Dict[str, str],
+                       dependencies: Dict[str, Set[str]],
+                       modules: Dict[str, str],
+                       trailing: Dict[str, List[str]]) -> str:
+        module_name = modules[names[0]]
+        imports: Dict[str, Set[str]] = {}
+        for name in names:
+            for dependency in dependencies[name]:
+                if modules[dependency] != module_name:
+                    imports.setdefault(modules[dependency], set()).add(dependency)
+
+        parts = [header.rstrip("\n") + "\n"]
+        for dependency_module in sorted(imports):
+            parts.append(f"from .{dependency_module} import {', '.join(sorted(imports[dependency_module]))}\n")
+        for name in names:
+            parts.append("\n\n" + definitions[name].rstrip("\n") + "\n")
+        statements = [text for name in names for text in trailing.get(name, [])]
+        if statements:
+            parts.append("\n\n" + "".join(statements))
+        return "".join(parts)
@@ -1,26 +1,61 @@
-from typing import Optional
+from importlib import import_module
+from typing import TYPE_CHECKING, Optional
 
-from http_clients.cde.facade import CdeApi
+from my_codegen.http_clients.response_parser import ParseMode
+from my_codegen.http_clients.session_pool import DEFAULT_POOL_SETTINGS, PoolSettings
+
+if TYPE_CHECKING:
+    from http_clients.cde.facade import CdeApi
 
 
 class ApiFacade:
 
     cde: "CdeApi"
 
-    def __init__(self, auth_token: Optional[str] = None):
+    _api_classes = {
+        "cde": ("http_clients.cde.facade", "CdeApi"),
+    }
+
+    def __init__(self,
+                 auth_token: Optional[str] = None,
+                 pool_settings: PoolSettings = DEFAULT_POOL_SETTINGS,
+                 parse_mode: Optional[ParseMode] = None):
         self.auth_token = auth_token
-        self._instances = {}
+        self.pool_settings = pool_settings
+        self.parse_mode = parse_mode
+
+    def close(self) -> None:
+        for name in self._api_classes:
+            api = self.__dict__.get(name)
+            if api is not None and hasattr(api, "close"):
+                self.__dict__.pop(name).close()
+
+    async def aclose(self) -> None:
+        """
+        Закрывает и синхронные, и асинхронные (сгенерированные с --async) фасады сервисов.
+        """
+        self.close()
+        for name in self._api_classes:
+            api = self.__dict__.pop(name, None)
+            if api is not None:
+                await api.aclose()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
 
     def __getattr__(self, name: str):
-        if name not in self._instances:
-            self._instances[name] = self._initialize_api(name)
-        return self._instances[name]
+        api = self._initialize_api(name)
+        setattr(self, name, api)
+        return api
 
     def _initialize_api(self, name: str):
-        api_classes = {
-            "cde": CdeApi,
-        }
-        if name in api_classes:
-            return api_classes[name](self.auth_token)
+        if name in self._api_classes:
+            module_name, class_name = self._api_classes[name]
+            return getattr(import_module(module_name), class_name)(
+                self.auth_token, pool_settings=self.pool_settings, parse_mode=self.parse_mode
+            )
         else:
             raise AttributeError(f"No such API facade: {name}")
\ No newline at end of file
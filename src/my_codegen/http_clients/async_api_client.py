@@ -0,0 +1,340 @@
+import asyncio
+import functools
+import logging
+import time
+from http import HTTPStatus
+from typing import Dict, List, Optional, Sequence, Union
+
+import allure
+import httpx
+import requests
+
+from my_codegen.http_clients.api_client import BaseRequestHandler
+from my_codegen.http_clients.batch import BatchResult, CallSpec, run_batch_async
+from my_codegen.http_clients.metrics import MetricKey, metrics
+from my_codegen.http_clients.policies import (
+    DEFAULT_RETRY_POLICY,
+    DEFAULT_TIMEOUT_POLICY,
+    DeadlineExceeded,
+    PolicySelection,
+    RetryPolicy,
+    TimeoutPolicy,
+)
+from my_codegen.http_clients.rate_limit import CallLimits, rate_limits
+from my_codegen.http_clients.response_parser import ParseMode, ResponseParsing
+from my_codegen.http_clients.session_pool import DEFAULT_POOL_SETTINGS, PoolSettings
+from my_codegen.utils.base_url import BaseUrlSingleton
+from my_codegen.utils.logger import logger
+
+# httpx пишет каждый запрос в INFO, а корневой логгер у нас на INFO
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+
+def new_async_http_client(pool_settings: PoolSettings = DEFAULT_POOL_SETTINGS,
+                          timeout: Optional[float] = None) -> httpx.AsyncClient:
+    """
+    httpx.AsyncClient с теми же смыслами настроек, что и у пула urllib3: pool_maxsize -
+    сколько соединений держим живыми, а с pool_block=True ещё и жёсткий предел одновременных.
+    """
+    limits = httpx.Limits(
+        max_connections=pool_settings.pool_maxsize if pool_settings.pool_block else None,
+        max_keepalive_connections=pool_settings.pool_maxsize,
+    )
+    return httpx.AsyncClient(limits=limits, timeout=timeout)
+
+
+def async_step(title: str):
+    """
+    allure.step для корутин: штатный декоратор закрывает шаг, как только вернёт корутину.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            with allure.step(title):
+                return await func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class AsyncRequestHandler(BaseRequestHandler):
+    def __init__(self,
+                 auth_token: Optional[str] = None,
+                 http_client: Optional[httpx.AsyncClient] = None,
+                 pool_settings: PoolSettings = DEFAULT_POOL_SETTINGS):
+        super().__init__(auth_token)
+        self.pool_settings = pool_settings
+        # Чужой клиент (общий на фасад) не закрываем - им владеет тот, кто его создал
+        self._owns_client = http_client is None
+        self.http_client = http_client or new_async_http_client(pool_settings)
+
+    async def aclose(self) -> None:
+        if self._owns_client:
+            await self.http_client.aclose()
+
+    def prepare_request(
+            self,
+            method: str,
+            url: str,
+            payload: Optional[Dict] = None,
+            headers: Optional[Dict] = None,
+            params: Optional[Dict] = None,
+            files: Optional[Dict] = None,
+    ) -> httpx.Request:
+        headers, data = self._encode_body(payload, headers, files)
+        return self.http_client.build_request(
+            method=method,
+            url=url,
+            headers=headers,
+            params=params,
+            content=data,
+            files=files,
+        )
+
+    async def send_request(
+            self,
+            request: httpx.Request,
+            path: str,
+            retry_policy: RetryPolicy = DEFAULT_RETRY_POLICY,
+            timeout_policy: TimeoutPolicy = DEFAULT_TIMEOUT_POLICY,
+            metric_key: Optional[MetricKey] = None,
+            limits: Optional[CallLimits] = None,
+    ) -> httpx.Response:
+        """
+        Тот же цикл повторов, что в RequestHandler.send_request, только с asyncio.sleep.
+        """
+        method = request.method
+        started = self._start_call(retry_policy)
+        attempt = 0
+        try:
+            while True:
+                attempt += 1
+                remaining = self._check_deadline(timeout_policy, started, method, request.url, attempt)
+                try:
+                    if limits is None:
+                        response = await self._send(request, timeout_policy, started)
+                    else:
+                        # Ожидание в лимитах ограничено дедлайном вызова
+                        async with limits.acquire_async(remaining):
+                            response = await self._send(request, timeout_policy, started)
+                except DeadlineExceeded:
+                    self.retry_stats.record("deadline_exceeded")
+                    raise
+                except httpx.TransportError as e:
+                    connect_error = isinstance(e, (httpx.ConnectError, httpx.ConnectTimeout))
+                    delay = self._next_delay(
+                        retry_policy, timeout_policy, started, method, attempt,
+                        error=e, connect_error=connect_error,
+                    )
+                    if delay is None:
+                        raise
+                else:
+                    delay = self._next_delay(
+                        retry_policy, timeout_policy, started, method, attempt, response=response
+                    )
+                    if delay is None:
+                        break
+                    await response.aclose()
+                await asyncio.sleep(delay)
+        except (httpx.TransportError, requests.Timeout) as e:
+            if metric_key is not None:
+                metrics.record_error(metric_key, time.monotonic() - started, e, attempt - 1)
+            raise
+        if metric_key is not None:
+            self._record_metrics(metric_key, started, request.content, response, attempt - 1)
+        payload = None if request.headers.get("Content-Type", "").startswith("multipart/") else request.content
+        self.reporter.report(response, payload, request.method, path)
+        return response
+
+    async def _send(self, request: httpx.Request, timeout_policy: TimeoutPolicy, started: float) -> httpx.Response:
+        # Таймауты считаются после ожидания в лимитах: попытка не переживёт дедлайн
+        connect, read = timeout_policy.for_attempt(timeout_policy.remaining(started))
+        request.extensions["timeout"] = httpx.Timeout(read, connect=connect).as_dict()
+        return await self.http_client.send(request)
+
+
+class AsyncApiClient(PolicySelection, ResponseParsing):
+    """
+    Асинхронный аналог ApiClient на httpx: те же get/post/put/patch/delete и та же проверка
+    статуса, только через await. Клиенты одного фасада делят один httpx.AsyncClient.
+    """
+
+    def __init__(
+            self,
+            auth_token: Optional[str] = None,
+            base_url: Optional[str] = None,
+            pool_settings: PoolSettings = DEFAULT_POOL_SETTINGS,
+            http_client: Optional[httpx.AsyncClient] = None,
+            parse_mode: Optional[ParseMode] = None,
+            retry_policy: Optional[RetryPolicy] = None,
+            timeout_policy: Optional[TimeoutPolicy] = None,
+    ):
+        self.base_url = base_url if base_url else BaseUrlSingleton.get_base_url()
+        self.auth_token = auth_token
+        self.request_handler = AsyncRequestHandler(auth_token, http_client, pool_settings)
+        self._apply_parse_mode(parse_mode)
+        self._apply_policies(retry_policy, timeout_policy)
+
+    async def aclose(self) -> None:
+        await self.request_handler.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    async def warm_up(self, connections: int = 1) -> int:
+        return await warm_up(self.request_handler.http_client, self.base_url, connections)
+
+    @staticmethod
+    async def batch(
+            calls: Sequence[CallSpec],
+            max_in_flight: int = 100,
+            deadline: Optional[float] = None,
+    ) -> BatchResult:
+        return await run_batch_async(calls, max_in_flight=max_in_flight, deadline=deadline)
+
+    async def _send_request(
+            self,
+            method: str,
+            path: str,
+            payload: Optional[Dict] = None,
+            headers: Optional[Dict] = None,
+            params: Optional[Dict] = None,
+            files: Optional[Dict] = None,
+            expected_status: Optional[HTTPStatus] = None,
+            path_template: Optional[str] = None,
+            **kwargs,
+    ) -> Union[Dict, List, bytes, None]:
+        formatted_path = path.format(**kwargs)
+
+        url = f"{self.base_url}{formatted_path}"
+
+        request = self.request_handler.prepare_request(
+            method, url, payload, headers, params, files
+        )
+        response = await self.request_handler.send_request(
+            request,
+            path,
+            retry_policy=self._retry_policy_for(method),
+            timeout_policy=self._timeout_policy_for(method),
+            metric_key=metrics.key(self, method, path_template or path) if metrics.enabled else None,
+            limits=rate_limits.for_call(getattr(self, "_service", ""), method, path_template or path)
+            if rate_limits.active else None,
+        )
+
+        self.request_handler.validate_response(
+            response, expected_status, method, payload or params
+        )
+        return self.request_handler.process_response(response)
+
+    async def get(
+            self,
+            path: str,
+            headers: Optional[Dict] = None,
+            params: Optional[Dict] = None,
+            expected_status: HTTPStatus = HTTPStatus.OK,
+            **kwargs,
+    ) -> Union[Dict, List]:
+        return await self._send_request(
+            "GET",
+            path,
+            params=params,
+            headers=headers,
+            expected_status=expected_status,
+            **kwargs,
+        )
+
+    async def post(
+            self,
+            path: str,
+            payload: Optional[Union[Dict, List]] = None,
+            headers: Optional[Dict] = None,
+            files: Optional[Dict] = None,
+            expected_status: HTTPStatus = HTTPStatus.CREATED,
+            **kwargs,
+    ) -> Union[Dict, List]:
+        return await self._send_request(
+            "POST",
+            path,
+            payload=payload,
+            files=files,
+            headers=headers,
+            expected_status=expected_status,
+            **kwargs,
+        )
+
+    async def put(
+            self,
+            path: str = "",
+            payload: Optional[Dict] = None,
+            params: Optional[Dict] = None,
+            headers: Optional[Dict] = None,
+            files: Optional[Dict] = None,
+            expected_status: HTTPStatus = HTTPStatus.OK,
+            **kwargs,
+    ) -> Union[Dict, List]:
+        return await self._send_request(
+            "PUT",
+            path,
+            payload=payload,
+            params=params,
+            headers=headers,
+            files=files,
+            expected_status=expected_status,
+            **kwargs,
+        )
+
+    async def patch(
+            self,
+            path: str,
+            payload: Optional[Dict] = None,
+            params: Optional[Dict] = None,
+            headers: Optional[Dict] = None,
+            expected_status: HTTPStatus = HTTPStatus.OK,
+            **kwargs,
+    ) -> Union[Dict, List]:
+        return await self._send_request(
+            "PATCH",
+            path,
+            payload=payload,
+            params=params,
+            headers=headers,
+            expected_status=expected_status,
+            **kwargs,
+        )
+
+    async def delete(
+            self,
+            path: str,
+            headers: Optional[Dict] = None,
+            params: Optional[Dict] = None,
+            payload: Optional[Dict] = None,
+            expected_status: HTTPStatus = HTTPStatus.NO_CONTENT,
+            **kwargs,
+    ) -> Union[Dict, List]:
+        return await self._send_request(
+            "DELETE",
+            path,
+            headers=headers,
+            params=params,
+            payload=payload,
+            expected_status=expected_status,
+            **kwargs,
+        )
+
+
+async def warm_up(http_client: httpx.AsyncClient, base_url: str, connections: int = 1) -> int:
+    """
+    Открывает до connections соединений параллельными HEAD-запросами. Возвращает число успешных.
+    """
+    async def ping() -> bool:
+        try:
+            await http_client.head(base_url)
+            return True
+        except httpx.HTTPError as e:
+            logger.warning(f"Pool warm-up request to {base_url} failed: {e}")
+            return False
+
+    results = await asyncio.gather(*(ping() for _ in range(max(1, connections))))
+    return sum(results)
@@ -0,0 +1,183 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+DEFAULT_BATCH_WORKERS = 8
+
+
+@dataclass
+class BatchCall:
+    """
+    Один вызов в пачке: метод клиента и его аргументы, например
+    BatchCall(api.pets.create_pet, kwargs={"payload": NewPet(name="Rex")}).
+    """
+    func: Callable[..., Any]
+    args: Tuple[Any, ...] = ()
+    kwargs: Dict[str, Any] = field(default_factory=dict)
+
+    @classmethod
+    def of(cls, func: Callable[..., Any], *args: Any, **kwargs: Any) -> "BatchCall":
+        return cls(func, args, kwargs)
+
+
+CallSpec = Union[BatchCall, Tuple[Callable[..., Any], ...], Callable[..., Any]]
+
+
+@dataclass
+class BatchError:
+    index: int
+    call: BatchCall
+    error: BaseException
+
+
+@dataclass
+class BatchResult:
+    """
+    results - в порядке вызовов; на месте упавшего или не успевшего до дедлайна вызова None.
+    completed - сколько вызовов завершилось до дедлайна: succeeded успешно, failed с ошибкой.
+    timed_out - не успели к дедлайну, из них cancelled так и не начались.
+    """
+    results: List[Any]
+    errors: List[BatchError]
+    elapsed: float
+    completed: int
+    timed_out: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    cancelled: int = 0
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+    @property
+    def calls_per_second(self) -> float:
+        return self.completed / self.elapsed if self.elapsed else 0.0
+
+    def summary(self) -> str:
+        return (
+            f"{self.completed} calls in {self.elapsed:.2f}s ({self.calls_per_second:.1f}/s): "
+            f"{self.succeeded} succeeded, {self.failed} failed, "
+            f"{self.timed_out} timed out ({self.cancelled} not started)"
+        )
+
+
+def as_batch_call(spec: CallSpec) -> BatchCall:
+    """
+    BatchCall, (func, args[, kwargs]) или просто func без аргументов.
+    """
+    if isinstance(spec, BatchCall):
+        return spec
+    if callable(spec):
+        return BatchCall(spec)
+    func, *rest = spec
+    args = tuple(rest[0]) if len(rest) > 0 else ()
+    kwargs = dict(rest[1]) if len(rest) > 1 else {}
+    return BatchCall(func, args, kwargs)
+
+
+def run_batch(calls: Iterable[CallSpec],
+              max_workers: int = DEFAULT_BATCH_WORKERS,
+              deadline: Optional[float] = None) -> BatchResult:
+    """
+    Выполняет вызовы не более чем в max_workers потоков. Клиенты одного хоста ходят через
+    общую сессию (session_pool), так что для max_workers > pool_maxsize стоит поднять
+    PoolSettings.pool_maxsize, иначе лишние соединения будут открываться и выбрасываться.
+    Ошибки не прерывают пачку, а собираются в BatchResult.errors.
+    deadline - секунды на всю пачку: не начатые к этому моменту вызовы отменяются,
+    начатые дорабатывают в фоне, но их результат уже не ждём.
+    """
+    batch = [as_batch_call(call) for call in calls]
+    results: List[Any] = [None] * len(batch)
+    errors: List[BatchError] = []
+    started = time.perf_counter()
+    if not batch:
+        return BatchResult(results, errors, 0.0, 0)
+
+    pool = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(batch))))
+    futures = {}
+    try:
+        for index, call in enumerate(batch):
+            futures[pool.submit(call.func, *call.args, **call.kwargs)] = index
+        done, not_done = wait(futures, timeout=deadline)
+    finally:
+        # shutdown(cancel_futures=True) есть только с Python 3.9: не начатые отменяем сами,
+        # cancel() у начатых и завершённых ничего не делает
+        cancelled = sum(future.cancel() for future in futures)
+        pool.shutdown(wait=False)
+
+    for future in done:
+        index = futures[future]
+        error = future.exception()
+        if error is None:
+            results[index] = future.result()
+        else:
+            errors.append(BatchError(index, batch[index], error))
+    failed = len(errors)
+    for future in not_done:
+        index = futures[future]
+        errors.append(BatchError(index, batch[index], TimeoutError("Batch deadline exceeded")))
+    errors.sort(key=lambda e: e.index)
+    return BatchResult(
+        results=results,
+        errors=errors,
+        elapsed=time.perf_counter() - started,
+        completed=len(done),
+        timed_out=len(not_done),
+        succeeded=len(done) - failed,
+        failed=failed,
+        cancelled=cancelled,
+    )
+
+
+async def run_batch_async(calls: Sequence[CallSpec],
+                          max_in_flight: int = 100,
+                          deadline: Optional[float] = None) -> BatchResult:
+    """
+    То же для корутинных методов (AsyncApiClient): не больше max_in_flight запросов одновременно.
+    """
+    batch = [as_batch_call(call) for call in calls]
+    results: List[Any] = [None] * len(batch)
+    errors: List[BatchError] = []
+    began = [False] * len(batch)
+    finished = [False] * len(batch)
+    semaphore = asyncio.Semaphore(max(1, max_in_flight))
+    started = time.perf_counter()
+
+    async def run(index: int, call: BatchCall) -> None:
+        async with semaphore:
+            began[index] = True
+            try:
+                results[index] = await call.func(*call.args, **call.kwargs)
+            except asyncio.CancelledError:
+                # До Python 3.8 CancelledError - наследник Exception: отмена по дедлайну не ошибка вызова
+                raise
+            except Exception as e:  # noqa: BLE001 - ошибка вызова становится частью результата
+                errors.append(BatchError(index, call, e))
+            finished[index] = True
+
+    tasks = [asyncio.ensure_future(run(index, call)) for index, call in enumerate(batch)]
+    if tasks:
+        _, pending = await asyncio.wait(tasks, timeout=deadline)
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+    timed_out = [index for index, done in enumerate(finished) if not done]
+    failed = len(errors)
+    for index in timed_out:
+        errors.append(BatchError(index, batch[index], TimeoutError("Batch deadline exceeded")))
+    errors.sort(key=lambda e: e.index)
+    completed = len(batch) - len(timed_out)
+    return BatchResult(
+        results=results,
+        errors=errors,
+        elapsed=time.perf_counter() - started,
+        completed=completed,
+        timed_out=len(timed_out),
+        succeeded=completed - failed,
+        failed=failed,
+        cancelled=sum(not began[index] for index in timed_out),
+    )
@@ -0,0 +1,269 @@
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Callable, Dict, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+CACHEABLE_STATUSES = frozenset({200, 203})
+
+CacheKey = Tuple[str, str, str]
+
+
+def _normalize_url(url: str) -> str:
+    """
+    Порядок query-параметров на ответ не влияет - сортируем, чтобы ?a=1&b=2 и ?b=2&a=1 совпали.
+    """
+    parts = urlsplit(url)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((parts.scheme, parts.netloc.lower(), parts.path, query, ""))
+
+
+def _auth_identity(headers) -> str:
+    """
+    Разные токены - разные записи: ответ одного пользователя не достанется другому.
+    Сам токен в ключе не храним, только его хэш.
+    """
+    token = headers.get("Authorization") or headers.get("Cookie")
+    return hashlib.sha256(token.encode()).hexdigest()[:16] if token else ""
+
+
+def _under(url: str, prefix: str) -> bool:
+    """
+    url - это prefix или ресурс под ним по границе сегмента пути: /pets/1 накрывает
+    /pets/1, /pets/1/photos и /pets/1?full=1, но не /pets/10.
+    """
+    if "?" in prefix:
+        return url == prefix
+    base = prefix.rstrip("/")
+    return url == base or url.startswith(base + "/") or url.startswith(base + "?")
+
+
+def _vary_values(vary: Tuple[str, ...], headers) -> Tuple[Optional[str], ...]:
+    return tuple(headers.get(name) for name in vary)
+
+
+def _cache_control(headers) -> Dict[str, Optional[str]]:
+    directives: Dict[str, Optional[str]] = {}
+    for part in headers.get("Cache-Control", "").split(","):
+        name, _, value = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = value.strip('"') or None
+    return directives
+
+
+class CachedResponse:
+    """
+    Снимок ответа: статус, заголовки и тело. На каждое попадание собирается новый
+    requests.Response, тело (bytes) при этом не копируется.
+    """
+    __slots__ = ("status_code", "headers", "content", "url", "encoding", "owner", "expires_at",
+                 "vary", "vary_values")
+
+    def __init__(self, response: requests.Response, owner: str, expires_at: float, request_headers=None):
+        self.status_code = response.status_code
+        self.headers = dict(response.headers)
+        self.content = response.content
+        self.url = response.url
+        self.encoding = response.encoding
+        self.owner = owner
+        self.expires_at = expires_at
+        # Vary: ответ годится только запросам с теми же значениями перечисленных заголовков
+        self.vary = tuple(
+            name.strip() for name in response.headers.get("Vary", "").split(",") if name.strip()
+        )
+        self.vary_values = _vary_values(self.vary, request_headers or {})
+
+    def matches(self, request: requests.PreparedRequest) -> bool:
+        return _vary_values(self.vary, request.headers) == self.vary_values
+
+    @property
+    def etag(self) -> Optional[str]:
+        return self.headers.get("ETag") or self.headers.get("etag")
+
+    @property
+    def last_modified(self) -> Optional[str]:
+        return self.headers.get("Last-Modified") or self.headers.get("last-modified")
+
+    def fresh(self, now: float) -> bool:
+        return now < self.expires_at
+
+    def to_response(self, request: requests.PreparedRequest) -> requests.Response:
+        response = requests.Response()
+        response.status_code = self.status_code
+        response.headers = CaseInsensitiveDict(self.headers)
+        response._content = self.content
+        response.url = self.url
+        response.encoding = self.encoding
+        response.request = request
+        return response
+
+
+class ResponseCache:
+    """
+    Кэш ответов на GET для RequestHandler: LRU на max_entries записей, TTL по умолчанию ttl
+    секунд или max-age из Cache-Control сервера (no-store - не кэшируем, no-cache - каждый
+    раз перепроверяем). Устаревшая запись с ETag/Last-Modified перепроверяется условным
+    запросом, 304 продлевает её без передачи тела. Одинаковые одновременные запросы
+    склеиваются: на сервер уходит один, остальные ждут его результат.
+    Ключ - метод, URL с отсортированными параметрами и хэш Authorization. Ответ с Vary
+    отдаётся только запросу с теми же значениями перечисленных заголовков; на ключ
+    хранится один вариант - последний полученный.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl: float = 60, respect_cache_control: bool = True):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.respect_cache_control = respect_cache_control
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[CacheKey, CachedResponse]" = OrderedDict()
+        self._in_flight: Dict[CacheKey, Future] = {}
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+        self.coalesced = 0
+        self.evictions = 0
+
+    @staticmethod
+    def key(request: requests.PreparedRequest) -> CacheKey:
+        return request.method.upper(), _normalize_url(request.url), _auth_identity(request.headers)
+
+    def accepts(self, request: requests.PreparedRequest) -> bool:
+        if request.method.upper() != "GET":
+            return False
+        return "no-cache" not in _cache_control(request.headers) if self.respect_cache_control else True
+
+    def _expires_at(self, headers, now: float) -> Optional[float]:
+        """
+        None - ответ хранить нельзя.
+        """
+        if not self.respect_cache_control:
+            return now + self.ttl
+        directives = _cache_control(headers)
+        if "no-store" in directives or headers.get("Vary", "").strip() == "*":
+            return None
+        if "no-cache" in directives:
+            return now
+        max_age = directives.get("max-age")
+        if max_age is not None and max_age.isdigit():
+            return now + int(max_age)
+        return now + self.ttl
+
+    def fetch(self,
+              request: requests.PreparedRequest,
+              owner: str,
+              send: Callable[[requests.PreparedRequest], requests.Response]) -> requests.Response:
+        key = self.key(request)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and not entry.matches(request):
+                # Другой вариант по Vary: его ETag к этому запросу не относится
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+                if entry.fresh(now):
+                    self.hits += 1
+                    return entry.to_response(request)
+            flight = self._in_flight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._in_flight[key] = Future()
+            else:
+                self.coalesced += 1
+        if not leader:
+            snapshot = flight.result()
+            if snapshot.matches(request):
+                return snapshot.to_response(request)
+            # Ведущий получил вариант для других заголовков (Vary) - идём сами, мимо кэша
+            return send(request)
+
+        try:
+            response, snapshot = self._fetch(key, request, entry, owner, send)
+            flight.set_result(snapshot)
+            return response
+        except BaseException as e:
+            flight.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+
+    def _fetch(self, key: CacheKey, request, entry: Optional[CachedResponse], owner: str, send):
+        conditional = request
+        if entry is not None and (entry.etag or entry.last_modified):
+            conditional = request.copy()
+            if entry.etag:
+                conditional.headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                conditional.headers["If-Modified-Since"] = entry.last_modified
+
+        response = send(conditional)
+        now = time.monotonic()
+        if entry is not None and response.status_code == 304:
+            response.close()
+            expires_at = self._expires_at(response.headers, now)
+            with self._lock:
+                self.revalidated += 1
+                if expires_at is None:
+                    self._entries.pop(key, None)
+                else:
+                    entry.expires_at = expires_at
+            return entry.to_response(request), entry
+
+        expires_at = self._expires_at(response.headers, now)
+        snapshot = CachedResponse(response, owner, expires_at or now, request.headers)
+        with self._lock:
+            self.misses += 1
+            if expires_at is not None and response.status_code in CACHEABLE_STATUSES:
+                self._entries[key] = snapshot
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+            else:
+                self._entries.pop(key, None)
+        return response, snapshot
+
+    def invalidate(self, owner: Optional[str] = None, prefix: Optional[str] = None) -> int:
+        """
+        Удаляет записи клиента owner и/или ресурса prefix со всем, что под ним по пути
+        (/pets/1 - это /pets/1/photos, но не /pets/10); без аргументов - все.
+        Возвращает число удалённых записей.
+        """
+        normalized = _normalize_url(prefix) if prefix else None
+        with self._lock:
+            doomed = [
+                key for key, entry in self._entries.items()
+                if (owner is None or entry.owner == owner)
+                and (normalized is None or _under(key[1], normalized))
+            ]
+            for key in doomed:
+                del self._entries[key]
+            return len(doomed)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "revalidated": self.revalidated,
+                "coalesced": self.coalesced,
+                "evictions": self.evictions,
+            }
+
+
+_CACHE_TTL = os.getenv("MY_CODEGEN_RESPONSE_CACHE_TTL")
+
+# Общий кэш для всех ApiClient, если задан MY_CODEGEN_RESPONSE_CACHE_TTL; иначе кэш выключен
+shared_response_cache = ResponseCache(ttl=float(_CACHE_TTL)) if _CACHE_TTL else None
@@ -0,0 +1,299 @@
+import base64
+import hashlib
+import json
+import mmap
+import os
+import re
+import threading
+import uuid
+from dataclasses import dataclass
+from enum import Enum
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+try:
+    import fcntl
+except ImportError:  # Windows: запись из нескольких процессов не синхронизируется
+    fcntl = None
+
+UUID_RE = re.compile(rb"[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}")
+BOUNDARY_RE = re.compile(r"boundary=\"?([^\";]+)\"?")
+SESSION_PREFIX = b"#session\t"
+_PROCESS_SESSION = uuid.uuid4().hex
+
+
+def recording_session() -> str:
+    """
+    Идентификатор сессии записи: все процессы одной сессии дописывают в общую кассету, а
+    первая запись новой сессии начинает файл заново. Берётся по порядку:
+    MY_CODEGEN_CASSETTE_SESSION - явно, например номер сборки CI, если кассету пишут
+    несколько независимо запущенных процессов; PYTEST_XDIST_TESTRUNUID - общий у воркеров
+    одного прогона pytest-xdist; иначе случайный id процесса. Его мы кладём в
+    MY_CODEGEN_CASSETTE_SESSION, чтобы запущенные из процесса дочерние процессы попали в ту же
+    сессию, а не обнулили кассету друг другу.
+    """
+    session = os.getenv("MY_CODEGEN_CASSETTE_SESSION") or os.getenv("PYTEST_XDIST_TESTRUNUID")
+    if not session:
+        session = os.environ["MY_CODEGEN_CASSETTE_SESSION"] = _PROCESS_SESSION
+    return session
+
+
+class CassetteMode(str, Enum):
+    """
+    record - все запросы идут в сеть, пары запрос/ответ дописываются в кассету;
+    replay - ответы только из кассеты, сокеты не открываются;
+    auto - что есть в кассете, отдаётся из неё, остальное записывается.
+    """
+    RECORD = "record"
+    REPLAY = "replay"
+    AUTO = "auto"
+
+
+class CassetteMiss(AssertionError):
+    """
+    Строгий replay: запроса нет в кассете.
+    """
+
+
+@dataclass(frozen=True)
+class MatchRules:
+    """
+    Из чего строится ключ запроса. По умолчанию - метод, URL с отсортированными параметрами
+    и тело; заголовки не учитываются, кроме перечисленных в match_headers. UUID в URL и теле
+    заменяются заглушкой, чтобы сгенерированные в тесте id не ломали совпадение.
+    replacements - дополнительные (регулярка, замена) для тела, например для меток времени.
+    """
+    match_headers: Tuple[str, ...] = ()
+    ignore_params: Tuple[str, ...] = ()
+    match_body: bool = True
+    normalize_uuids: bool = True
+    replacements: Tuple[Tuple[bytes, bytes], ...] = ()
+
+    def _normalize(self, data: bytes) -> bytes:
+        if self.normalize_uuids:
+            data = UUID_RE.sub(b"<uuid>", data)
+        for pattern, replacement in self.replacements:
+            data = re.sub(pattern, replacement, data)
+        return data
+
+    def key(self, request: requests.PreparedRequest) -> str:
+        parts = urlsplit(request.url)
+        query = urlencode(sorted(
+            (name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+            if name not in self.ignore_params
+        ))
+        url = urlunsplit((parts.scheme, parts.netloc.lower(), parts.path, query, ""))
+        digest = hashlib.sha1(request.method.upper().encode())
+        digest.update(self._normalize(url.encode()))
+        for name in self.match_headers:
+            digest.update(f"\n{name.lower()}:{request.headers.get(name, '')}".encode())
+        if self.match_body and request.body:
+            body = request.body.encode() if isinstance(request.body, str) else request.body
+            boundary = BOUNDARY_RE.search(request.headers.get("Content-Type", ""))
+            if boundary:
+                # Граница multipart случайная при каждом запросе
+                body = body.replace(boundary.group(1).encode(), b"<boundary>")
+            digest.update(b"\n")
+            digest.update(self._normalize(body))
+        return digest.hexdigest()
+
+
+def _encode_body(content: bytes) -> Dict[str, str]:
+    try:
+        return {"body": content.decode("utf-8")}
+    except UnicodeDecodeError:
+        return {"body_b64": base64.b64encode(content).decode("ascii")}
+
+
+def _decode_body(record: Dict) -> bytes:
+    if "body_b64" in record:
+        return base64.b64decode(record["body_b64"])
+    return record.get("body", "").encode("utf-8")
+
+
+class Cassette:
+    """
+    Кассета в JSONL: строка - "<ключ>\\t<json записи>". Индекс ключ -> смещения строк строится
+    одним проходом по mmap без разбора JSON, запись читается только при попадании, поэтому
+    поиск O(1) и в памяти только индекс. Несколько ответов на один ключ отдаются по очереди
+    (повторный GET после изменения ресурса), последний повторяется.
+    Дозапись идёт одной строкой под flock - кассету можно писать из нескольких воркеров xdist.
+    В режиме record первая строка файла - "#session\t<id>": первая запись новой сессии
+    (см. recording_session) начинает файл заново, поэтому перезапись кассеты не оставляет
+    в ней устаревших ответов, а записи воркеров одного прогона складываются вместе.
+    """
+
+    def __init__(self,
+                 path: str,
+                 mode: CassetteMode = CassetteMode.REPLAY,
+                 rules: MatchRules = MatchRules(),
+                 strict: bool = True,
+                 session: Optional[str] = None):
+        self.path = path
+        self.session = session or recording_session()
+        self.mode = CassetteMode(mode)
+        self.rules = rules
+        self.strict = strict
+        self._lock = threading.Lock()
+        self._index: Optional[Dict[str, List[Tuple[int, int]]]] = None
+        self._mmap: Optional[mmap.mmap] = None
+        # Первая строка файла на момент построения индекса: по ней видно, что файл начат заново
+        self._header = b""
+        self._played: Dict[str, int] = {}
+        # Записанное в режиме auto в этом процессе: индекс по файлу не перестраиваем
+        self._fresh: Dict[str, Dict] = {}
+        self.hits = 0
+        self.misses = 0
+        self.recorded = 0
+
+    def _stale(self) -> bool:
+        """
+        Файл начала заново другая сессия записи: смещения индекса указывают не туда, а чтение
+        mmap за концом усечённого файла убило бы процесс SIGBUS. Дозапись той же сессии
+        индекс не портит - её строки просто не видны до перезагрузки.
+        """
+        try:
+            size = os.path.getsize(self.path)
+        except OSError:
+            return self._mmap is not None
+        mapped = len(self._mmap) if self._mmap is not None else 0
+        if size == mapped:
+            return False
+        if size < mapped:
+            return True
+        with open(self.path, "rb") as f:
+            return f.readline() != self._header
+
+    def _reset(self) -> None:
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        self._index = None
+        self._header = b""
+        self._played.clear()
+
+    def _load(self) -> Dict[str, List[Tuple[int, int]]]:
+        if self._index is not None:
+            if not self._stale():
+                return self._index
+            self._reset()
+        index: Dict[str, List[Tuple[int, int]]] = {}
+        if os.path.exists(self.path) and os.path.getsize(self.path) > 0:
+            with open(self.path, "rb") as f:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            data = self._mmap
+            self._header = data[:data.find(b"\n") + 1]
+            offset, size = 0, len(data)
+            while offset < size:
+                end = data.find(b"\n", offset)
+                end = size if end == -1 else end
+                tab = data.find(b"\t", offset, end)
+                if tab != -1 and data[offset:offset + 1] != b"#":
+                    key = data[offset:tab].decode("ascii")
+                    index.setdefault(key, []).append((tab + 1, end))
+                offset = end + 1
+        self._index = index
+        return index
+
+    def _lookup(self, key: str) -> Optional[Dict]:
+        with self._lock:
+            offsets = self._load().get(key)
+            if not offsets:
+                return self._fresh.get(key)
+            played = self._played.get(key, 0)
+            self._played[key] = played + 1
+            start, end = offsets[min(played, len(offsets) - 1)]
+            return json.loads(self._mmap[start:end])
+
+    def _append(self, key: str, request: requests.PreparedRequest, response: requests.Response) -> None:
+        record = {
+            "method": request.method,
+            "url": request.url,
+            "status": response.status_code,
+            "headers": dict(response.headers),
+            **_encode_body(response.content),
+        }
+        line = f"{key}\t{json.dumps(record, ensure_ascii=False, separators=(',', ':'))}\n".encode("utf-8")
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        with open(self.path, "a+b") as f:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                if self.mode is CassetteMode.RECORD:
+                    self._start_session(f)
+                f.write(line)
+                f.flush()
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+        with self._lock:
+            self.recorded += 1
+            if self.mode is CassetteMode.AUTO:
+                self._fresh[key] = record
+
+    def _start_session(self, f) -> None:
+        """
+        Под flock: если файл записан другой сессией (или без заголовка) - обнуляем его.
+        """
+        header = SESSION_PREFIX + self.session.encode("ascii") + b"\n"
+        f.seek(0)
+        if f.readline() != header:
+            f.truncate(0)
+            f.write(header)
+
+    @staticmethod
+    def _to_response(record: Dict, request: requests.PreparedRequest) -> requests.Response:
+        response = requests.Response()
+        response.status_code = record["status"]
+        response.headers = CaseInsensitiveDict(record["headers"])
+        response._content = _decode_body(record)
+        response.url = record["url"]
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        response.request = request
+        return response
+
+    def play(self,
+             request: requests.PreparedRequest,
+             send: Callable[[requests.PreparedRequest], requests.Response]) -> requests.Response:
+        """
+        Ответ из кассеты или из сети (send) - в зависимости от режима.
+        """
+        key = self.rules.key(request)
+        if self.mode is not CassetteMode.RECORD:
+            record = self._lookup(key)
+            if record is not None:
+                with self._lock:
+                    self.hits += 1
+                return self._to_response(record, request)
+            with self._lock:
+                self.misses += 1
+            if self.mode is CassetteMode.REPLAY and self.strict:
+                raise CassetteMiss(f"No recorded response for {request.method} {request.url} in {self.path}")
+        response = send(request)
+        if self.mode is not CassetteMode.REPLAY:
+            self._append(key, request, response)
+        return response
+
+    def close(self) -> None:
+        with self._lock:
+            self._reset()
+            self._fresh.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "recorded": self.recorded}
+
+
+_CASSETTE_PATH = os.getenv("MY_CODEGEN_CASSETTE")
+
+# Кассета для всех ApiClient: MY_CODEGEN_CASSETTE=путь, MY_CODEGEN_CASSETTE_MODE=record|replay|auto,
+# MY_CODEGEN_CASSETTE_STRICT=0 - в replay промахи уходят в сеть вместо ошибки
+default_cassette = Cassette(
+    _CASSETTE_PATH,
+    mode=CassetteMode(os.getenv("MY_CODEGEN_CASSETTE_MODE", CassetteMode.REPLAY.value)),
+    strict=os.getenv("MY_CODEGEN_CASSETTE_STRICT", "1") == "1",
+) if _CASSETTE_PATH else None
@@ -0,0 +1,78 @@
+import datetime
+import json
+import os
+import uuid
+from decimal import Decimal
+from enum import Enum
+from typing import Any, Optional
+
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def default(obj: Any) -> Any:
+    """
+    То, что json не умеет сам. Модель отдаём её __dict__ (значения полей, вложенные модели
+    разворачиваются рекурсивно тем же хуком) - без промежуточного глубокого копирования .dict().
+    """
+    if isinstance(obj, BaseModel):
+        return obj.__dict__
+    if isinstance(obj, uuid.UUID):
+        return str(obj)
+    if isinstance(obj, Enum):
+        return obj.value
+    if isinstance(obj, (datetime.datetime, datetime.date, datetime.time)):
+        return obj.isoformat()
+    if isinstance(obj, Decimal):
+        return float(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class JsonCodec:
+    """
+    Кодек тел запросов и ответов на stdlib json. dumps отдаёт сразу bytes для тела запроса.
+    """
+    name = "json"
+
+    def dumps(self, obj: Any) -> bytes:
+        return json.dumps(obj, default=default, ensure_ascii=False).encode("utf-8")
+
+    def loads(self, data: bytes) -> Any:
+        return json.loads(data)
+
+
+class OrjsonCodec(JsonCodec):
+    """
+    orjson: UUID, Enum и datetime сериализуются нативно, в default попадают только модели и Decimal.
+    """
+    name = "orjson"
+
+    def dumps(self, obj: Any) -> bytes:
+        return orjson.dumps(obj, default=default, option=orjson.OPT_NON_STR_KEYS)
+
+    def loads(self, data: bytes) -> Any:
+        return orjson.loads(data)
+
+
+CODECS = {JsonCodec.name: JsonCodec, OrjsonCodec.name: OrjsonCodec}
+
+
+def get_codec(name: Optional[str] = None) -> JsonCodec:
+    """
+    name (или MY_CODEGEN_JSON_CODEC): json (по умолчанию), orjson или auto - orjson, если установлен.
+    """
+    name = (name or os.getenv("MY_CODEGEN_JSON_CODEC", JsonCodec.name)).lower()
+    if name == "auto":
+        name = OrjsonCodec.name if orjson is not None else JsonCodec.name
+    if name not in CODECS:
+        raise ValueError(f"Unknown JSON codec: {name}")
+    if name == OrjsonCodec.name and orjson is None:
+        raise ImportError("orjson is not installed: pip install my-api-client[fast]")
+    return CODECS[name]()
+
+
+default_codec = get_codec()
@@ -0,0 +1,213 @@
+import atexit
+import json
+import os
+import random
+import threading
+from typing import Dict, List, NamedTuple
+
+from my_codegen.utils.logger import logger
+
+QUANTILES = (0.5, 0.95, 0.99)
+RESERVOIR_SIZE = 2048
+
+
+class MetricKey(NamedTuple):
+    service: str
+    client: str
+    path: str
+    method: str
+
+
+class _Series:
+    """
+    Метрики одного эндпоинта. Для перцентилей держим равномерную выборку (reservoir
+    sampling) из не более RESERVOIR_SIZE задержек, поэтому память не растёт с числом вызовов.
+    """
+    __slots__ = ("count", "errors", "retries", "total", "min", "max",
+                 "request_bytes", "response_bytes", "statuses", "error_types", "_samples")
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.retries = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+        self.request_bytes = 0
+        self.response_bytes = 0
+        self.statuses: Dict[int, int] = {}
+        self.error_types: Dict[str, int] = {}
+        self._samples: List[float] = []
+
+    def observe(self, elapsed: float, retries: int) -> None:
+        self.count += 1
+        self.retries += retries
+        self.total += elapsed
+        self.min = min(self.min, elapsed)
+        self.max = max(self.max, elapsed)
+        if len(self._samples) < RESERVOIR_SIZE:
+            self._samples.append(elapsed)
+        else:
+            index = random.randrange(self.count)
+            if index < RESERVOIR_SIZE:
+                self._samples[index] = elapsed
+
+    def quantiles(self) -> Dict[float, float]:
+        samples = sorted(self._samples)
+        if not samples:
+            return {q: 0.0 for q in QUANTILES}
+        return {q: samples[min(len(samples) - 1, int(q * len(samples)))] for q in QUANTILES}
+
+    def snapshot(self) -> Dict[str, object]:
+        quantiles = self.quantiles()
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "retries": self.retries,
+            "latency": {
+                "mean": self.total / self.count if self.count else 0.0,
+                "min": self.min if self.count else 0.0,
+                "max": self.max,
+                "p50": quantiles[0.5],
+                "p95": quantiles[0.95],
+                "p99": quantiles[0.99],
+            },
+            "request_bytes": self.request_bytes,
+            "response_bytes": self.response_bytes,
+            "statuses": {str(status): count for status, count in sorted(self.statuses.items())},
+            "error_types": dict(self.error_types),
+        }
+
+
+class MetricsRegistry:
+    """
+    Задержки, объёмы, статусы, повторы и ошибки по ключу (сервис, клиент, шаблон пути, метод).
+    Выключен по умолчанию: клиенты проверяют только enabled, и ключ даже не строится.
+    Включается MY_CODEGEN_METRICS=1 или enable(); с MY_CODEGEN_METRICS_FILE снимок
+    пишется при завершении процесса (.json - JSON, иначе текстовый формат Prometheus).
+    """
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._series: Dict[MetricKey, _Series] = {}
+
+    def enable(self) -> None:
+        self.enabled = True
+
+    def disable(self) -> None:
+        self.enabled = False
+
+    def reset(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+    @staticmethod
+    def key(client: object, method: str, path: str) -> MetricKey:
+        service = (getattr(client, "_service", "") or "").strip("/")
+        return MetricKey(service, type(client).__name__, path, method.upper())
+
+    def _get(self, key: MetricKey) -> _Series:
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = _Series()
+        return series
+
+    def record(self,
+               key: MetricKey,
+               elapsed: float,
+               status_code: int,
+               request_bytes: int = 0,
+               response_bytes: int = 0,
+               retries: int = 0) -> None:
+        with self._lock:
+            series = self._get(key)
+            series.observe(elapsed, retries)
+            series.statuses[status_code] = series.statuses.get(status_code, 0) + 1
+            series.request_bytes += request_bytes
+            series.response_bytes += response_bytes
+
+    def record_error(self, key: MetricKey, elapsed: float, error: BaseException, retries: int = 0) -> None:
+        """
+        Вызов закончился исключением транспорта (таймаут, обрыв) - ответа и статуса нет.
+        """
+        with self._lock:
+            series = self._get(key)
+            series.observe(elapsed, retries)
+            series.errors += 1
+            name = type(error).__name__
+            series.error_types[name] = series.error_types.get(name, 0) + 1
+
+    def snapshot(self) -> List[Dict[str, object]]:
+        with self._lock:
+            return [
+                {**key._asdict(), **series.snapshot()}
+                for key, series in sorted(self._series.items())
+            ]
+
+    def to_json(self) -> str:
+        return json.dumps(self.snapshot(), indent=2, ensure_ascii=False)
+
+    def to_prometheus(self, prefix: str = "my_codegen") -> str:
+        """
+        Текстовый формат Prometheus: у каждого семейства один заголовок # HELP/# TYPE,
+        за ним все его сэмплы по всем эндпоинтам - иначе парсер считает сэмплы untyped.
+        """
+        families = {
+            "request_duration_seconds": ("summary", "Request latency including retries"),
+            "requests_total": ("counter", "Completed requests by response status"),
+            "request_errors_total": ("counter", "Requests that ended with a transport error"),
+            "request_retries_total": ("counter", "Retries made by the client"),
+            "request_bytes_total": ("counter", "Request body bytes sent"),
+            "response_bytes_total": ("counter", "Response body bytes received"),
+        }
+        samples: Dict[str, List[str]] = {family: [] for family in families}
+        for item in self.snapshot():
+            labels = ",".join(
+                f'{name}="{_escape_label(str(item[name]))}"' for name in MetricKey._fields
+            )
+            latency = item["latency"]
+            duration = samples["request_duration_seconds"]
+            for quantile, field_name in zip(QUANTILES, ("p50", "p95", "p99")):
+                duration.append(
+                    f'{prefix}_request_duration_seconds{{{labels},quantile="{quantile}"}} {latency[field_name]:.6f}'
+                )
+            duration.append(f"{prefix}_request_duration_seconds_sum{{{labels}}} {latency['mean'] * item['count']:.6f}")
+            duration.append(f"{prefix}_request_duration_seconds_count{{{labels}}} {item['count']}")
+            for status, count in item["statuses"].items():
+                samples["requests_total"].append(f'{prefix}_requests_total{{{labels},status="{status}"}} {count}')
+            samples["request_errors_total"].append(f"{prefix}_request_errors_total{{{labels}}} {item['errors']}")
+            samples["request_retries_total"].append(f"{prefix}_request_retries_total{{{labels}}} {item['retries']}")
+            samples["request_bytes_total"].append(f"{prefix}_request_bytes_total{{{labels}}} {item['request_bytes']}")
+            samples["response_bytes_total"].append(
+                f"{prefix}_response_bytes_total{{{labels}}} {item['response_bytes']}"
+            )
+        lines = []
+        for family, (metric_type, help_text) in families.items():
+            lines.append(f"# HELP {prefix}_{family} {help_text}")
+            lines.append(f"# TYPE {prefix}_{family} {metric_type}")
+            lines.extend(samples[family])
+        return "\n".join(lines) + "\n"
+
+    def export(self, path: str) -> None:
+        """
+        Формат по расширению: .json - JSON-снимок, иначе текстовый формат Prometheus.
+        """
+        content = self.to_json() if path.endswith(".json") else self.to_prometheus()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(content)
+        logger.info(f"HTTP metrics written to {path}")
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+_METRICS_FILE = os.getenv("MY_CODEGEN_METRICS_FILE")
+
+metrics = MetricsRegistry(enabled=os.getenv("MY_CODEGEN_METRICS", "0") == "1" or bool(_METRICS_FILE))
+
+if _METRICS_FILE:
+    atexit.register(metrics.export, _METRICS_FILE)
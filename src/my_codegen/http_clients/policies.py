@@ -0,0 +1,206 @@
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+from typing import Dict, FrozenSet, Optional, Tuple
+
+import requests
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE", "TRACE"})
+
+
+class DeadlineExceeded(requests.Timeout):
+    """
+    Вызов (со всеми повторами) не уложился в TimeoutPolicy.deadline.
+    Наследник requests.Timeout, чтобы существующие except Timeout его ловили.
+    """
+
+
+@dataclass(frozen=True)
+class TimeoutPolicy:
+    """
+    connect/read - таймауты одной попытки, deadline - на весь вызов вместе с повторами и паузами.
+    """
+    connect: float = 10
+    read: float = 60
+    deadline: Optional[float] = 120
+
+    def remaining(self, started: float) -> Optional[float]:
+        if self.deadline is None:
+            return None
+        return self.deadline - (time.monotonic() - started)
+
+    def for_attempt(self, remaining: Optional[float]) -> Tuple[float, float]:
+        """
+        (connect, read) для requests; попытка не может пережить общий дедлайн. Дедлайн уже
+        прошёл (например, за время ожидания в лимитах) - DeadlineExceeded, а не таймаут 0:
+        requests понимает 0 как неблокирующий сокет, а отрицательный - как ошибку.
+        """
+        if remaining is None:
+            return self.connect, self.read
+        if remaining <= 0:
+            raise DeadlineExceeded(f"Deadline of {self.deadline}s exceeded before the attempt started")
+        return min(self.connect, remaining), min(self.read, remaining)
+
+
+class RetryBudget:
+    """
+    Бюджет повторов: каждый запрос пополняет его на ratio, каждый повтор тратит единицу.
+    Когда сервис лежит, повторы быстро кончаются и не умножают нагрузку (retry storm).
+    min_tokens - запас на старте, чтобы первые запросы тоже могли повторяться.
+    """
+
+    def __init__(self, ratio: float = 0.2, min_tokens: float = 10, max_tokens: float = 100):
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self._tokens = min_tokens
+        self._lock = threading.Lock()
+
+    def deposit(self) -> None:
+        with self._lock:
+            self._tokens = min(self.max_tokens, self._tokens + self.ratio)
+
+    def withdraw(self) -> bool:
+        with self._lock:
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+    @property
+    def tokens(self) -> float:
+        return self._tokens
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """
+    max_attempts - всего попыток, включая первую. Пауза - экспоненциальная с full jitter
+    (случайная от 0 до base * 2^(n-1), не больше backoff_max), либо Retry-After сервера,
+    если он не больше max_retry_after. Неидемпотентные методы (POST, PATCH) повторяются
+    только при ошибке установки соединения, когда запрос точно не ушёл.
+    """
+    max_attempts: int = 3
+    backoff_base: float = 0.5
+    backoff_max: float = 10
+    statuses: FrozenSet[int] = frozenset({429, 502, 503, 504})
+    retry_connection_errors: bool = True
+    retry_non_idempotent: bool = False
+    respect_retry_after: bool = True
+    max_retry_after: float = 30
+    budget: Optional[RetryBudget] = field(default=None, compare=False)
+
+    def is_idempotent(self, method: str) -> bool:
+        return self.retry_non_idempotent or method.upper() in IDEMPOTENT_METHODS
+
+    def retry_on_status(self, method: str, status_code: int, attempt: int) -> bool:
+        return attempt < self.max_attempts and status_code in self.statuses and self.is_idempotent(method)
+
+    def retry_on_error(self, method: str, error: Exception, attempt: int, connect_error: bool) -> bool:
+        """
+        connect_error - соединение не установилось, тело запроса до сервера не дошло.
+        """
+        if attempt >= self.max_attempts or not self.retry_connection_errors:
+            return False
+        return connect_error or self.is_idempotent(method)
+
+    def backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1)))
+
+    def delay(self, attempt: int, retry_after: Optional[str] = None) -> Optional[float]:
+        """
+        Пауза перед следующей попыткой; None - сервер просит ждать дольше max_retry_after.
+        """
+        if self.respect_retry_after and retry_after:
+            seconds = parse_retry_after(retry_after)
+            if seconds is not None:
+                return seconds if seconds <= self.max_retry_after else None
+        return self.backoff(attempt)
+
+
+def parse_retry_after(value: str) -> Optional[float]:
+    """
+    Retry-After: секунды или HTTP-дата.
+    """
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class RetryStats:
+    """
+    Счётчики повторов одного RequestHandler.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.attempts = 0
+        self.retries = 0
+        self.gave_up = 0
+        self.budget_exhausted = 0
+        self.deadline_exceeded = 0
+        self.retries_by_reason: Dict[str, int] = {}
+
+    def record_call(self) -> None:
+        with self._lock:
+            self.calls += 1
+
+    def record_attempt(self) -> None:
+        with self._lock:
+            self.attempts += 1
+
+    def record_retry(self, reason: str) -> None:
+        with self._lock:
+            self.retries += 1
+            self.retries_by_reason[reason] = self.retries_by_reason.get(reason, 0) + 1
+
+    def record(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def snapshot(self) -> Dict[str, object]:
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "attempts": self.attempts,
+                "retries": self.retries,
+                "gave_up": self.gave_up,
+                "budget_exhausted": self.budget_exhausted,
+                "deadline_exceeded": self.deadline_exceeded,
+                "retries_by_reason": dict(self.retries_by_reason),
+            }
+
+
+DEFAULT_RETRY_POLICY = RetryPolicy()
+DEFAULT_TIMEOUT_POLICY = TimeoutPolicy()
+
+
+class PolicySelection:
+    """
+    Примесь для ApiClient/AsyncApiClient. Политики задаются атрибутами класса (общие и по
+    HTTP-методу в retry_policies/timeout_policies), переопределяются в конструкторе клиента.
+    """
+    retry_policy: RetryPolicy = DEFAULT_RETRY_POLICY
+    timeout_policy: TimeoutPolicy = DEFAULT_TIMEOUT_POLICY
+    retry_policies: Dict[str, RetryPolicy] = {}
+    timeout_policies: Dict[str, TimeoutPolicy] = {}
+
+    def _apply_policies(self, retry_policy: Optional[RetryPolicy], timeout_policy: Optional[TimeoutPolicy]) -> None:
+        if retry_policy is not None:
+            self.retry_policy = retry_policy
+            self.retry_policies = {}
+        if timeout_policy is not None:
+            self.timeout_policy = timeout_policy
+            self.timeout_policies = {}
+
+    def _retry_policy_for(self, method: str) -> RetryPolicy:
+        return self.retry_policies.get(method.upper(), self.retry_policy)
+
+    def _timeout_policy_for(self, method: str) -> TimeoutPolicy:
+        return self.timeout_policies.get(method.upper(), self.timeout_policy)
@@ -0,0 +1,426 @@
+import asyncio
+import os
+import re
+import tempfile
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from typing import Dict, List, Optional, Tuple
+
+from my_codegen.http_clients.policies import DeadlineExceeded
+
+try:
+    import fcntl
+except ImportError:  # Windows: межпроцессный бэкенд недоступен
+    fcntl = None
+
+# Как часто проверять свободный слот в межпроцессном семафоре и в async-режиме
+POLL_INTERVAL = 0.005
+
+
+class TokenBucket:
+    """
+    rate запросов в секунду с всплеском до burst. reserve() сразу забирает токен (баланс
+    может уйти в минус) и возвращает, сколько ждать, - так ожидание одинаково работает
+    и для потоков (time.sleep), и для корутин (asyncio.sleep).
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate) - 1
+            self._updated = now
+            return max(0.0, -self._tokens / self.rate)
+
+    def refund(self) -> None:
+        """
+        Вернуть токен, взятый reserve(), если вызов так и не состоялся.
+        """
+        with self._lock:
+            self._tokens = min(self.burst, self._tokens + 1)
+
+
+class FileTokenBucket(TokenBucket):
+    """
+    Тот же бакет, но состояние (токены и время) лежит в файле под flock - общий бюджет
+    для всех процессов на хосте (pytest-xdist, параллельные скрипты).
+    """
+
+    def __init__(self, path: str, rate: float, burst: int = 1):
+        if fcntl is None:
+            raise RuntimeError("File-based rate limiting requires fcntl (POSIX only)")
+        super().__init__(rate, burst)
+        self.path = path
+
+    def reserve(self) -> float:
+        with open(self.path, "a+") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                f.seek(0)
+                state = f.read().split()
+                now = time.time()
+                tokens, updated = (float(state[0]), float(state[1])) if len(state) == 2 else (self.burst, now)
+                tokens = min(self.burst, tokens + (now - updated) * self.rate) - 1
+                f.seek(0)
+                f.truncate()
+                f.write(f"{tokens} {now}")
+                f.flush()
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+        return max(0.0, -tokens / self.rate)
+
+    def refund(self) -> None:
+        with open(self.path, "a+") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                f.seek(0)
+                state = f.read().split()
+                if len(state) != 2:
+                    return
+                f.seek(0)
+                f.truncate()
+                f.write(f"{min(self.burst, float(state[0]) + 1)} {state[1]}")
+                f.flush()
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+
+class InFlightLimit:
+    """
+    Не больше limit одновременных запросов в процессе.
+    """
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self._semaphore = threading.BoundedSemaphore(limit)
+
+    def try_acquire(self) -> Optional[object]:
+        return True if self._semaphore.acquire(blocking=False) else None
+
+    def acquire(self, timeout: Optional[float] = None) -> Optional[object]:
+        """
+        None - слот не освободился за timeout секунд.
+        """
+        if timeout is None:
+            acquired = self._semaphore.acquire()
+        else:
+            acquired = self._semaphore.acquire(timeout=max(0.0, timeout))
+        return True if acquired else None
+
+    def release(self, handle: object) -> None:
+        self._semaphore.release()
+
+
+class FileInFlightLimit:
+    """
+    Не больше limit одновременных запросов на хосте: слот - это flock на одном из limit
+    файлов. Блокировка снимается ядром и при падении процесса, слоты не утекают.
+    """
+
+    def __init__(self, path: str, limit: int):
+        if fcntl is None:
+            raise RuntimeError("File-based concurrency limiting requires fcntl (POSIX only)")
+        self.limit = limit
+        self._paths = [f"{path}.slot{i}" for i in range(limit)]
+
+    def try_acquire(self) -> Optional[object]:
+        for path in self._paths:
+            f = open(path, "a")
+            try:
+                fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                return f
+            except OSError:
+                f.close()
+        return None
+
+    def acquire(self, timeout: Optional[float] = None) -> Optional[object]:
+        give_up_at = None if timeout is None else time.monotonic() + timeout
+        while True:
+            handle = self.try_acquire()
+            if handle is not None:
+                return handle
+            if give_up_at is not None and time.monotonic() >= give_up_at:
+                return None
+            time.sleep(POLL_INTERVAL)
+
+    def release(self, handle: object) -> None:
+        fcntl.flock(handle, fcntl.LOCK_UN)
+        handle.close()
+
+
+class Limiter:
+    """
+    Лимит одного сервиса или эндпоинта: бакет и/или семафор плюс статистика ожидания.
+    Сначала выжидается токен, потом берётся слот: притормозленный вызов не держит слот,
+    пока спит. deadline (момент time.monotonic(), обычно дедлайн вызова) ограничивает
+    оба ожидания - не успели, DeadlineExceeded, а взятый токен возвращается в бакет.
+    """
+
+    def __init__(self, name: str, bucket: Optional[TokenBucket] = None, in_flight=None):
+        self.name = name
+        self.bucket = bucket
+        self.in_flight = in_flight
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.throttled = 0
+        self.wait_time = 0.0
+        self.max_wait = 0.0
+        self.deadline_exceeded = 0
+
+    def _record(self, waited: float) -> None:
+        with self._lock:
+            self.calls += 1
+            if waited > 0.001:
+                self.throttled += 1
+                self.wait_time += waited
+                self.max_wait = max(self.max_wait, waited)
+
+    def _deadline_exceeded(self, waiting_for: str) -> DeadlineExceeded:
+        with self._lock:
+            self.deadline_exceeded += 1
+        return DeadlineExceeded(f"Rate limit '{self.name}': deadline exceeded while waiting for {waiting_for}")
+
+    def _reserve(self, deadline: Optional[float]) -> float:
+        if self.bucket is None:
+            return 0.0
+        delay = self.bucket.reserve()
+        if deadline is not None and time.monotonic() + delay > deadline:
+            self.bucket.refund()
+            raise self._deadline_exceeded("a token")
+        return delay
+
+    def _refund(self) -> None:
+        if self.bucket is not None:
+            self.bucket.refund()
+
+    def _take_slot(self, deadline: Optional[float]) -> Optional[object]:
+        if self.in_flight is None:
+            return None
+        handle = self.in_flight.acquire(None if deadline is None else deadline - time.monotonic())
+        if handle is None:
+            raise self._deadline_exceeded("a concurrency slot")
+        return handle
+
+    async def _take_slot_async(self, deadline: Optional[float]) -> Optional[object]:
+        if self.in_flight is None:
+            return None
+        handle = self.in_flight.try_acquire()
+        while handle is None:
+            if deadline is not None and time.monotonic() >= deadline:
+                raise self._deadline_exceeded("a concurrency slot")
+            await asyncio.sleep(POLL_INTERVAL)
+            handle = self.in_flight.try_acquire()
+        return handle
+
+    def _release(self, handle: Optional[object]) -> None:
+        if handle is not None:
+            self.in_flight.release(handle)
+
+    def acquire(self, deadline: Optional[float] = None):
+        return _acquire((self,), deadline)
+
+    def acquire_async(self, deadline: Optional[float] = None):
+        return _acquire_async((self,), deadline)
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "throttled": self.throttled,
+                "wait_time": round(self.wait_time, 6),
+                "max_wait": round(self.max_wait, 6),
+                "deadline_exceeded": self.deadline_exceeded,
+                "rate": self.bucket.rate if self.bucket is not None else None,
+                "max_in_flight": self.in_flight.limit if self.in_flight is not None else None,
+            }
+
+
+class CallLimits:
+    """
+    Все лимиты, под которые попадает вызов (сервис и эндпоинт). Сначала токены всех
+    лимитов (ждём самый дальний), потом слоты: вызов не держит слот сервиса, пока
+    выжидает токен эндпоинта.
+    """
+
+    def __init__(self, limiters: Tuple[Limiter, ...]):
+        self.limiters = limiters
+
+    @staticmethod
+    def _deadline(remaining: Optional[float]) -> Optional[float]:
+        return None if remaining is None else time.monotonic() + remaining
+
+    def acquire(self, remaining: Optional[float] = None):
+        """
+        remaining - сколько секунд осталось до дедлайна вызова (None - без ограничения).
+        """
+        return _acquire(self.limiters, self._deadline(remaining))
+
+    def acquire_async(self, remaining: Optional[float] = None):
+        return _acquire_async(self.limiters, self._deadline(remaining))
+
+
+def _reserve_all(limiters: Tuple[Limiter, ...], deadline: Optional[float]) -> float:
+    """
+    Токены всех лимитов разом; возвращает, сколько ждать самого дальнего. Если хоть один
+    не успевает к дедлайну, уже взятые токены возвращаются.
+    """
+    delay = 0.0
+    reserved: List[Limiter] = []
+    try:
+        for limiter in limiters:
+            delay = max(delay, limiter._reserve(deadline))
+            reserved.append(limiter)
+    except DeadlineExceeded:
+        for limiter in reserved:
+            limiter._refund()
+        raise
+    return delay
+
+
+@contextmanager
+def _acquire(limiters: Tuple[Limiter, ...], deadline: Optional[float]):
+    started = time.monotonic()
+    delay = _reserve_all(limiters, deadline)
+    if delay > 0:
+        time.sleep(delay)
+    handles: List[Tuple[Limiter, Optional[object]]] = []
+    try:
+        try:
+            for limiter in limiters:
+                handles.append((limiter, limiter._take_slot(deadline)))
+        except DeadlineExceeded:
+            # Вызов не состоялся - токены ему больше не нужны
+            for limiter in limiters:
+                limiter._refund()
+            raise
+        for limiter in limiters:
+            limiter._record(time.monotonic() - started)
+        yield
+    finally:
+        for limiter, handle in reversed(handles):
+            limiter._release(handle)
+
+
+@asynccontextmanager
+async def _acquire_async(limiters: Tuple[Limiter, ...], deadline: Optional[float]):
+    started = time.monotonic()
+    delay = _reserve_all(limiters, deadline)
+    if delay > 0:
+        await asyncio.sleep(delay)
+    handles: List[Tuple[Limiter, Optional[object]]] = []
+    try:
+        try:
+            for limiter in limiters:
+                handles.append((limiter, await limiter._take_slot_async(deadline)))
+        except DeadlineExceeded:
+            for limiter in limiters:
+                limiter._refund()
+            raise
+        for limiter in limiters:
+            limiter._record(time.monotonic() - started)
+        yield
+    finally:
+        for limiter, handle in reversed(handles):
+            limiter._release(handle)
+
+
+class RateLimits:
+    """
+    Лимиты по сервису (_service сгенерированного клиента) и по эндпоинту (метод + шаблон пути):
+
+        rate_limits.configure("pet_store", rate=50, burst=10, max_in_flight=8)
+        rate_limits.configure("pet_store", rate=5, method="POST", path="/pets")
+
+    backend="file" (или MY_CODEGEN_RATE_LIMIT_BACKEND=file) делит бюджет между процессами
+    через файлы в lock_dir (MY_CODEGEN_RATE_LIMIT_DIR). Пока ничего не настроено,
+    клиенты проверяют только active.
+    """
+
+    def __init__(self, backend: str = "memory", lock_dir: Optional[str] = None):
+        self.backend = backend
+        self.lock_dir = lock_dir or os.path.join(tempfile.gettempdir(), "my_codegen_rate_limits")
+        self._lock = threading.Lock()
+        self._limiters: Dict[Tuple[str, Optional[str], Optional[str]], Limiter] = {}
+        self._resolved: Dict[Tuple[str, str, str], CallLimits] = {}
+
+    @property
+    def active(self) -> bool:
+        return bool(self._limiters)
+
+    @staticmethod
+    def _service(service: str) -> str:
+        return (service or "").strip("/")
+
+    def configure(self,
+                  service: str,
+                  rate: Optional[float] = None,
+                  burst: int = 1,
+                  max_in_flight: Optional[int] = None,
+                  method: Optional[str] = None,
+                  path: Optional[str] = None) -> Limiter:
+        """
+        Без method/path - лимит на весь сервис; с path - на эндпоинт (method=None - любой метод).
+        """
+        key = (self._service(service), method.upper() if method else None, path)
+        name = ":".join(part for part in key if part) or "default"
+        bucket = in_flight = None
+        if self.backend == "file":
+            os.makedirs(self.lock_dir, exist_ok=True)
+            base = os.path.join(self.lock_dir, re.sub(r"[^\w.-]+", "_", name))
+            if rate is not None:
+                bucket = FileTokenBucket(f"{base}.bucket", rate, burst)
+            if max_in_flight is not None:
+                in_flight = FileInFlightLimit(base, max_in_flight)
+        else:
+            if rate is not None:
+                bucket = TokenBucket(rate, burst)
+            if max_in_flight is not None:
+                in_flight = InFlightLimit(max_in_flight)
+        limiter = Limiter(name, bucket, in_flight)
+        with self._lock:
+            self._limiters[key] = limiter
+            self._resolved.clear()
+        return limiter
+
+    def for_call(self, service: str, method: str, path: str) -> Optional[CallLimits]:
+        service = self._service(service)
+        method = method.upper()
+        resolved_key = (service, method, path)
+        limits = self._resolved.get(resolved_key)
+        if limits is None:
+            with self._lock:
+                limiters = tuple(
+                    limiter for limiter in (
+                        self._limiters.get((service, None, None)),
+                        self._limiters.get((service, None, path)),
+                        self._limiters.get((service, method, path)),
+                    ) if limiter is not None
+                )
+                limits = self._resolved[resolved_key] = CallLimits(limiters)
+        return limits if limits.limiters else None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._limiters.clear()
+            self._resolved.clear()
+
+    def stats(self) -> Dict[str, Dict[str, object]]:
+        """
+        { имя лимита: calls, throttled (сколько вызовов ждали), wait_time, max_wait, deadline_exceeded, ... }
+        """
+        with self._lock:
+            limiters: List[Limiter] = list(self._limiters.values())
+        return {limiter.name: limiter.stats() for limiter in limiters}
+
+
+rate_limits = RateLimits(
+    backend=os.getenv("MY_CODEGEN_RATE_LIMIT_BACKEND", "memory"),
+    lock_dir=os.getenv("MY_CODEGEN_RATE_LIMIT_DIR"),
+)
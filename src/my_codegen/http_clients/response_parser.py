@@ -0,0 +1,114 @@
+import os
+from collections.abc import Sequence
+from enum import Enum
+from typing import Any, Dict, Iterator, List, Optional, Set, Type, TypeVar, Union
+
+from pydantic import BaseModel
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
+class ParseMode(str, Enum):
+    """
+    validate - полная валидация pydantic (как было);
+    construct - Model.construct() без валидации (вложенные модели остаются dict);
+    lazy - список отдаётся обёрткой, элемент валидируется при первом обращении к нему;
+    sampled - валидируются только parse_sample_size элементов списка, остальные construct().
+    """
+    VALIDATE = "validate"
+    CONSTRUCT = "construct"
+    LAZY = "lazy"
+    SAMPLED = "sampled"
+
+
+DEFAULT_PARSE_MODE = ParseMode(os.getenv("MY_CODEGEN_PARSE_MODE", ParseMode.VALIDATE.value))
+DEFAULT_SAMPLE_SIZE = int(os.getenv("MY_CODEGEN_PARSE_SAMPLE_SIZE", 10))
+
+
+class LazyModelList(Sequence):
+    """
+    Список моделей, который строит (и валидирует) элемент только при обращении к нему.
+    """
+
+    def __init__(self, model: Type[ModelT], items: List[Dict[str, Any]]):
+        self._model = model
+        self._items = items
+        self._built: List[Optional[ModelT]] = [None] * len(items)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __getitem__(self, index: Union[int, slice]):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        built = self._built[index]
+        if built is None:
+            built = self._built[index] = self._model(**self._items[index])
+        return built
+
+    def __iter__(self) -> Iterator[ModelT]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, LazyModelList):
+            other = list(other)
+        return isinstance(other, list) and list(self) == other
+
+    def __repr__(self) -> str:
+        built = sum(item is not None for item in self._built)
+        return f"LazyModelList[{self._model.__name__}]({len(self)} items, {built} built)"
+
+
+def sample_indices(size: int, sample_size: int) -> Set[int]:
+    """
+    Равномерно по списку, всегда с первым и последним элементом.
+    """
+    count = min(size, sample_size)
+    if count <= 0:
+        return set()
+    if count == 1:
+        return {0}
+    return {round(i * (size - 1) / (count - 1)) for i in range(count)}
+
+
+def parse_model(model: Type[ModelT], data: Dict[str, Any], mode: ParseMode) -> ModelT:
+    if mode is ParseMode.CONSTRUCT:
+        return model.construct(**data)
+    return model(**data)
+
+
+def parse_model_list(model: Type[ModelT],
+                     items: List[Dict[str, Any]],
+                     mode: ParseMode,
+                     sample_size: int = DEFAULT_SAMPLE_SIZE) -> Sequence:
+    if mode is ParseMode.CONSTRUCT:
+        return [model.construct(**item) for item in items]
+    if mode is ParseMode.LAZY:
+        return LazyModelList(model, items)
+    if mode is ParseMode.SAMPLED:
+        validated = sample_indices(len(items), sample_size)
+        return [
+            model(**item) if index in validated else model.construct(**item)
+            for index, item in enumerate(items)
+        ]
+    return [model(**item) for item in items]
+
+
+class ResponseParsing:
+    """
+    Примесь для ApiClient/AsyncApiClient. parse_mode задаётся атрибутом класса (сгенерированный
+    клиент с --parse-mode), переопределяется в конструкторе клиента/фасада или на экземпляре.
+    """
+    parse_mode: ParseMode = DEFAULT_PARSE_MODE
+    parse_sample_size: int = DEFAULT_SAMPLE_SIZE
+
+    def _apply_parse_mode(self, parse_mode: Optional[ParseMode]) -> None:
+        if parse_mode is not None:
+            self.parse_mode = ParseMode(parse_mode)
+
+    def _parse(self, model: Type[ModelT], data: Dict[str, Any]) -> ModelT:
+        return parse_model(model, data, self.parse_mode)
+
+    def _parse_list(self, model: Type[ModelT], items: List[Dict[str, Any]]) -> Sequence:
+        return parse_model_list(model, items, self.parse_mode, self.parse_sample_size)
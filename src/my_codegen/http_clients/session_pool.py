@@ -0,0 +1,143 @@
+import threading
+from http.cookiejar import DefaultCookiePolicy
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from my_codegen.utils.logger import logger
+
+
+@dataclass(frozen=True)
+class PoolSettings:
+    """
+    Параметры пула urllib3: pool_connections - сколько хостов держит адаптер,
+    pool_maxsize - сколько соединений к одному хосту переиспользуется одновременно.
+    """
+    pool_connections: int = 10
+    pool_maxsize: int = 10
+    pool_block: bool = False
+
+
+DEFAULT_POOL_SETTINGS = PoolSettings()
+
+
+class _Entry:
+    __slots__ = ("session", "refs")
+
+    def __init__(self, session: requests.Session):
+        self.session = session
+        self.refs = 0
+
+
+class SessionRegistry:
+    """
+    Общие requests.Session на хост: все клиенты (и фасады) с одним base URL и одинаковыми
+    настройками пула ходят через одну сессию, а значит через один тёплый пул соединений.
+    Сессия живёт, пока её держит хотя бы один клиент (acquire/release со счётчиком ссылок).
+    Общий у сессии только пул: её cookie jar ничего не принимает, куки хранит каждый
+    RequestHandler сам - иначе Set-Cookie из логина одного пользователя уходил бы в запросах другого.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: Dict[Tuple[str, PoolSettings], _Entry] = {}
+
+    @staticmethod
+    def key(base_url: Optional[str], settings: PoolSettings) -> Tuple[str, PoolSettings]:
+        """
+        Пул в urllib3 всё равно на хост, поэтому путь из base URL в ключ не входит.
+        """
+        parsed = urlparse(base_url or "")
+        origin = f"{parsed.scheme}://{parsed.netloc}".lower() if parsed.netloc else ""
+        return origin, settings
+
+    def acquire(self, base_url: Optional[str], settings: PoolSettings = DEFAULT_POOL_SETTINGS) -> requests.Session:
+        key = self.key(base_url, settings)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = _Entry(self._new_session(settings))
+            entry.refs += 1
+            return entry.session
+
+    def release(self, base_url: Optional[str], settings: PoolSettings = DEFAULT_POOL_SETTINGS) -> None:
+        key = self.key(base_url, settings)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+            entry.refs -= 1
+            if entry.refs > 0:
+                return
+            del self._entries[key]
+        entry.session.close()
+
+    def warm_up(self,
+                base_url: str,
+                settings: PoolSettings = DEFAULT_POOL_SETTINGS,
+                connections: int = 1,
+                timeout: float = 10) -> int:
+        """
+        Заранее открывает до connections соединений к хосту параллельными HEAD-запросами,
+        чтобы TLS-рукопожатия не попадали в замеры. Возвращает число успешных запросов.
+        Соединения переживут прогрев, только если сессию держит кто-то ещё (клиент или
+        фасад через acquire): иначе по release она закроется вместе с пулом.
+        """
+        session = self.acquire(base_url, settings)
+        try:
+            connections = max(1, min(connections, settings.pool_maxsize))
+
+            def ping(_: int) -> bool:
+                try:
+                    # Через send(), как RequestHandler: session.head() подмешивает CA-бандл из
+                    # окружения, и соединение легло бы в другой пул urllib3. Без close(): он
+                    # закрыл бы сокет, а прочитанный ответ сам возвращает соединение в пул
+                    session.send(requests.Request("HEAD", base_url).prepare(), timeout=timeout, allow_redirects=False)
+                    return True
+                except requests.RequestException as e:
+                    logger.warning(f"Pool warm-up request to {base_url} failed: {e}")
+                    return False
+
+            with ThreadPoolExecutor(max_workers=connections) as pool:
+                return sum(pool.map(ping, range(connections)))
+        finally:
+            self.release(base_url, settings)
+
+    def close_all(self) -> None:
+        with self._lock:
+            entries = list(self._entries.values())
+            self._entries.clear()
+        for entry in entries:
+            entry.session.close()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        { хост: число клиентов, держащих сессию } - видно, сколько пулов реально открыто.
+        """
+        with self._lock:
+            stats: Dict[str, int] = {}
+            for (origin, _), entry in self._entries.items():
+                stats[origin] = stats.get(origin, 0) + entry.refs
+            return stats
+
+    @staticmethod
+    def _new_session(settings: PoolSettings) -> requests.Session:
+        session = requests.Session()
+        session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+        # Повторы делает RequestHandler по RetryPolicy (с дедлайном и бюджетом), не urllib3
+        adapter = HTTPAdapter(
+            pool_connections=settings.pool_connections,
+            pool_maxsize=settings.pool_maxsize,
+            pool_block=settings.pool_block,
+            max_retries=0,
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+
+session_registry = SessionRegistry()
@@ -1,105 +1,372 @@
 import argparse
+import json
 import os
+import shutil
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, replace
+from typing import Any, Dict, List, Optional
 
+import requests
+import yaml
 from dotenv import load_dotenv
 
 from my_codegen.codegen.facade_generator import FacadeGenerator
-from my_codegen.codegen.generate_app_facade import generate_app_facade
+from my_codegen.codegen.generate_app_facade import api_class_name, generate_app_facade
 from my_codegen.codegen.client_generator import ClientGenerator
+from my_codegen.codegen.manifest import BuildManifest, hash_payload, schemas_digest
 from my_codegen.codegen.model_generator import ModelGenerator
+from my_codegen.swagger.fetcher import SpecFetcher
 from my_codegen.swagger.loader import SwaggerLoader
 from my_codegen.swagger.processor import SwaggerProcessor
+from my_codegen.swagger.resolver import RefResolver
 from my_codegen.utils.logger import logger
 load_dotenv()
 
 
-def main():
-    # 1. Fetch SWAGGER_URL from .env or environment variables
-    swagger_path = 'swagger.json'
-    parser = argparse.ArgumentParser(description="API Client Generator")
-    parser.add_argument(
-        "--swagger-url",
-        help="URL to download the Swagger JSON from",
-        required=True
-    )
-    args = parser.parse_args()
+def load_sources(config_path: str) -> List[str]:
+    """
+    Читает список спецификаций из YAML/JSON-файла: либо список, либо {"services": [...]}.
+    Элемент - строка (URL или путь) или словарь с ключом "url".
+    """
+    with open(config_path, "r", encoding="utf-8") as f:
+        config = yaml.safe_load(f) or []
+    if isinstance(config, dict):
+        config = config.get("services", [])
+    return [item["url"] if isinstance(item, dict) else str(item) for item in config]
 
-    swagger_url = args.swagger_url
-    if swagger_url:
-        logger.info(f"Swagger URL from CLI: {swagger_url}")
-    else:
-        logger.info("No CLI swagger-url provided, will fallback to environment variable")
+
+@dataclass
+class GenerationOptions:
+    force: bool = False
+    format_workers: Optional[int] = None
+    models_layout: str = "single"
+    models_group_by: str = "schema"
+    is_async: bool = False
+    parse_mode: Optional[str] = None
+
+    def output_key(self) -> Dict[str, Any]:
+        """
+        Настройки, от которых зависит результат генерации (force/format_workers - нет).
+        """
+        key = asdict(self)
+        key.pop("force")
+        key.pop("format_workers")
+        return key
+
+
+def generate_service(swagger_url: str,
+                     base_output_dir: str = "http_clients",
+                     options: Optional[GenerationOptions] = None,
+                     fetcher: Optional[SpecFetcher] = None) -> str:
+    """
+    Полный пайплайн одного сервиса: spec -> models -> clients -> format -> facade.
+    Спецификация скачивается в приватную временную директорию, поэтому несколько
+    сервисов можно генерировать параллельно. Возвращает имя сервиса.
+    """
+    spec_dir = tempfile.mkdtemp(prefix="my-codegen-")
+    try:
+        return _generate_service(
+            swagger_url,
+            os.path.join(spec_dir, "swagger.json"),
+            base_output_dir,
+            options or GenerationOptions(),
+            fetcher or SpecFetcher(),
+        )
+    finally:
+        shutil.rmtree(spec_dir, ignore_errors=True)
+
+
+def _external_digests(uris: List[str], fetcher: SpecFetcher, swagger_path: str) -> Optional[List[str]]:
+    """
+    sha256 внешних $ref-документов (http(s) - через кэш fetcher, т.е. условным GET).
+    None, если какой-то документ недоступен: такую сборку не считаем свежей.
+    """
+    digests = []
+    dest = os.path.join(os.path.dirname(swagger_path), "external-ref")
+    for uri in uris:
+        try:
+            digests.append(fetcher.fetch(uri, dest).digest)
+        except (OSError, requests.RequestException) as e:
+            logger.warning(f"Cannot fetch external $ref document '{uri}': {e}")
+            return None
+    return digests
+
+
+def _generate_service(swagger_url: str,
+                      swagger_path: str,
+                      base_output_dir: str,
+                      options: GenerationOptions,
+                      fetcher: SpecFetcher) -> str:
+    logger.info(f"Swagger URL: {swagger_url}")
     loader = SwaggerLoader(swagger_path)
 
-    # 2. Download swagger.json
+    # 1. Download swagger.json
     logger.info("Downloading Swagger file...")
-    loader.download_swagger(url=swagger_url)
-    logger.info("Swagger file downloaded. Now parsing the local swagger.json...")
+    fetched = loader.download_swagger(url=swagger_url, fetcher=fetcher)
+    known_service = fetched.meta.get("service_name")
+    if not options.force and known_service:
+        known_manifest = BuildManifest(os.path.join(base_output_dir, known_service))
+        # Правка только во внешнем $ref-документе тоже должна пересобрать сервис
+        external_digests = _external_digests(known_manifest.external_refs(), fetcher, swagger_path)
+        build_digest = hash_payload([fetched.digest, external_digests, options.output_key()])
+        if external_digests is not None and known_manifest.spec_fresh(build_digest):
+            logger.info(f"[{known_service}] spec unchanged since last build, nothing to do.")
+            return known_service
+    logger.info(f"Swagger file downloaded. Now parsing '{swagger_path}'...")
     loader.load()
-    swagger_dict = loader.swagger
+    resolver = RefResolver(loader.swagger, base_uri=swagger_url)
+    swagger_dict = resolver.spec
+    if resolver.bundled:
+        # datamodel-codegen читает файл сам: отдаём ему спеку с уже встроенными внешними $ref
+        with open(swagger_path, "w", encoding="utf-8") as f:
+            json.dump(swagger_dict, f)
+        logger.info("External $refs bundled into a single spec.")
     service_name = loader.get_service_name()
     logger.info(f"Service identified as: {service_name}")
 
-    # 3. Create output directories
-    base_output_dir = 'http_clients'
+    # 2. Create output directories
     service_dir = os.path.join(base_output_dir, service_name)
     endpoints_dir = os.path.join(service_dir, "endpoints")
     os.makedirs(service_dir, exist_ok=True)
     os.makedirs(endpoints_dir, exist_ok=True)
     logger.info(f"Created directories for service: '{service_dir}' and '{endpoints_dir}'")
+    manifest = BuildManifest(service_dir, force=options.force)
+    external_digests = _external_digests(resolver.external_documents, fetcher, swagger_path)
+    build_digest = None
+    if external_digests is not None:
+        build_digest = hash_payload([fetched.digest, external_digests, options.output_key()])
+    manifest.record_spec(build_digest, resolver.external_documents)
+    changed_files = []
+    changed_models = []
 
-    # 4. Generate models -> http_clients/<service_name>/models.py
-    models_file = os.path.join(service_dir, "models")
-    model_gen = ModelGenerator(swagger_path, models_file)
-    logger.info("Generating Pydantic models (via datamodel-codegen)...")
-    model_gen.generate_models()
-    logger.info("Models generated. Fixing BaseModel->BaseConfigModel inheritance...")
-    model_gen.fix_models_inheritance()
-    logger.info("Model inheritance fixed. Ready for further processing.")
-
-    # 5. Parse the Swagger to extract endpoints and imports
+    # 3. Parse the Swagger to extract endpoints and imports
     logger.info("Extracting endpoints and imports from swagger.")
-    processor = SwaggerProcessor(swagger_dict)
+    processor = SwaggerProcessor(swagger_dict, resolver)
     endpoints = processor.extract_endpoints()
     imports = processor.extract_imports()
     logger.info(f"Found {len(endpoints)} endpoints and {len(imports)} imports.")
-
-    # 6. Generate client classes -> http_clients/<service_name>/endpoints/*.py
-    logger.info("Generating client classes (by swagger tags)...")
     client_gen = ClientGenerator(
         endpoints=endpoints,
         imports=imports,
-        template_name='client_template.j2'
+        template_name='client_template.j2',
+        is_async=options.is_async,
+        parse_mode=options.parse_mode,
     )
-    file_to_class = client_gen.generate_clients(endpoints_dir, service_name)
-    logger.info(f"Generated {len(file_to_class)} client files.")
 
-    # 7. Auto-format (autoflake, black)
-    logger.info(f"Running auto-format (autoflake, black) on '{service_dir}'...")
-    model_gen.post_process_code(service_dir)
-    logger.info("Auto-format completed.")
+    # 4. Generate models -> http_clients/<service_name>/models.py (or models/ package)
+    models_file = os.path.join(service_dir, "models")
+    model_gen = ModelGenerator(swagger_path, models_file)
+    modular = options.models_layout == "modular"
+    tag_models = client_gen.models_by_tag() if modular and options.models_group_by == "tag" else None
+    models_digest = hash_payload([
+        schemas_digest(swagger_dict), options.models_layout, options.models_group_by, tag_models
+    ])
+    models_entry = os.path.join(models_file, "__init__.py") if modular else models_file + ".py"
+    if manifest.models_fresh(models_digest, models_entry):
+        logger.info("components.schemas unchanged since last build, skipping model generation.")
+    else:
+        logger.info("Generating Pydantic models (via datamodel-codegen)...")
+        model_gen.generate_models()
+        if modular:
+            logger.info(f"Splitting models into lazily loaded modules (grouped by {options.models_group_by})...")
+            model_gen.split_models(options.models_group_by, tag_models)
+        logger.info("Models generated. Fixing BaseModel->BaseConfigModel inheritance...")
+        model_gen.fix_models_inheritance()
+        logger.info("Model inheritance fixed. Ready for further processing.")
+        changed_models.extend(model_gen.model_files())
+        changed_files.extend(changed_models)
+        if modular:
+            changed_files.append(models_entry)
 
-    # 8. Generate local facade -> http_clients/<service_name>/facade.py
+    # 5. Generate client classes -> http_clients/<service_name>/endpoints/*.py
+    logger.info("Generating client classes (by swagger tags)...")
+    file_to_class = client_gen.generate_clients(endpoints_dir, service_name, manifest)
+    changed_files.extend(client_gen.written_files)
+    logger.info(
+        f"Generated {len(client_gen.written_files)} of {len(file_to_class)} client files "
+        f"({len(file_to_class) - len(client_gen.written_files)} unchanged)."
+    )
+    for stale_file in manifest.stale_files():
+        stale_path = os.path.join(endpoints_dir, stale_file)
+        if os.path.exists(stale_path):
+            os.remove(stale_path)
+            logger.info(f"Removed client for a tag that is no longer in the spec: '{stale_path}'")
+
+    # 6. Auto-format only the files produced by this run. Clients already import exactly
+    #    the models they use, so autoflake runs only on datamodel-codegen output.
+    if changed_files:
+        logger.info(f"Running auto-format (autoflake, black) on {len(changed_files)} changed files...")
+        format_errors = model_gen.post_process_code(
+            service_dir, changed_files, max_workers=options.format_workers, unused_imports_paths=changed_models
+        )
+        for failed_path in format_errors:
+            manifest.forget(failed_path)
+        logger.info(f"Auto-format completed ({len(format_errors)} files failed).")
+    else:
+        logger.info("Nothing changed since last build, skipping auto-format.")
+
+    # 7. Generate local facade -> http_clients/<service_name>/facade.py
     facade_gen = FacadeGenerator(
-        facade_class_name=f"{service_name.capitalize()}Api",
-        template_name='facade_template.j2'
+        facade_class_name=api_class_name(service_name),
+        template_name='facade_template.j2',
+        is_async=options.is_async,
     )
     facade_filename = "facade.py"
     logger.info("Generating local facade for the service.")
     facade_gen.generate_facade(file_to_class, service_dir, facade_filename)
     logger.info("Local facade generated successfully.")
 
-    # 9. Generate global facade (app_facade) -> http_clients/api_facade.py
+    manifest.save()
+    fetcher.remember(swagger_url, service_name=service_name)
+    logger.info(
+        f"Clients (endpoints/*.py), models, and facade for service '{service_name}' have been created at '{service_dir}'.")
+    return service_name
+
+
+def generate_batch(sources: List[str],
+                   base_output_dir: str = "http_clients",
+                   options: Optional[GenerationOptions] = None,
+                   max_workers: Optional[int] = None,
+                   fetcher: Optional[SpecFetcher] = None) -> List[str]:
+    """
+    Генерирует несколько сервисов параллельно, каждый в своём процессе.
+    Форматирование внутри воркера идёт последовательно, чтобы не плодить вложенные пулы.
+    Возвращает список источников, генерация которых упала.
+    """
+    workers = min(max_workers or os.cpu_count() or 1, len(sources))
+    worker_options = replace(options or GenerationOptions(), format_workers=1)
+    failed = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(generate_service, source, base_output_dir, worker_options, fetcher): source
+            for source in sources
+        }
+        for future in as_completed(futures):
+            source = futures[future]
+            try:
+                service_name = future.result()
+                logger.info(f"[{service_name}] generated from {source}")
+            except BaseException as e:  # noqa: BLE001 - run_command завершает воркер через sys.exit
+                logger.error(f"Generation failed for {source}: {type(e).__name__}: {e}")
+                failed.append(source)
+    return failed
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "stub":
+        # Подкоманда: my-api-client stub --swagger-url spec.json [--latency-ms ...]
+        from my_codegen.stub.server import main as stub_main
+        stub_main(sys.argv[2:])
+        return
+
+    parser = argparse.ArgumentParser(
+        description="API Client Generator",
+        epilog="Run 'my-api-client stub --help' for the local stub server built from a spec.",
+    )
+    parser.add_argument(
+        "--swagger-url",
+        nargs="+",
+        default=[],
+        help="One or more URLs or paths to download the Swagger JSON from"
+    )
+    parser.add_argument(
+        "--config",
+        help="YAML/JSON file listing spec URLs or paths (a list or {services: [...]})"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Max number of services generated in parallel (default: CPU count)"
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Ignore the build manifest and regenerate every stage"
+    )
+    parser.add_argument(
+        "--models-layout",
+        choices=("single", "modular"),
+        default="single",
+        help="single: one models.py; modular: models/ package with lazily loaded submodules"
+    )
+    parser.add_argument(
+        "--models-group-by",
+        choices=("schema", "tag"),
+        default="schema",
+        help="How the modular layout groups models into submodules"
+    )
+    parser.add_argument(
+        "--async",
+        dest="is_async",
+        action="store_true",
+        help="Generate async clients (AsyncApiClient on httpx) and an async service facade"
+    )
+    parser.add_argument(
+        "--parse-mode",
+        choices=("validate", "construct", "lazy", "sampled"),
+        default=None,
+        help="Response parsing mode baked into generated clients (default: validate, or $MY_CODEGEN_PARSE_MODE at runtime)"
+    )
+    parser.add_argument(
+        "--offline",
+        action="store_true",
+        help="Do not hit the network: use cached copies of remote specs"
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=None,
+        help="Directory for the downloaded spec cache (default: $MY_CODEGEN_CACHE_DIR or ~/.cache/my_codegen/specs)"
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=120,
+        help="Read timeout in seconds for spec downloads"
+    )
+    args = parser.parse_args()
+
+    sources = list(args.swagger_url)
+    if args.config:
+        sources.extend(load_sources(args.config))
+    if not sources:
+        parser.error("at least one --swagger-url or a --config file is required")
+
+    fetcher_kwargs = {"timeout": (10, args.timeout), "offline": args.offline}
+    if args.cache_dir:
+        fetcher_kwargs["cache_dir"] = args.cache_dir
+    fetcher = SpecFetcher(**fetcher_kwargs)
+
+    options = GenerationOptions(
+        force=args.force,
+        models_layout=args.models_layout,
+        models_group_by=args.models_group_by,
+        is_async=args.is_async,
+        parse_mode=args.parse_mode,
+    )
+
+    base_output_dir = "http_clients"
+    failed = []
+    if len(sources) == 1:
+        generate_service(sources[0], base_output_dir, options, fetcher)
+    else:
+        logger.info(f"Batch mode: generating {len(sources)} services...")
+        failed = generate_batch(sources, base_output_dir, options, max_workers=args.workers, fetcher=fetcher)
+
+    # 8. Generate global facade (app_facade) once -> http_clients/api_facade.py
     logger.info("Generating global (app) facade...")
     generate_app_facade(
         template_name="app_facade.j2",
-        output_path="http_clients/api_facade.py",
-        base_dir="http_clients"
+        output_path=os.path.join(base_output_dir, "api_facade.py"),
+        base_dir=base_output_dir
     )
     logger.info("Global facade (api_facade.py) generated successfully.")
 
-    logger.info(
-        f"Clients (endpoints/*.py), models, and facade for service '{service_name}' have been created at '{service_dir}'.")
+    if failed:
+        logger.error(f"{len(failed)} of {len(sources)} services failed: {', '.join(failed)}")
+        sys.exit(1)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,273 @@
+import argparse
+import importlib
+import json
+import os
+import random
+import re
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from dataclasses import dataclass, field
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Pattern, Tuple
+
+from my_codegen.codegen.data_models import Endpoint
+from my_codegen.http_clients.codec import default as json_default
+from my_codegen.pydantic_utils.data_generator_pydantic import GenerateData, RandomValueGenerator
+from my_codegen.swagger.fetcher import SpecFetcher
+from my_codegen.swagger.loader import SwaggerLoader
+from my_codegen.swagger.processor import SwaggerProcessor
+from my_codegen.swagger.resolver import RefResolver
+from my_codegen.utils.logger import logger
+
+PRIMITIVES = {"str": str, "int": int, "float": float, "bool": bool, "Any": Any}
+PATH_PARAM = re.compile(r"\{[^}/]+\}")
+LIST_SIZE = 3
+
+
+@dataclass
+class FaultProfile:
+    """
+    latency_ms (+ до jitter_ms сверху) на каждый ответ; с вероятностью slow_rate ответ
+    задерживается ещё на slow_ms - хвост p99; с вероятностью error_rate вместо
+    ожидаемого ответа - случайный статус из error_statuses.
+    """
+    latency_ms: float = 0
+    jitter_ms: float = 0
+    slow_rate: float = 0
+    slow_ms: float = 1000
+    error_rate: float = 0
+    error_statuses: Tuple[int, ...] = (500, 502, 503)
+
+    def delay(self, rng: random.Random) -> float:
+        delay = self.latency_ms + rng.uniform(0, self.jitter_ms)
+        if self.slow_rate and rng.random() < self.slow_rate:
+            delay += self.slow_ms
+        return delay / 1000
+
+    def error(self, rng: random.Random) -> Optional[int]:
+        if self.error_rate and rng.random() < self.error_rate:
+            return rng.choice(self.error_statuses)
+        return None
+
+
+@dataclass
+class Route:
+    endpoint: Endpoint
+    pattern: Pattern
+    status: int
+    cached_body: Optional[bytes] = field(default=None, repr=False)
+
+
+class BodyFactory:
+    """
+    Тела ответов из return_type эндпоинта: модели заполняет GenerateData, примитивы -
+    RandomValueGenerator. Без модуля моделей (или для неизвестного типа) отдаётся {}.
+    """
+
+    def __init__(self, models: Optional[Any] = None):
+        self.models = models
+
+    def value(self, return_type: str) -> Any:
+        if return_type.startswith("List["):
+            return [self.value(return_type[5:-1]) for _ in range(LIST_SIZE)]
+        if return_type in PRIMITIVES:
+            return RandomValueGenerator.random_value(PRIMITIVES[return_type])
+        model = getattr(self.models, return_type, None) if self.models is not None else None
+        if model is None:
+            return {}
+        try:
+            return GenerateData(model).fill_all_fields().to_dict()
+        except ValueError as e:
+            logger.warning(f"Cannot generate {return_type} for stub response, using {{}}: {e}")
+            return {}
+
+    def body(self, endpoint: Endpoint, status: int) -> bytes:
+        if status == HTTPStatus.NO_CONTENT:
+            return b""
+        return json.dumps(self.value(endpoint.return_type), default=json_default).encode("utf-8")
+
+
+class StubApp:
+    """
+    Маршруты из SwaggerProcessor.extract_endpoints: путь и метод -> ожидаемый статус и тело.
+    Тело генерируется при первом обращении к маршруту и дальше отдаётся из кэша.
+    Путь матчится как с префиксом сервиса (/<service>/pets, как ходят сгенерированные
+    клиенты), так и без него.
+    """
+
+    def __init__(self,
+                 endpoints: List[Endpoint],
+                 service_name: str = "",
+                 models: Optional[Any] = None,
+                 faults: FaultProfile = FaultProfile(),
+                 seed: Optional[int] = None):
+        self.faults = faults
+        self.bodies = BodyFactory(models)
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.routes: Dict[str, List[Route]] = {}
+        prefix = f"(?:/{re.escape(service_name)})?" if service_name else ""
+        seen = set()
+        for endpoint in endpoints:
+            # Операция с несколькими тегами приходит несколько раз - маршрут нужен один
+            if (endpoint.http_method, endpoint.path) in seen:
+                continue
+            seen.add((endpoint.http_method, endpoint.path))
+            route = Route(
+                endpoint=endpoint,
+                pattern=re.compile(f"^{prefix}{_path_regex(endpoint.sanitized_path)}/?$"),
+                status=HTTPStatus[endpoint.expected_status].value,
+            )
+            self.routes.setdefault(endpoint.http_method, []).append(route)
+        for routes in self.routes.values():
+            # Литеральные сегменты важнее параметров: /pets/mine раньше /pets/{id}
+            routes.sort(key=lambda r: (r.endpoint.path.count("{"), -len(r.endpoint.path)))
+
+    def match(self, method: str, path: str) -> Optional[Route]:
+        path = path.split("?", 1)[0]
+        for route in self.routes.get(method, []):
+            if route.pattern.match(path):
+                return route
+        return None
+
+    def body(self, route: Route) -> bytes:
+        if route.cached_body is None:
+            with self._lock:
+                if route.cached_body is None:
+                    route.cached_body = self.bodies.body(route.endpoint, route.status)
+        return route.cached_body
+
+    def respond(self, method: str, path: str) -> Tuple[int, bytes, float]:
+        """
+        (статус, тело, задержка в секундах) для запроса.
+        """
+        route = self.match(method, path)
+        with self._lock:
+            delay = self.faults.delay(self._rng)
+            error = self.faults.error(self._rng)
+        if route is None:
+            return HTTPStatus.NOT_FOUND, b'{"detail": "no such route in spec"}', delay
+        if error is not None:
+            return error, json.dumps({"detail": "injected error"}).encode(), delay
+        return route.status, self.body(route), delay
+
+
+def _path_regex(path: str) -> str:
+    parts = []
+    position = 0
+    for param in PATH_PARAM.finditer(path):
+        parts.append(re.escape(path[position:param.start()]))
+        parts.append("[^/]+")
+        position = param.end()
+    parts.append(re.escape(path[position:].rstrip("/")))
+    return "".join(parts)
+
+
+def make_handler(app: StubApp):
+    class StubHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # Заголовки и тело уходят одним send: без этого Nagle + delayed ACK дают +40 мс
+        wbufsize = -1
+
+        def log_message(self, format: str, *args) -> None:
+            logger.debug(f"stub: {self.address_string()} {format % args}")
+
+        def _handle(self) -> None:
+            length = int(self.headers.get("Content-Length") or 0)
+            if length:
+                self.rfile.read(length)
+            status, body, delay = app.respond(self.command, self.path)
+            if delay:
+                time.sleep(delay)
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            if body and self.command != "HEAD":
+                self.wfile.write(body)
+
+        do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = do_HEAD = do_OPTIONS = _handle
+
+    return StubHandler
+
+
+def load_endpoints(swagger_url: str, fetcher: Optional[SpecFetcher] = None) -> Tuple[str, List[Endpoint]]:
+    spec_dir = tempfile.mkdtemp(prefix="my-codegen-stub-")
+    try:
+        loader = SwaggerLoader(os.path.join(spec_dir, "swagger.json"))
+        loader.download_swagger(url=swagger_url, fetcher=fetcher or SpecFetcher())
+        loader.load()
+        resolver = RefResolver(loader.swagger, base_uri=swagger_url)
+        processor = SwaggerProcessor(resolver.spec, resolver)
+        return loader.get_service_name(), processor.extract_endpoints()
+    finally:
+        shutil.rmtree(spec_dir, ignore_errors=True)
+
+
+def import_models(module_name: str) -> Optional[Any]:
+    # Сгенерированные клиенты лежат в http_clients/ текущей директории
+    if os.getcwd() not in sys.path:
+        sys.path.insert(0, os.getcwd())
+    try:
+        return importlib.import_module(module_name)
+    except ImportError as e:
+        logger.warning(f"Models module '{module_name}' not importable ({e}); stub bodies will be empty objects")
+        return None
+
+
+def serve(app: StubApp, host: str = "127.0.0.1", port: int = 8080) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer((host, port), make_handler(app))
+    server.daemon_threads = True
+    return server
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="my-api-client stub",
+        description="Local stub HTTP server built from a Swagger/OpenAPI spec",
+    )
+    parser.add_argument("--swagger-url", required=True, help="URL or path of the spec")
+    parser.add_argument(
+        "--models-module",
+        default=None,
+        help="Module with generated models (default: http_clients.<service>.models)"
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--latency-ms", type=float, default=0, help="Base latency added to every response")
+    parser.add_argument("--jitter-ms", type=float, default=0, help="Uniform random latency on top of the base")
+    parser.add_argument("--slow-rate", type=float, default=0, help="Share of responses delayed by --slow-ms")
+    parser.add_argument("--slow-ms", type=float, default=1000, help="Extra delay of slow responses")
+    parser.add_argument("--error-rate", type=float, default=0, help="Share of responses replaced with an error")
+    parser.add_argument(
+        "--error-statuses",
+        default="500,502,503",
+        help="Comma-separated statuses used for injected errors"
+    )
+    parser.add_argument("--seed", type=int, default=None, help="Seed for latency/error injection")
+    args = parser.parse_args(argv)
+
+    service_name, endpoints = load_endpoints(args.swagger_url)
+    models = import_models(args.models_module or f"http_clients.{service_name}.models")
+    faults = FaultProfile(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        slow_rate=args.slow_rate,
+        slow_ms=args.slow_ms,
+        error_rate=args.error_rate,
+        error_statuses=tuple(int(status) for status in args.error_statuses.split(",") if status),
+    )
+    app = StubApp(endpoints, service_name, models, faults, args.seed)
+    server = serve(app, args.host, args.port)
+    routes = sum(len(routes) for routes in app.routes.values())
+    logger.info(f"Stub for '{service_name}': {routes} routes on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
@@ -0,0 +1,171 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urlparse
+from urllib.request import url2pathname
+
+import requests
+
+from my_codegen.utils.logger import logger
+
+DEFAULT_CACHE_DIR = os.getenv(
+    "MY_CODEGEN_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "my_codegen", "specs"),
+)
+
+
+@dataclass
+class FetchResult:
+    path: str
+    digest: str
+    not_modified: bool = False
+    meta: Dict[str, Any] = field(default_factory=dict)
+
+
+class SpecFetcher:
+    """
+    Загружает спецификацию по http(s)://, file:// или обычному пути без внешних процессов.
+    Для http(s) держит on-disk кэш по URL (тело + ETag/Last-Modified) и делает условный GET:
+    неизменившаяся спецификация стоит один 304 ответ.
+    """
+
+    def __init__(self,
+                 cache_dir: str = DEFAULT_CACHE_DIR,
+                 timeout: Tuple[float, float] = (10, 120),
+                 offline: bool = False,
+                 chunk_size: int = 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.timeout = timeout
+        self.offline = offline
+        self.chunk_size = chunk_size
+
+    def fetch(self, source: str, dest: str) -> FetchResult:
+        """
+        Кладёт спецификацию из source в dest и возвращает её sha256 и метаданные кэша.
+        """
+        scheme = urlparse(source).scheme.lower()
+        if scheme in ("http", "https"):
+            result = self._fetch_http(source)
+        elif scheme == "file":
+            result = self._fetch_local(source, url2pathname(urlparse(source).path))
+        else:
+            result = self._fetch_local(source, source)
+
+        if os.path.abspath(result.path) != os.path.abspath(dest):
+            shutil.copyfile(result.path, dest)
+            result.path = dest
+        return result
+
+    def remember(self, source: str, **fields: Any) -> None:
+        """
+        Дописывает произвольные поля в метаданные источника (например, service_name после генерации).
+        """
+        meta = self._read_meta(source)
+        meta.update(fields)
+        self._write_meta(source, meta)
+
+    # -- private helpers --
+    def _cache_key(self, source: str) -> str:
+        return hashlib.sha256(source.encode("utf-8")).hexdigest()
+
+    def _body_path(self, source: str) -> str:
+        return os.path.join(self.cache_dir, self._cache_key(source) + ".spec")
+
+    def _meta_path(self, source: str) -> str:
+        return os.path.join(self.cache_dir, self._cache_key(source) + ".json")
+
+    def _read_meta(self, source: str) -> Dict[str, Any]:
+        try:
+            with open(self._meta_path(source), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_meta(self, source: str, meta: Dict[str, Any]) -> None:
+        os.makedirs(self.cache_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(meta, f, indent=2)
+        os.replace(tmp_path, self._meta_path(source))
+
+    def _fetch_local(self, source: str, path: str) -> FetchResult:
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Spec file not found: {path}")
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(self.chunk_size), b""):
+                digest.update(chunk)
+        meta = self._read_meta(source)
+        sha256 = digest.hexdigest()
+        not_modified = meta.get("sha256") == sha256
+        if not not_modified:
+            meta = {"source": source, "sha256": sha256}
+            self._write_meta(source, meta)
+        return FetchResult(path=path, digest=sha256, not_modified=not_modified, meta=meta)
+
+    def _cached_result(self, source: str, meta: Dict[str, Any]) -> Optional[FetchResult]:
+        body_path = self._body_path(source)
+        if not meta.get("sha256") or not os.path.exists(body_path):
+            return None
+        return FetchResult(path=body_path, digest=meta["sha256"], not_modified=True, meta=meta)
+
+    def _fetch_http(self, url: str) -> FetchResult:
+        meta = self._read_meta(url)
+        cached = self._cached_result(url, meta)
+
+        if self.offline:
+            if cached is None:
+                raise FileNotFoundError(f"Offline mode: no cached spec for {url} in '{self.cache_dir}'")
+            logger.info(f"Offline mode: using cached spec for {url}")
+            return cached
+
+        headers = {}
+        if cached is not None:
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+
+        try:
+            with requests.get(url, headers=headers, stream=True, timeout=self.timeout) as response:
+                if response.status_code == 304 and cached is not None:
+                    logger.info(f"Spec not modified since last download (304): {url}")
+                    return cached
+                response.raise_for_status()
+                sha256 = self._stream_to_cache(url, response)
+                new_meta = {
+                    "source": url,
+                    "sha256": sha256,
+                    "etag": response.headers.get("ETag"),
+                    "last_modified": response.headers.get("Last-Modified"),
+                }
+        except requests.RequestException as e:
+            if cached is None:
+                raise
+            logger.warning(f"Failed to download {url} ({e}), falling back to the cached copy.")
+            return cached
+
+        not_modified = meta.get("sha256") == sha256
+        if not_modified:
+            new_meta = {**meta, **new_meta}
+        self._write_meta(url, new_meta)
+        return FetchResult(path=self._body_path(url), digest=sha256, not_modified=not_modified, meta=new_meta)
+
+    def _stream_to_cache(self, url: str, response: requests.Response) -> str:
+        os.makedirs(self.cache_dir, exist_ok=True)
+        digest = hashlib.sha256()
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                for chunk in response.iter_content(chunk_size=self.chunk_size):
+                    digest.update(chunk)
+                    f.write(chunk)
+            os.replace(tmp_path, self._body_path(url))
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        return digest.hexdigest()
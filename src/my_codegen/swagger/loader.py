@@ -1,23 +1,129 @@
 import json
-from typing import Dict, Any
+import os
+import time
+from typing import Dict, Any, Iterable, Optional, Tuple
 
-from my_codegen.utils.shell import run_command
+import yaml
+
+from my_codegen.swagger.fetcher import FetchResult, SpecFetcher
+from my_codegen.utils.logger import logger
+from my_codegen.utils.memory import peak_rss_mb
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# Секции спецификации, которые реально читает SwaggerProcessor
+SPEC_SECTIONS = ("openapi", "swagger", "info", "paths", "components")
+# Инлайн-примеры занимают большую часть крупных спек, но генератору не нужны
+SKIPPED_KEYS = ("example", "examples")
+
+YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
 
 
 class SwaggerLoader:
-    def __init__(self, file_path: str):
+    def __init__(self, file_path: str, sections: Optional[Iterable[str]] = SPEC_SECTIONS):
         self.file_path = file_path
+        self.sections = tuple(sections) if sections is not None else None
         self.swagger: Dict[str, Any] = {}
 
     def load(self) -> None:
-        with open(self.file_path, 'r', encoding='utf-8') as f:
-            self.swagger = json.load(f)
+        """
+        Загружает JSON или YAML спецификацию, оставляя только нужные секции.
+        JSON с установленным ijson (C-бэкенд) парсится потоково и без инлайн-примеров,
+        иначе используется orjson, если он есть, и stdlib json как запасной вариант.
+        """
+        started = time.perf_counter()
+        if self._is_yaml():
+            backend = "yaml"
+            with open(self.file_path, 'r', encoding='utf-8') as f:
+                self.swagger = self._select(yaml.load(f, Loader=YamlLoader) or {})
+        else:
+            backend, self.swagger = self._load_json()
+
+        size_mb = os.path.getsize(self.file_path) / (1024 * 1024)
+        logger.info(
+            f"Loaded spec '{self.file_path}' ({size_mb:.1f} MB) with {backend} "
+            f"in {time.perf_counter() - started:.2f}s, peak RSS {peak_rss_mb():.0f} MB"
+        )
 
     def get_service_name(self) -> str:
         info = self.swagger.get("info", {})
         title = info.get("title", "default")
         return title.strip().lower().replace(' ', '_')
 
-    def download_swagger(self, url: str):
-        swagger_cmd = f"curl {url} -o ./swagger.json"
-        run_command(swagger_cmd)
+    def download_swagger(self, url: str, fetcher: Optional[SpecFetcher] = None) -> FetchResult:
+        """
+        Скачивает (или копирует локальную) спецификацию в self.file_path через SpecFetcher.
+        """
+        fetcher = fetcher or SpecFetcher()
+        return fetcher.fetch(url, self.file_path)
+
+    # -- private helpers --
+    def _is_yaml(self) -> bool:
+        if self.file_path.endswith((".yaml", ".yml")):
+            return True
+        if self.file_path.endswith(".json"):
+            # Скачанная спека всегда лежит в swagger.json, поэтому смотрим на первый символ
+            with open(self.file_path, 'rb') as f:
+                head = f.read(1024).lstrip(b"\xef\xbb\xbf \t\r\n")
+            return bool(head) and head[:1] not in (b"{", b"[")
+        return False
+
+    def _select(self, spec: Dict[str, Any]) -> Dict[str, Any]:
+        if self.sections is None:
+            return spec
+        return {key: value for key, value in spec.items() if key in self.sections}
+
+    def _load_json(self) -> Tuple[str, Dict[str, Any]]:
+        if ijson is not None and ijson.backend == "yajl2_c":
+            with open(self.file_path, 'rb') as f:
+                return "ijson (streaming)", self._parse_sections(f)
+        if orjson is not None:
+            with open(self.file_path, 'rb') as f:
+                return "orjson", self._select(orjson.loads(f.read()))
+        with open(self.file_path, 'r', encoding='utf-8') as f:
+            return "json", self._select(json.load(f))
+
+    def _parse_sections(self, f) -> Dict[str, Any]:
+        """
+        Однопроходный потоковый разбор: неинтересные секции верхнего уровня и
+        инлайн-примеры операций (example/examples) не материализуются вовсе.
+        """
+        builder = ijson.ObjectBuilder()
+        skip_next = False
+        skip_depth = 0
+
+        for prefix, event, value in ijson.parse(f, use_float=True):
+            if skip_depth:
+                if event in ("start_map", "start_array"):
+                    skip_depth += 1
+                elif event in ("end_map", "end_array"):
+                    skip_depth -= 1
+                continue
+            if skip_next:
+                skip_next = False
+                if event in ("start_map", "start_array"):
+                    skip_depth = 1
+                continue
+            if event == "map_key":
+                if prefix == "":
+                    skip_next = self.sections is not None and value not in self.sections
+                else:
+                    # В components.schemas примеры попадают в модели (Field(example=...)), их не трогаем
+                    skip_next = (
+                        value in SKIPPED_KEYS
+                        and prefix.rsplit(".", 1)[-1] != "properties"
+                        and not prefix.startswith("components.schemas")
+                    )
+                if skip_next:
+                    continue
+            builder.event(event, value)
+
+        return builder.value if isinstance(builder.value, dict) else {}
@@ -1,48 +1,40 @@
+import itertools
 import re
-from typing import Dict, Any, List
+from typing import Dict, Any, FrozenSet, Iterator, List, Optional, Tuple
 from http import HTTPStatus
 
 from my_codegen.codegen.data_models import Endpoint, Parameter
+from my_codegen.swagger.resolver import RefResolver, schema_name_from_pointer, split_ref
+
+HTTP_METHODS = ('get', 'put', 'post', 'delete', 'options', 'head', 'patch', 'trace')
+PRIMITIVE_TYPES = ('string', 'integer', 'number', 'boolean', 'array')
+COMPOSITE_KEYS = ('properties', 'allOf', 'oneOf', 'anyOf', 'enum', 'additionalProperties')
 
 
 class SwaggerProcessor:
-    def __init__(self, swagger: Dict[str, Any]):
+    def __init__(self, swagger: Dict[str, Any], resolver: Optional[RefResolver] = None):
         self.swagger = swagger
+        self.resolver = resolver or RefResolver(swagger)
 
     def extract_endpoints(self) -> List[Endpoint]:
-        endpoints: List[Endpoint] = []
+        return list(self.iter_endpoints())
+
+    def iter_endpoints(self) -> Iterator[Endpoint]:
+        """
+        Потоково отдаёт эндпоинты. Каждая операция анализируется ровно один раз,
+        а результат размножается по её тегам.
+        """
         paths = self.swagger.get('paths', {})
 
-        for path, methods in paths.items():
-            for http_method, details in methods.items():
-                tags = details.get('tags', ['default'])
-                for tag in tags:
-                    method_name = self._determine_method_name(http_method, path, details)
-                    description = details.get('description', details.get('summary', ''))
-
-                    parameters = details.get('parameters', [])
-                    path_params = self._extract_parameters(parameters, 'path')
-                    query_params = self._extract_parameters(parameters, 'query')
-
-                    request_body = details.get('requestBody', {})
-                    payload_type = self._extract_payload_type(request_body)
-
-                    responses = details.get('responses', {})
-                    expected_status, return_type = self._extract_response_info(responses)
-
-                    endpoints.append(Endpoint(
-                        tag=tag,
-                        name=method_name,
-                        http_method=http_method.upper(),
-                        path=path,
-                        path_params=path_params,
-                        query_params=query_params,
-                        payload_type=payload_type,
-                        expected_status=expected_status,
-                        return_type=return_type,
-                        description=description
-                    ))
-        return endpoints
+        for path, path_item in paths.items():
+            path_item = self.resolver.deref(path_item)
+            path_level_parameters = path_item.get('parameters', [])
+            for http_method, details in path_item.items():
+                if http_method.lower() not in HTTP_METHODS:
+                    continue
+                operation = self._analyse_operation(path, http_method, details, path_level_parameters)
+                for tag in details.get('tags', ['default']):
+                    yield Endpoint(tag=tag, **operation)
 
     def extract_imports(self) -> List[str]:
         components = self.swagger.get('components', {})
@@ -50,6 +42,26 @@ class SwaggerProcessor:
         return [self._remove_underscores(name) for name in schemas.keys()]
 
     # -- private helpers --
+    def _analyse_operation(self,
+                           path: str,
+                           http_method: str,
+                           details: Dict[str, Any],
+                           path_level_parameters: List[Dict[str, Any]]) -> Dict[str, Any]:
+        path_params, query_params = self._split_parameters(path_level_parameters, details.get('parameters', []))
+        request_body = self.resolver.deref(details.get('requestBody', {}))
+        expected_status, return_type = self._extract_response_info(details.get('responses', {}))
+        return {
+            'name': self._determine_method_name(http_method, path, details),
+            'http_method': http_method.upper(),
+            'path': path,
+            'path_params': path_params,
+            'query_params': query_params,
+            'payload_type': self._extract_payload_type(request_body),
+            'expected_status': expected_status,
+            'return_type': return_type,
+            'description': details.get('description', details.get('summary', '')),
+        }
+
     @staticmethod
     def _remove_underscores(name: str) -> str:
         segments = name.split('_')
@@ -78,7 +90,8 @@ class SwaggerProcessor:
         expected_status = 'OK'
         return_type = 'Any'
         for status_code, response_obj in responses.items():
-            if status_code.startswith('2'):
+            if str(status_code).startswith('2'):
+                response_obj = self.resolver.deref(response_obj)
                 expected_status = self._get_http_status_enum(status_code)
                 resp_content = response_obj.get('content', {})
                 if 'application/json' in resp_content:
@@ -98,15 +111,56 @@ class SwaggerProcessor:
         except ValueError:
             return 'OK'
 
-    def _map_openapi_type_to_python(self, schema: Dict[str, Any]) -> str:
+    def _map_openapi_type_to_python(self, schema: Dict[str, Any], visiting: FrozenSet[str] = frozenset()) -> str:
+        """
+        visiting - $ref, через которые мы уже прошли: самоссылающийся алиас
+        (Tree: {type: array, items: {$ref: Tree}}) иначе уводит в бесконечную рекурсию.
+        """
         if '$ref' in schema:
-            raw_name = schema['$ref'].split('/')[-1]
-            return self._remove_underscores(raw_name)
+            ref = schema['$ref']
+            _, pointer = split_ref(ref)
+            raw_name = schema_name_from_pointer(pointer)
+            if ref in visiting:
+                # Рекурсивный алиас datamodel-codegen схлопнуть не может - остаётся моделью
+                return self._remove_underscores(raw_name) if raw_name else 'Any'
+            target = self.resolver.resolve(ref)
+            # Ссылки на components/schemas -> имя модели, кроме алиасов примитивов/массивов:
+            # их datamodel-codegen схлопывает (--collapse-root-models)
+            if raw_name and not self._is_collapsed_alias(target):
+                return self._remove_underscores(raw_name)
+            return self._map_openapi_type_to_python(target, visiting | {ref})
+
+        for key in ('oneOf', 'anyOf'):
+            if key in schema:
+                variants = []
+                for sub_schema in schema[key]:
+                    if sub_schema.get('type') == 'null':
+                        continue
+                    mapped = self._map_openapi_type_to_python(sub_schema, visiting)
+                    if mapped not in variants:
+                        variants.append(mapped)
+                if not variants:
+                    return 'Any'
+                if 'Any' in variants:
+                    return 'Any'
+                return variants[0] if len(variants) == 1 else f"Union[{', '.join(variants)}]"
+
+        if 'allOf' in schema:
+            # allOf из одной ссылки (обычно обёртка ради nullable/description) - это сама ссылка
+            refs = [sub_schema for sub_schema in schema['allOf'] if '$ref' in sub_schema]
+            extends = [sub_schema for sub_schema in schema['allOf'] if 'properties' in sub_schema]
+            if len(refs) == 1 and not extends:
+                return self._map_openapi_type_to_python(refs[0], visiting)
+            return 'Dict[str, Any]'
 
         openapi_type = schema.get('type', 'Any')
+        if isinstance(openapi_type, list):
+            # OpenAPI 3.1: type: [string, 'null']
+            non_null = [t for t in openapi_type if t != 'null']
+            openapi_type = non_null[0] if len(non_null) == 1 else 'any'
         if openapi_type == 'array':
             items = schema.get('items', {})
-            return f"List[{self._map_openapi_type_to_python(items)}]"
+            return f"List[{self._map_openapi_type_to_python(items, visiting)}]"
 
         type_mapping = {
             'string': 'str',
@@ -118,19 +172,44 @@ class SwaggerProcessor:
         }
         return type_mapping.get(openapi_type, 'Any')
 
-    def _extract_parameters(self, parameters: List[Dict[str, Any]], location: str) -> List[Parameter]:
-        result = []
-        for param in parameters:
-            if param.get('in') == location:
-                schema = param.get('schema', {})
-                result.append(
-                    Parameter(
-                        name=param.get('name'),
-                        type=self._map_openapi_type_to_python(schema),
-                        required=param.get('required', False)
-                    )
+    @staticmethod
+    def _is_collapsed_alias(schema: Dict[str, Any]) -> bool:
+        return (
+            isinstance(schema, dict)
+            and '$ref' not in schema
+            and schema.get('type') in PRIMITIVE_TYPES
+            and not any(key in schema for key in COMPOSITE_KEYS)
+        )
+
+    def _split_parameters(self,
+                          path_level: List[Dict[str, Any]],
+                          operation_level: List[Dict[str, Any]]) -> Tuple[List[Parameter], List[Parameter]]:
+        """
+        Один проход по параметрам пути и операции. Параметр операции с тем же (name, in)
+        переопределяет параметр уровня пути.
+        """
+        merged: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        for param in itertools.chain(path_level, operation_level):
+            param = self.resolver.deref(param)
+            merged[(param.get('name'), param.get('in'))] = param
+
+        path_params: List[Parameter] = []
+        query_params: List[Parameter] = []
+        for (name, location), param in merged.items():
+            if location == 'path':
+                target = path_params
+            elif location == 'query':
+                target = query_params
+            else:
+                continue
+            target.append(
+                Parameter(
+                    name=name,
+                    type=self._map_openapi_type_to_python(param.get('schema', {})),
+                    required=param.get('required', False)
                 )
-        return result
+            )
+        return path_params, query_params
 
     def _determine_method_name(self, http_method: str, path: str, details: Dict[str, Any]) -> str:
         summary = details.get('summary', '')
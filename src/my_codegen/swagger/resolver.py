@@ -0,0 +1,261 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+from urllib.parse import unquote, urljoin, urlparse
+from urllib.request import url2pathname
+
+import requests
+import yaml
+
+from my_codegen.swagger.loader import SwaggerLoader, YamlLoader
+
+SCHEMA_CONTAINERS = (("components", "schemas"), ("definitions",))
+
+
+def escape_pointer_token(token: str) -> str:
+    return token.replace("~", "~0").replace("/", "~1")
+
+
+def unescape_pointer_token(token: str) -> str:
+    return unquote(token).replace("~1", "/").replace("~0", "~")
+
+
+def split_ref(ref: str) -> Tuple[str, str]:
+    """
+    'common.yaml#/components/schemas/Foo' -> ('common.yaml', '/components/schemas/Foo').
+    """
+    uri, _, pointer = ref.partition("#")
+    return uri, pointer
+
+
+def schema_name_from_pointer(pointer: str) -> Optional[str]:
+    """
+    Имя схемы, если указатель ведёт прямо в components/schemas (или definitions в Swagger 2).
+    """
+    tokens = [unescape_pointer_token(t) for t in pointer.split("/")[1:]]
+    for container in SCHEMA_CONTAINERS:
+        if len(tokens) == len(container) + 1 and tuple(tokens[:-1]) == container:
+            return tokens[-1]
+    return None
+
+
+def iter_nodes(node: Any, pointer: str = "") -> Iterator[Tuple[str, Any]]:
+    """
+    Обходит документ итеративно, отдавая (json-pointer, узел) для каждого dict/list.
+    """
+    stack = [(pointer, node)]
+    while stack:
+        current_pointer, current = stack.pop()
+        yield current_pointer, current
+        if isinstance(current, dict):
+            items = current.items()
+        elif isinstance(current, list):
+            items = enumerate(current)
+        else:
+            continue
+        for key, value in items:
+            if isinstance(value, (dict, list)):
+                stack.append((f"{current_pointer}/{escape_pointer_token(str(key))}", value))
+
+
+class CircularRefError(ValueError):
+    pass
+
+
+class RefResolver:
+    """
+    Индекс $ref для одной спецификации.
+
+    При создании один раз обходит документ и строит карту json-pointer -> узел,
+    поэтому разрешение ссылки - это поиск в словаре, а результат (с учётом цепочек
+    $ref -> $ref) кэшируется. Внешние ссылки ('other.yaml#/...') подтягиваются
+    параллельно и встраиваются в основной документ (bundle): схемы переносятся
+    в components/schemas, остальное подставляется по месту.
+    """
+
+    def __init__(self, spec: Dict[str, Any], base_uri: str = "", max_workers: int = 8, timeout: float = 60):
+        self.base_uri = _normalize_uri(base_uri) if base_uri else ""
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.spec = spec
+        self.index: Dict[str, Any] = {}
+        self._cache: Dict[str, Any] = {}
+        self.bundled = False
+        # Внешние документы, встроенные в spec (абсолютные пути/URL), - входы сборки наравне с основным
+        self.external_documents: List[str] = []
+
+        external_refs = self._build_index()
+        if external_refs:
+            self.spec = self._bundle(external_refs)
+            self.bundled = True
+            self.index = {}
+            self._build_index()
+
+    def resolve(self, ref: str) -> Any:
+        """
+        Возвращает узел, на который указывает локальная ссылка '#/...', проходя цепочки $ref.
+        """
+        if ref in self._cache:
+            return self._cache[ref]
+
+        seen: List[str] = []
+        current = ref
+        while True:
+            if current in seen:
+                raise CircularRefError(f"Circular $ref chain: {' -> '.join(seen + [current])}")
+            seen.append(current)
+            uri, pointer = split_ref(current)
+            if uri:
+                raise ValueError(f"External $ref was not bundled: {current}")
+            if pointer not in self.index:
+                raise KeyError(f"Unresolvable $ref: {current}")
+            node = self.index[pointer]
+            if isinstance(node, dict) and isinstance(node.get("$ref"), str):
+                current = node["$ref"]
+                if current in self._cache:
+                    node = self._cache[current]
+                    break
+                continue
+            break
+
+        for visited in seen:
+            self._cache[visited] = node
+        return node
+
+    def deref(self, node: Any) -> Any:
+        """
+        Если узел - {'$ref': ...}, возвращает то, на что он указывает, иначе сам узел.
+        """
+        if isinstance(node, dict) and isinstance(node.get("$ref"), str):
+            return self.resolve(node["$ref"])
+        return node
+
+    # -- indexing --
+    def _build_index(self) -> Set[str]:
+        external = set()
+        for pointer, node in iter_nodes(self.spec):
+            self.index[pointer] = node
+            if isinstance(node, dict) and isinstance(node.get("$ref"), str):
+                uri, _ = split_ref(node["$ref"])
+                if uri:
+                    external.add(uri)
+        return external
+
+    # -- bundling of multi-file specs --
+    @staticmethod
+    def _absolute_uri(uri: str, relative_to: str) -> str:
+        if urlparse(uri).scheme in ("http", "https", "file") or os.path.isabs(uri):
+            return _normalize_uri(uri)
+        if urlparse(relative_to).scheme in ("http", "https"):
+            return urljoin(relative_to, uri)
+        return _normalize_uri(os.path.join(os.path.dirname(relative_to), uri))
+
+    def _load_document(self, uri: str) -> Any:
+        if urlparse(uri).scheme in ("http", "https"):
+            response = requests.get(uri, timeout=self.timeout)
+            response.raise_for_status()
+            return yaml.load(response.text, Loader=YamlLoader)
+        loader = SwaggerLoader(uri, sections=None)
+        loader.load()
+        return loader.swagger
+
+    def _load_documents(self, roots: Set[str]) -> Dict[str, Any]:
+        """
+        Загружает все внешние документы (включая транзитивные) параллельно, волнами.
+        """
+        documents: Dict[str, Any] = {}
+        pending = {self._absolute_uri(uri, self.base_uri) for uri in roots}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            while pending:
+                batch = sorted(pending - set(documents))
+                pending = set()
+                for uri, document in zip(batch, pool.map(self._load_document, batch)):
+                    documents[uri] = document
+                    for _, node in iter_nodes(document):
+                        if isinstance(node, dict) and isinstance(node.get("$ref"), str):
+                            ref_uri, _ = split_ref(node["$ref"])
+                            if ref_uri:
+                                absolute = self._absolute_uri(ref_uri, uri)
+                                if absolute not in documents and absolute != self.base_uri:
+                                    pending.add(absolute)
+        return documents
+
+    def _bundle(self, external_refs: Set[str]) -> Dict[str, Any]:
+        documents = self._load_documents(external_refs)
+        self.external_documents = sorted(documents)
+        documents[self.base_uri] = self.spec
+        taken_names = set(self.spec.get("components", {}).get("schemas", {}))
+        hoisted_names: Dict[Tuple[str, str], str] = {}
+        hoisted_schemas: Dict[str, Any] = {}
+        inlining: List[Tuple[str, str]] = []
+
+        def lookup(uri: str, pointer: str) -> Any:
+            node = documents[uri]
+            for token in pointer.split("/")[1:]:
+                token = unescape_pointer_token(token)
+                node = node[int(token)] if isinstance(node, list) else node[token]
+            return node
+
+        def hoist(uri: str, pointer: str) -> str:
+            key = (uri, pointer)
+            if key in hoisted_names:
+                return hoisted_names[key]
+            base_name = schema_name_from_pointer(pointer) or os.path.splitext(os.path.basename(uri))[0]
+            name, suffix = base_name, 1
+            while name in taken_names:
+                suffix += 1
+                name = f"{base_name}{suffix}"
+            taken_names.add(name)
+            # Имя регистрируем до обхода, чтобы рекурсивные схемы ссылались сами на себя
+            hoisted_names[key] = name
+            hoisted_schemas[name] = rewrite(lookup(uri, pointer), uri)
+            return name
+
+        def rewrite(node: Any, doc_uri: str) -> Any:
+            if isinstance(node, list):
+                return [rewrite(item, doc_uri) for item in node]
+            if not isinstance(node, dict):
+                return node
+            ref = node.get("$ref")
+            if not isinstance(ref, str):
+                return {key: rewrite(value, doc_uri) for key, value in node.items()}
+
+            ref_uri, pointer = split_ref(ref)
+            target_uri = self._absolute_uri(ref_uri, doc_uri) if ref_uri else doc_uri
+            if target_uri == self.base_uri:
+                return {**node, "$ref": f"#{pointer}"}
+            if schema_name_from_pointer(pointer) or (not pointer and _looks_like_schema(lookup(target_uri, ""))):
+                name = hoist(target_uri, pointer)
+                return {**node, "$ref": f"#/components/schemas/{escape_pointer_token(name)}"}
+
+            key = (target_uri, pointer)
+            if key in inlining:
+                raise CircularRefError(f"Circular external $ref: {target_uri}#{pointer}")
+            inlining.append(key)
+            try:
+                return rewrite(lookup(target_uri, pointer), target_uri)
+            finally:
+                inlining.pop()
+
+        bundled = rewrite(self.spec, self.base_uri)
+        if hoisted_schemas:
+            bundled.setdefault("components", {}).setdefault("schemas", {}).update(hoisted_schemas)
+        return bundled
+
+
+def _normalize_uri(uri: str) -> str:
+    """
+    http(s) оставляем как есть, file:// и относительные пути приводим к абсолютному пути.
+    """
+    parsed = urlparse(uri)
+    if parsed.scheme in ("http", "https"):
+        return uri
+    if parsed.scheme == "file":
+        uri = url2pathname(parsed.path)
+    return os.path.abspath(uri)
+
+
+def _looks_like_schema(node: Any) -> bool:
+    return isinstance(node, dict) and any(
+        key in node for key in ("type", "properties", "allOf", "oneOf", "anyOf", "enum", "items")
+    )
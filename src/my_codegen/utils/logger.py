@@ -1,8 +1,14 @@
 import json
 import logging
+import os
 import sys
+import threading
+from collections import deque
+from enum import Enum
+from typing import Any, Deque, Optional
 
 import allure
+import allure_commons
 
 
 def configure_logging():
@@ -19,24 +25,142 @@ configure_logging()
 logger = logging.getLogger(__name__)
 
 
-def allure_report(response, payload, method):
+def _truncate(text: str, max_bytes: Optional[int]) -> str:
+    if max_bytes is None or len(text) <= max_bytes:
+        return text
+    return f"{text[:max_bytes]}\n... truncated, {len(text)} chars total"
+
+
+def _as_text(data: Any, max_bytes: Optional[int]) -> Optional[str]:
+    """
+    bytes/str -> str не длиннее max_bytes (+ хвост). Декодируем только срез, а не всё тело.
+    """
+    if isinstance(data, bytes):
+        size = len(data)
+        if max_bytes is not None and size > max_bytes:
+            return data[:max_bytes].decode("utf-8", errors="replace") + f"\n... truncated, {size} bytes total"
+        return data.decode("utf-8")
+    if isinstance(data, str):
+        return _truncate(data, max_bytes)
+    return None
+
+
+def _pretty_json(text: str, max_bytes: Optional[int]) -> Optional[str]:
+    """
+    JSON переформатируем только если тело влезло в лимит: обрезанный JSON всё равно не распарсится.
+    """
+    if max_bytes is not None and len(text) > max_bytes:
+        return None
+    try:
+        return json.dumps(json.loads(text), indent=4, ensure_ascii=False)
+    except ValueError:
+        return None
+
+
+def allure_report(response, payload, method, max_bytes: Optional[int] = None):
     if payload is not None:
         try:
-            if isinstance(payload, bytes):
-                payload = payload.decode('utf-8')  # Assuming utf-8 encoding
-            formatted_data = json.dumps(json.loads(payload), indent=4, ensure_ascii=False) if isinstance(payload, str) else json.dumps(payload, indent=4, ensure_ascii=False)
+            text = _as_text(payload, max_bytes)
+            if text is None:
+                formatted_data = json.dumps(payload, indent=4, ensure_ascii=False)
+            else:
+                formatted_data = _pretty_json(text, max_bytes) or text
             html_data = f"<pre><code>{formatted_data}</code></pre>"
-        except (TypeError, UnicodeDecodeError, json.JSONDecodeError):
+        except (TypeError, UnicodeDecodeError):
             html_data = "<pre><code>Binary data cannot be serialized</code></pre>"
         allure.attach(html_data, name=f" ➡️ {method} - Data ", attachment_type=allure.attachment_type.HTML)
     else:
         allure.attach("Data is None", name=f"payload - {method}", attachment_type=allure.attachment_type.TEXT)
 
     try:
-        formatted_response = json.dumps(json.loads(response.text), indent=4, ensure_ascii=False)
+        response_text = _as_text(response.content, max_bytes) if max_bytes is not None else response.text
+    except UnicodeDecodeError:
+        response_text = f"Binary data, {len(response.content)} bytes"
+    formatted_response = _pretty_json(response_text, max_bytes)
+    if formatted_response is not None:
         html_response = f"<pre><code>{formatted_response}</code></pre>"
-    except ValueError:  # If response.text is not JSON
-        html_response = f"<pre>{response.text}</pre>"
+    else:  # If response.text is not JSON (or too large to pretty-print)
+        html_response = f"<pre>{response_text}</pre>"
 
     allure.attach(html_response, name=f"⬅️ {method} {response.status_code} -  Response",
-                  attachment_type=allure.attachment_type.HTML)
\ No newline at end of file
+                  attachment_type=allure.attachment_type.HTML)
+
+
+class ReportMode(str, Enum):
+    OFF = "off"
+    SUMMARY = "summary"
+    FULL = "full"
+    ON_FAILURE = "on_failure"
+
+
+def _summary(method: str, url: str, status_code: int, elapsed_ms: float) -> str:
+    return f"{method} {url} -> {status_code} in {elapsed_ms:.1f} ms"
+
+
+class RequestReporter:
+    """
+    Что и когда прикладывать к Allure по каждому запросу:
+    off - ничего; summary - одна строка (метод, URL, статус, время);
+    full - тело запроса и ответа, обрезанные до max_body_bytes;
+    on_failure - последние buffer_size пар запрос/ответ текущего потока лежат в кольцевом
+    буфере как есть и форматируются, только когда validate_response падает.
+    Без активного Allure-листенера (pytest без --alluredir) ничего не форматируется вовсе.
+    Значения по умолчанию берутся из MY_CODEGEN_REPORT_MODE / _MAX_BYTES / _BUFFER.
+    """
+
+    def __init__(self,
+                 mode: Optional[ReportMode] = None,
+                 max_body_bytes: Optional[int] = None,
+                 buffer_size: Optional[int] = None):
+        self.mode = ReportMode(mode or os.getenv("MY_CODEGEN_REPORT_MODE", ReportMode.FULL.value))
+        self.max_body_bytes = max_body_bytes or int(os.getenv("MY_CODEGEN_REPORT_MAX_BYTES", 64 * 1024))
+        self.buffer_size = buffer_size or int(os.getenv("MY_CODEGEN_REPORT_BUFFER", 20))
+        self._local = threading.local()
+
+    @staticmethod
+    def allure_active() -> bool:
+        return bool(allure_commons.plugin_manager.hook.attach_data.get_hookimpls())
+
+    def _buffer(self) -> Deque[tuple]:
+        buffer = getattr(self._local, "buffer", None)
+        if buffer is None or buffer.maxlen != self.buffer_size:
+            buffer = self._local.buffer = deque(maxlen=self.buffer_size)
+        return buffer
+
+    def report(self, response, payload, method: str, path: str, streamed: bool = False) -> None:
+        """
+        streamed=True - тело ответа ещё не прочитано (скачивание потоком): его не трогаем,
+        прикладываем только сводку, иначе отчёт вычитал бы весь файл в память.
+        """
+        if self.mode is ReportMode.OFF or not self.allure_active():
+            return
+        if self.mode is ReportMode.ON_FAILURE:
+            self._buffer().append((response, payload, method, path, streamed))
+            return
+        with allure.step(f"{method}: {path}"):
+            self._attach(response, payload, method, summary_only=self.mode is ReportMode.SUMMARY or streamed)
+
+    def report_failure(self) -> None:
+        """
+        Прикладывает накопленные в режиме on_failure запросы (последний - упавший) и чистит буфер.
+        """
+        if self.mode is not ReportMode.ON_FAILURE or not self.allure_active():
+            return
+        buffer = self._buffer()
+        with allure.step(f"Last {len(buffer)} requests before failure"):
+            while buffer:
+                response, payload, method, path, streamed = buffer.popleft()
+                with allure.step(f"{method}: {path}"):
+                    self._attach(response, payload, method, summary_only=streamed)
+
+    def _attach(self, response, payload, method: str, summary_only: bool) -> None:
+        if summary_only:
+            elapsed_ms = response.elapsed.total_seconds() * 1000
+            allure.attach(_summary(method, str(response.url), response.status_code, elapsed_ms),
+                          name=f"{method} {response.status_code}",
+                          attachment_type=allure.attachment_type.TEXT)
+        else:
+            allure_report(response=response, payload=payload, method=method, max_bytes=self.max_body_bytes)
+
+
+reporter = RequestReporter()
@@ -0,0 +1,235 @@
+import asyncio
+import hashlib
+import json
+import re
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+import pytest
+
+from my_codegen.http_clients.session_pool import session_registry
+
+Reply = Tuple[int, Dict[str, str], bytes]
+
+
+@dataclass
+class StubRequest:
+    method: str
+    path: str
+    query: Dict[str, str]
+    headers: Dict[str, str]
+    body: bytes
+    # порт клиента: один и тот же у запросов, прошедших по одному соединению
+    client_port: int = 0
+
+    def json(self):
+        return json.loads(self.body)
+
+
+def echo(request: StubRequest) -> Reply:
+    """
+    Ответ по умолчанию: 200 и JSON с тем, что пришло. Статус можно заказать параметром ?status=.
+    """
+    status = int(request.query.get("status", 200))
+    if status == 204:
+        return status, {}, b""
+    body = {
+        "method": request.method,
+        "path": request.path,
+        "query": request.query,
+        "authorization": request.headers.get("Authorization"),
+        "body": request.json() if request.body else None,
+    }
+    return status, {"Content-Type": "application/json"}, json.dumps(body).encode()
+
+
+class RecordingServer:
+    """
+    HTTP-заглушка в том же процессе: каждый запрос записывается в requests, ответ
+    строит handler(StubRequest) -> (статус, заголовки, тело).
+    """
+
+    def __init__(self, handler: Callable[[StubRequest], Reply] = echo):
+        self.handler = handler
+        self.requests: List[StubRequest] = []
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format: str, *args) -> None:
+                pass
+
+            def _handle(self) -> None:
+                length = int(self.headers.get("Content-Length") or 0)
+                parts = urlsplit(self.path)
+                request = StubRequest(
+                    method=self.command,
+                    path=parts.path,
+                    query=dict(parse_qsl(parts.query, keep_blank_values=True)),
+                    headers=dict(self.headers),
+                    body=self.rfile.read(length) if length else b"",
+                    client_port=self.client_address[1],
+                )
+                with server._lock:
+                    server.requests.append(request)
+                status, headers, body = server.handler(request)
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                if body and self.command != "HEAD":
+                    self.wfile.write(body)
+
+            do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = do_HEAD = _handle
+
+        return Handler
+
+    def start(self) -> "RecordingServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+class S3StandIn:
+    """
+    Минимальное S3-хранилище для StorageS3 (handler для RecordingServer): multipart
+    (POST ?uploads, PUT ?partNumber&uploadId, POST ?uploadId, DELETE ?uploadId) и одиночный PUT.
+    multipart=False - initiate отвечает 501, как хранилище без multipart.
+    fail_parts - {номер части: сколько первых попыток ответить 500}.
+    part_delay - задержка ответа на часть, чтобы части успели пересечься по времени.
+    """
+
+    def __init__(self, multipart: bool = True, fail_parts: Optional[Dict[int, int]] = None, part_delay: float = 0):
+        self.multipart = multipart
+        self.fail_parts = dict(fail_parts or {})
+        self.part_delay = part_delay
+        self.uploads: Dict[str, Dict[int, bytes]] = {}
+        self.part_attempts: Dict[int, int] = {}
+        self.objects: List[bytes] = []
+        self.aborted: List[str] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, request: StubRequest) -> Reply:
+        query = request.query
+        if request.method == "POST" and "uploads" in query:
+            return self._initiate()
+        if request.method == "PUT" and "partNumber" in query:
+            return self._part(query["uploadId"], int(query["partNumber"]), request.body)
+        if request.method == "POST" and "uploadId" in query:
+            return self._complete(query["uploadId"], request.body.decode())
+        if request.method == "DELETE" and "uploadId" in query:
+            with self._lock:
+                self.aborted.append(query["uploadId"])
+                self.uploads.pop(query["uploadId"], None)
+            return 204, {}, b""
+        if request.method == "PUT":
+            with self._lock:
+                self.objects.append(request.body)
+            return 200, {"ETag": _etag(request.body)}, b""
+        return 400, {}, b"unsupported request"
+
+    def _initiate(self) -> Reply:
+        if not self.multipart:
+            return 501, {}, b"multipart upload is not implemented"
+        upload_id = uuid.uuid4().hex
+        with self._lock:
+            self.uploads[upload_id] = {}
+        body = f"<InitiateMultipartUploadResult><UploadId>{upload_id}</UploadId></InitiateMultipartUploadResult>"
+        return 200, {"Content-Type": "application/xml"}, body.encode()
+
+    def _part(self, upload_id: str, number: int, body: bytes) -> Reply:
+        with self._lock:
+            self.part_attempts[number] = self.part_attempts.get(number, 0) + 1
+            if self.fail_parts.get(number, 0) >= self.part_attempts[number]:
+                return 500, {}, b"injected failure"
+            if upload_id not in self.uploads:
+                return 404, {}, b"no such upload"
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(self.part_delay)
+            with self._lock:
+                self.uploads[upload_id][number] = body
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+        return 200, {"ETag": _etag(body)}, b""
+
+    def _complete(self, upload_id: str, body: str) -> Reply:
+        listed = [(int(number), etag) for number, etag in
+                  re.findall(r"<PartNumber>(\d+)</PartNumber><ETag>([^<]+)</ETag>", body)]
+        with self._lock:
+            parts = self.uploads.pop(upload_id, None)
+        if parts is None or [number for number, _ in listed] != sorted(parts):
+            return 400, {}, b"part list does not match uploaded parts"
+        if any(_etag(parts[number]) != etag for number, etag in listed):
+            return 400, {}, b"etag mismatch"
+        with self._lock:
+            self.objects.append(b"".join(parts[number] for number, _ in listed))
+        return 200, {"Content-Type": "application/xml"}, b"<CompleteMultipartUploadResult/>"
+
+
+def _etag(body: bytes) -> str:
+    return f'"{hashlib.md5(body).hexdigest()}"'
+
+
+@pytest.fixture
+def serve():
+    """
+    serve(handler) -> запущенный RecordingServer; все серверы теста гасятся после него.
+    """
+    servers: List[RecordingServer] = []
+
+    def start(handler: Callable[[StubRequest], Reply]) -> RecordingServer:
+        server = RecordingServer(handler).start()
+        servers.append(server)
+        return server
+
+    try:
+        yield start
+    finally:
+        for server in servers:
+            server.stop()
+        session_registry.close_all()
+
+
+@pytest.fixture
+def stub_server():
+    server = RecordingServer().start()
+    try:
+        yield server
+    finally:
+        server.stop()
+        session_registry.close_all()
+
+
+@pytest.fixture
+def run():
+    """
+    Запуск корутины в тесте без pytest-asyncio.
+    """
+    return asyncio.run
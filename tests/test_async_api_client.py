@@ -0,0 +1,174 @@
+import importlib
+import json
+import shutil
+import sys
+from http import HTTPStatus
+
+import httpx
+import pytest
+
+from my_codegen.http_clients.async_api_client import AsyncApiClient, new_async_http_client
+from my_codegen.main import GenerationOptions, generate_service
+from my_codegen.stub.server import StubApp, load_endpoints
+from my_codegen.swagger.fetcher import SpecFetcher
+
+from conftest import RecordingServer
+
+PET_STORE = {
+    "openapi": "3.0.1",
+    "info": {"title": "Pet Store", "version": "1.0"},
+    "paths": {
+        "/pets": {
+            "get": {
+                "tags": ["pets"], "summary": "List pets",
+                "responses": {"200": {"description": "ok", "content": {"application/json": {
+                    "schema": {"type": "array", "items": {"$ref": "#/components/schemas/Pet"}}}}}},
+            },
+            "post": {
+                "tags": ["pets"], "summary": "Create pet",
+                "requestBody": {"content": {"application/json": {"schema": {"$ref": "#/components/schemas/NewPet"}}}},
+                "responses": {"201": {"description": "ok", "content": {"application/json": {
+                    "schema": {"$ref": "#/components/schemas/Pet"}}}}},
+            },
+        },
+        "/pets/{pet_id}": {
+            "delete": {
+                "tags": ["pets"], "summary": "Delete pet",
+                "parameters": [{"name": "pet_id", "in": "path", "required": True, "schema": {"type": "string"}}],
+                "responses": {"204": {"description": "gone"}},
+            },
+        },
+    },
+    "components": {"schemas": {
+        "Pet": {"type": "object", "required": ["id", "name"],
+                "properties": {"id": {"type": "string", "format": "uuid"}, "name": {"type": "string"}}},
+        "NewPet": {"type": "object", "required": ["name"], "properties": {"name": {"type": "string"}}},
+    }},
+}
+
+
+@pytest.mark.parametrize("method, expected_status", [
+    ("get", HTTPStatus.OK),
+    ("post", HTTPStatus.CREATED),
+    ("put", HTTPStatus.OK),
+    ("patch", HTTPStatus.OK),
+    ("delete", HTTPStatus.NO_CONTENT),
+])
+def test_methods_send_payload_and_validate_status(stub_server, run, method, expected_status):
+    async def call():
+        async with AsyncApiClient("token", stub_server.url) as client:
+            kwargs = {} if method in ("get", "delete") else {"payload": {"name": "Rex"}}
+            return await getattr(client, method)(
+                "/pets/{pet_id}", params={"status": expected_status.value}, expected_status=expected_status,
+                pet_id="1", **kwargs
+            )
+
+    result = run(call())
+
+    request = stub_server.requests[-1]
+    assert request.method == method.upper()
+    assert request.path == "/pets/1"
+    assert request.headers["Authorization"] == "Bearer token"
+    if method in ("get", "delete"):
+        assert request.body == b""
+    else:
+        assert request.json() == {"name": "Rex"}
+        assert result["body"] == {"name": "Rex"}
+    if expected_status == HTTPStatus.NO_CONTENT:
+        assert result == ""
+
+
+def test_unexpected_status_raises_assertion(stub_server, run):
+    async def call():
+        async with AsyncApiClient(base_url=stub_server.url) as client:
+            await client.get("/pets", params={"status": 404}, expected_status=HTTPStatus.OK)
+
+    with pytest.raises(AssertionError, match="Expected status: .*actual status: 404"):
+        run(call())
+
+
+def test_shared_http_client_is_left_open(stub_server, run):
+    async def call():
+        http_client = new_async_http_client()
+        async with AsyncApiClient(base_url=stub_server.url, http_client=http_client) as client:
+            await client.get("/pets")
+        assert not http_client.is_closed
+        await http_client.aclose()
+
+        async with AsyncApiClient(base_url=stub_server.url) as client:
+            await client.get("/pets")
+        return client.request_handler.http_client
+
+    assert run(call()).is_closed
+
+
+def test_retries_server_errors(run):
+    replies = iter([(503, {}, b""), (200, {"Content-Type": "application/json"}, b'{"ok": true}')])
+    server = RecordingServer(lambda request: next(replies)).start()
+    try:
+        async def call():
+            async with AsyncApiClient(base_url=server.url) as client:
+                return await client.get("/pets"), client.request_handler.retry_stats.snapshot()
+
+        result, stats = run(call())
+    finally:
+        server.stop()
+
+    assert result == {"ok": True}
+    assert len(server.requests) == 2
+    assert stats["retries"] == 1
+
+
+@pytest.fixture
+def generated_async_service(tmp_path, monkeypatch):
+    """
+    pet_store, сгенерированный с --async в tmp_path/http_clients и доступный для импорта.
+    """
+    if shutil.which("datamodel-codegen") is None:
+        pytest.skip("datamodel-codegen is not installed")
+    spec_path = tmp_path / "pet_store.json"
+    spec_path.write_text(json.dumps(PET_STORE))
+    service = generate_service(
+        str(spec_path),
+        str(tmp_path / "http_clients"),
+        GenerationOptions(is_async=True, format_workers=1),
+        SpecFetcher(cache_dir=str(tmp_path / "cache")),
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield service, str(spec_path)
+    for name in [name for name in sys.modules if name == "http_clients" or name.startswith("http_clients.")]:
+        del sys.modules[name]
+
+
+def test_generated_async_client_and_facade(generated_async_service, run):
+    service, spec_path = generated_async_service
+    facade_module = importlib.import_module(f"http_clients.{service}.facade")
+    models = importlib.import_module(f"http_clients.{service}.models")
+    service_name, endpoints = load_endpoints(spec_path)
+    app = StubApp(endpoints, service_name, models)
+    server = RecordingServer(lambda request: _stub_reply(app, request)).start()
+    try:
+        async def call():
+            async with facade_module.PetStoreApi("token", server.url) as api:
+                pets = await api.pets.list_pets()
+                created = await api.pets.create_pet(models.NewPet(name="Rex"))
+                await api.pets.delete_pet(pet_id=str(created.id))
+                assert isinstance(api.pets.request_handler.http_client, httpx.AsyncClient)
+                return pets, created
+
+        pets, created = run(call())
+    finally:
+        server.stop()
+
+    assert pets and all(isinstance(pet, models.Pet) for pet in pets)
+    assert isinstance(created, models.Pet)
+    assert [(r.method, r.path) for r in server.requests] == [
+        ("GET", "/pet_store/pets"),
+        ("POST", "/pet_store/pets"),
+        ("DELETE", f"/pet_store/pets/{created.id}"),
+    ]
+
+
+def _stub_reply(app: StubApp, request):
+    status, body, _ = app.respond(request.method, request.path)
+    return int(status), {"Content-Type": "application/json"}, body
@@ -0,0 +1,88 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from my_codegen.http_clients.batch import BatchCall, run_batch, run_batch_async
+
+
+def _fail(message: str):
+    raise ValueError(message)
+
+
+async def _fail_async(message: str):
+    raise ValueError(message)
+
+
+async def _echo_async(value, delay: float = 0):
+    await asyncio.sleep(delay)
+    return value
+
+
+def test_results_keep_call_order_and_failures_are_counted_apart():
+    result = run_batch([
+        BatchCall.of(lambda x: x * 2, 1),
+        (_fail, ("boom",)),
+        (lambda x, y=0: x + y, (1,), {"y": 2}),
+    ], max_workers=2)
+
+    assert result.results == [2, None, 3]
+    assert [(e.index, str(e.error)) for e in result.errors] == [(1, "boom")]
+    assert (result.completed, result.succeeded, result.failed, result.timed_out) == (3, 2, 1, 0)
+    assert not result.ok
+
+
+def test_deadline_cancels_calls_that_did_not_start():
+    release = threading.Event()
+    calls = [lambda: "fast"] + [release.wait] * 4
+
+    started = time.monotonic()
+    result = run_batch(calls, max_workers=2, deadline=0.2)
+    release.set()
+
+    assert time.monotonic() - started < 1
+    assert result.results[0] == "fast"
+    # Два медленных заняли оба потока, оставшиеся два так и не начались
+    assert (result.succeeded, result.failed, result.timed_out, result.cancelled) == (1, 0, 4, 2)
+    assert all(isinstance(e.error, TimeoutError) for e in result.errors)
+    assert "1 succeeded, 0 failed, 4 timed out (2 not started)" in result.summary()
+
+
+def test_empty_batch():
+    result = run_batch([])
+    assert result.results == [] and result.ok and result.completed == 0
+
+
+def test_async_batch_counts_successes_failures_and_timeouts(run):
+    calls = [
+        (_echo_async, ("a",)),
+        (_fail_async, ("boom",)),
+        (_echo_async, ("slow", 5)),
+        (_echo_async, ("queued",)),
+    ]
+
+    started = time.monotonic()
+    result = run(run_batch_async(calls, max_in_flight=3, deadline=0.2))
+
+    assert time.monotonic() - started < 1
+    assert result.results == ["a", None, None, "queued"]
+    assert (result.completed, result.succeeded, result.failed) == (3, 2, 1)
+    assert (result.timed_out, result.cancelled) == (1, 0)
+    assert [type(e.error) for e in result.errors] == [ValueError, TimeoutError]
+
+
+def test_async_batch_cancels_calls_waiting_for_a_slot(run):
+    calls = [(_echo_async, (index, 5)) for index in range(3)]
+
+    result = run(run_batch_async(calls, max_in_flight=1, deadline=0.1))
+
+    assert result.results == [None, None, None]
+    assert (result.completed, result.timed_out, result.cancelled) == (0, 3, 2)
+
+
+@pytest.mark.parametrize("deadline", [None, 5])
+def test_async_batch_without_timeouts(run, deadline):
+    result = run(run_batch_async([(_echo_async, (i,)) for i in range(5)], max_in_flight=2, deadline=deadline))
+    assert result.results == [0, 1, 2, 3, 4]
+    assert result.succeeded == 5 and result.ok
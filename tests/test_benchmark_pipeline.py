@@ -0,0 +1,54 @@
+import json
+
+import pytest
+
+from my_codegen.benchmarks.pipeline import STAGES, BenchmarkResult, StageResult, compare, main
+
+TINY = ["--paths", "2", "--schemas", "2", "--tags", "1", "--tags-per-operation", "1",
+        "--ref-depth", "1", "--format-workers", "1"]
+
+
+def test_tiny_run_is_compared_against_saved_baseline(tmp_path, capsys):
+    baseline = str(tmp_path / "bench.json")
+    main(TINY + ["--save-baseline", baseline])
+    saved = capsys.readouterr().out
+    with open(baseline, "r", encoding="utf-8") as f:
+        assert set(json.load(f)["stages"]) == set(STAGES)
+    assert f"baseline written to {baseline}" in saved
+
+    main(TINY + ["--baseline", baseline, "--threshold", "100"])
+
+    report = capsys.readouterr().out
+    assert all(f"  {stage}" in report for stage in STAGES)
+    assert report.count("vs baseline") == len(STAGES)
+    assert "no regressions beyond 10000%" in report
+
+
+def test_slower_stage_fails_the_run(tmp_path, capsys):
+    baseline = str(tmp_path / "bench.json")
+    main(TINY + ["--save-baseline", baseline])
+    with open(baseline, "r", encoding="utf-8") as f:
+        saved = json.load(f)
+    saved["stages"]["datamodel_codegen"]["seconds"] = 0.0001
+    with open(baseline, "w", encoding="utf-8") as f:
+        json.dump(saved, f)
+    capsys.readouterr()
+
+    with pytest.raises(SystemExit) as exit_info:
+        main(TINY + ["--baseline", baseline])
+
+    assert exit_info.value.code == 1
+    assert "REGRESSION datamodel_codegen:" in capsys.readouterr().out
+
+
+def test_compare_ignores_noise_and_other_parameters():
+    baseline = BenchmarkResult({"paths": 2}, {"load": StageResult(0.001), "format": StageResult(1.0, peak_mb=10)})
+    noisy = BenchmarkResult({"paths": 2}, {"load": StageResult(0.01), "format": StageResult(1.1, peak_mb=10.5)})
+    slower = BenchmarkResult({"paths": 2}, {"load": StageResult(0.001), "format": StageResult(2.0, peak_mb=30)})
+
+    assert compare(noisy, baseline, threshold=0.2) == []
+    assert compare(slower, baseline, threshold=0.2) == [
+        "format: 2.000s vs baseline 1.000s (+100%)",
+        "format: peak 30.0 MB vs baseline 10.0 MB",
+    ]
+    assert compare(BenchmarkResult({"paths": 3}), baseline, 0.2)[0].startswith("parameters differ")
@@ -0,0 +1,109 @@
+import json
+import threading
+import time
+
+from my_codegen.http_clients.api_client import ApiClient
+from my_codegen.http_clients.cache import ResponseCache
+
+
+def _resource(headers=None, delay: float = 0):
+    """
+    Ответ с путём и номером запроса к серверу - видно, из кэша он или свежий.
+    """
+    served = []
+
+    def handler(request):
+        time.sleep(delay)
+        served.append(request)
+        if headers and "ETag" in headers and request.headers.get("If-None-Match") == headers["ETag"]:
+            return 304, dict(headers), b""
+        body = {"path": request.path, "n": len(served), "lang": request.headers.get("Accept-Language")}
+        return 200, {"Content-Type": "application/json", **(headers or {})}, json.dumps(body).encode()
+
+    return handler
+
+
+def _client(server, cache: ResponseCache) -> ApiClient:
+    return ApiClient(base_url=server.url, response_cache=cache)
+
+
+def test_entry_is_served_until_ttl_expires(serve):
+    cache = ResponseCache(ttl=0.2)
+    client = _client(serve(_resource()), cache)
+
+    assert client.get("/pets")["n"] == 1
+    assert client.get("/pets")["n"] == 1
+    time.sleep(0.25)
+    assert client.get("/pets")["n"] == 2
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 2
+
+
+def test_max_age_overrides_default_ttl(serve):
+    cache = ResponseCache(ttl=60)
+    client = _client(serve(_resource({"Cache-Control": "max-age=0"})), cache)
+
+    client.get("/pets")
+    assert client.get("/pets")["n"] == 2
+
+
+def test_stale_entry_is_revalidated_with_etag(serve):
+    cache = ResponseCache(ttl=60)
+    server = serve(_resource({"ETag": '"v1"', "Cache-Control": "no-cache"}))
+    client = _client(server, cache)
+
+    first = client.get("/pets")
+    assert client.get("/pets") == first
+    assert [r.headers.get("If-None-Match") for r in server.requests] == [None, '"v1"']
+    assert cache.stats()["revalidated"] == 1
+
+
+def test_concurrent_identical_requests_are_coalesced(serve):
+    cache = ResponseCache(ttl=60)
+    server = serve(_resource(delay=0.2))
+    clients = [_client(server, cache) for _ in range(5)]
+    results = []
+
+    threads = [threading.Thread(target=lambda c=c: results.append(c.get("/pets"))) for c in clients]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(server.requests) == 1
+    assert [r["n"] for r in results] == [1] * 5
+    assert cache.stats()["coalesced"] == 4
+
+
+def test_write_invalidates_the_resource_and_its_subpaths_only(serve):
+    cache = ResponseCache(ttl=60)
+    client = _client(serve(_resource()), cache)
+    for path in ("/pets/1", "/pets/1/photos", "/pets/10"):
+        client.get(path)
+
+    client.put("/pets/1", payload={"name": "Rex"})
+
+    assert client.get("/pets/10")["n"] == 3
+    assert client.get("/pets/1")["n"] == 5
+    assert client.get("/pets/1/photos")["n"] == 6
+
+
+def test_invalidate_by_prefix_respects_segment_boundaries(serve):
+    cache = ResponseCache(ttl=60)
+    server = serve(_resource())
+    client = _client(server, cache)
+    for path in ("/pets", "/pets/1", "/pets?limit=5", "/petshop"):
+        client.get(path)
+
+    assert cache.invalidate(prefix=f"{server.url}/pets/") == 3
+    assert cache.stats()["entries"] == 1
+
+
+def test_response_with_vary_is_not_served_to_other_header_values(serve):
+    cache = ResponseCache(ttl=60)
+    server = serve(_resource({"Vary": "Accept-Language"}))
+    client = _client(server, cache)
+
+    assert client.get("/pets", headers={"Accept-Language": "en"})["lang"] == "en"
+    assert client.get("/pets", headers={"Accept-Language": "de"})["lang"] == "de"
+    assert client.get("/pets", headers={"Accept-Language": "de"})["lang"] == "de"
+    assert len(server.requests) == 2
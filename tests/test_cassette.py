@@ -0,0 +1,110 @@
+import json
+import os
+
+import pytest
+
+from my_codegen.http_clients.api_client import ApiClient
+from my_codegen.http_clients import cassette as cassette_module
+from my_codegen.http_clients.cassette import Cassette, CassetteMiss, CassetteMode, recording_session
+
+
+def _client(server_url: str, cassette: Cassette) -> ApiClient:
+    client = ApiClient(base_url=server_url)
+    client.request_handler.cassette = cassette
+    return client
+
+
+def _pet(name: str):
+    def handler(request):
+        return 200, {"Content-Type": "application/json"}, json.dumps({"name": name}).encode()
+    return handler
+
+
+def test_replay_serves_recorded_responses_without_network(serve, tmp_path):
+    path = str(tmp_path / "pets.jsonl")
+    server = serve(_pet("Rex"))
+    _client(server.url, Cassette(path, CassetteMode.RECORD)).get("/pets")
+
+    replay = Cassette(path, CassetteMode.REPLAY)
+    assert _client(server.url, replay).get("/pets") == {"name": "Rex"}
+    assert len(server.requests) == 1
+    with pytest.raises(CassetteMiss):
+        _client(server.url, replay).get("/owners")
+
+
+def test_rerecording_replaces_previous_session(serve, tmp_path):
+    path = str(tmp_path / "pets.jsonl")
+    old, new = serve(_pet("Rex")), serve(_pet("Tom"))
+    _client(old.url, Cassette(path, CassetteMode.RECORD, session="first")).get("/pets")
+    _client(new.url, Cassette(path, CassetteMode.RECORD, session="second")).get("/pets")
+
+    replay = _client(new.url, Cassette(path, CassetteMode.REPLAY))
+    assert replay.get("/pets") == {"name": "Tom"}
+    with open(path, "rb") as f:
+        lines = f.read().splitlines()
+    assert lines[0] == b"#session\tsecond"
+    assert len(lines) == 2
+
+
+def test_workers_of_one_session_append_to_the_same_cassette(serve, tmp_path):
+    path = str(tmp_path / "pets.jsonl")
+    server = serve(_pet("Rex"))
+    _client(server.url, Cassette(path, CassetteMode.RECORD, session="run")).get("/pets")
+    _client(server.url, Cassette(path, CassetteMode.RECORD, session="run")).get("/owners")
+
+    replay = _client(server.url, Cassette(path, CassetteMode.REPLAY))
+    replay.get("/pets")
+    replay.get("/owners")
+    assert len(server.requests) == 2
+
+
+def test_streamed_downloads_bypass_the_cassette(serve, tmp_path):
+    path = str(tmp_path / "pets.jsonl")
+    payload = b"\x00\xff" * 1024
+
+    def handler(request):
+        return 200, {"Content-Type": "application/octet-stream"}, payload
+
+    server = serve(handler)
+    client = _client(server.url, Cassette(path, CassetteMode.RECORD))
+    result = client.download("/file.bin", str(tmp_path / "file.bin"))
+
+    assert result.bytes_written == len(payload)
+    assert client.request_handler.cassette.stats()["recorded"] == 0
+    assert not (tmp_path / "pets.jsonl").exists()
+
+
+def test_replay_follows_a_cassette_restarted_by_another_session(serve, tmp_path):
+    path = str(tmp_path / "pets.jsonl")
+    names = iter(["Rex" * 100, "Rex", "Tom"])
+
+    def handler(request):
+        return 200, {"Content-Type": "application/json"}, json.dumps({"name": next(names)}).encode()
+
+    server = serve(handler)
+    first = _client(server.url, Cassette(path, CassetteMode.RECORD, session="first"))
+    first.get("/pets")
+    first.get("/owners")
+
+    replay = _client(server.url, Cassette(path, CassetteMode.REPLAY))
+    assert replay.get("/pets") == {"name": "Rex" * 100}
+
+    # Другая сессия начала файл заново, он стал короче проиндексированного
+    _client(server.url, Cassette(path, CassetteMode.RECORD, session="second")).get("/pets")
+
+    assert replay.get("/pets") == {"name": "Tom"}
+    with pytest.raises(CassetteMiss):
+        replay.get("/owners")
+
+
+def test_child_processes_inherit_the_recording_session(monkeypatch):
+    monkeypatch.delenv("MY_CODEGEN_CASSETTE_SESSION", raising=False)
+    monkeypatch.delenv("PYTEST_XDIST_TESTRUNUID", raising=False)
+
+    session = recording_session()
+
+    assert session == cassette_module._PROCESS_SESSION
+    assert os.environ["MY_CODEGEN_CASSETTE_SESSION"] == session
+    monkeypatch.setenv("PYTEST_XDIST_TESTRUNUID", "run")
+    monkeypatch.delenv("MY_CODEGEN_CASSETTE_SESSION")
+    assert recording_session() == "run"
@@ -0,0 +1,42 @@
+from my_codegen.codegen.client_generator import ClientGenerator
+from my_codegen.codegen.data_models import Endpoint, Parameter
+
+MODELS = ["Pet", "NewPet", "PetKind", "Owner", "Unused", "Listing"]
+
+
+def _generator(endpoints) -> ClientGenerator:
+    return ClientGenerator(endpoints, MODELS, "client_template.j2")
+
+
+def test_imports_are_exactly_the_models_in_signatures():
+    endpoints = [
+        Endpoint(tag="pets", name="list_pets", http_method="GET", path="/pets",
+                 query_params=[Parameter("owner", "Owner")], return_type="List[Pet]"),
+        Endpoint(tag="pets", name="create_pet", http_method="POST", path="/pets",
+                 payload_type="NewPet", return_type="Optional[Dict[str, Union[Pet, Any]]]"),
+        Endpoint(tag="pets", name="pets_by_kind", http_method="GET", path="/pets/{kind}",
+                 path_params=[Parameter("kind", "PetKind", required=True)], return_type="Any"),
+        Endpoint(tag="pets", name="unknown", http_method="GET", path="/pets/raw", return_type="NotAModel"),
+    ]
+
+    # Owner - только в query-параметре, в сигнатуре он str; Unused не упомянут вовсе
+    assert _generator(endpoints).collect_model_imports(endpoints) == ["NewPet", "Pet", "PetKind"]
+
+
+def test_imports_are_collected_per_tag(tmp_path):
+    endpoints = [
+        Endpoint(tag="pets", name="get_pet", http_method="GET", path="/pets/{id}",
+                 path_params=[Parameter("id", "str", required=True)], return_type="Pet"),
+        Endpoint(tag="owners", name="list_owners", http_method="GET", path="/owners", return_type="List[Owner]"),
+        Endpoint(tag="health", name="ping", http_method="GET", path="/ping"),
+    ]
+    generator = _generator(endpoints)
+
+    assert generator.models_by_tag() == {"pets": ["Pet"], "owners": ["Owner"], "health": []}
+
+    generator.generate_clients(str(tmp_path), "pet_store")
+    pets_client = (tmp_path / "pets_client.py").read_text()
+    health_client = (tmp_path / "health_client.py").read_text()
+    assert "from http_clients.pet_store.models import Pet\n" in pets_client
+    assert "Owner" not in pets_client
+    assert "http_clients.pet_store.models" not in health_client
@@ -0,0 +1,87 @@
+import datetime
+import json
+import uuid
+from decimal import Decimal
+from enum import Enum
+from http import HTTPStatus
+from typing import List, Optional
+
+import pytest
+from pydantic import BaseModel
+
+from my_codegen.http_clients import codec as codec_module
+from my_codegen.http_clients.api_client import ApiClient
+from my_codegen.http_clients.codec import JsonCodec, OrjsonCodec, get_codec
+
+CODECS = [JsonCodec()]
+if codec_module.orjson is not None:
+    CODECS.append(OrjsonCodec())
+
+
+class Color(Enum):
+    RED = "red"
+
+
+class Tag(BaseModel):
+    id: uuid.UUID
+    color: Color
+
+
+class Pet(BaseModel):
+    name: str
+    price: Decimal
+    born: datetime.date
+    tags: List[Tag]
+    owner: Optional[str] = None
+
+
+PET = Pet(
+    name="Рекс",
+    price=Decimal("9.5"),
+    born=datetime.date(2020, 1, 2),
+    tags=[Tag(id=uuid.UUID(int=1), color=Color.RED)],
+)
+EXPECTED = {
+    "name": "Рекс",
+    "price": 9.5,
+    "born": "2020-01-02",
+    "tags": [{"id": "00000000-0000-0000-0000-000000000001", "color": "red"}],
+    "owner": None,
+}
+
+
+@pytest.mark.parametrize("codec", CODECS, ids=lambda codec: codec.name)
+def test_model_is_encoded_without_dict_conversion(codec):
+    data = codec.dumps(PET)
+
+    assert isinstance(data, bytes)
+    assert json.loads(data) == EXPECTED
+    assert codec.loads(data) == EXPECTED
+
+
+@pytest.mark.parametrize("codec", CODECS, ids=lambda codec: codec.name)
+def test_unsupported_objects_are_rejected(codec):
+    with pytest.raises(TypeError):
+        codec.dumps({"value": object()})
+
+
+def test_get_codec_selection(monkeypatch):
+    monkeypatch.delenv("MY_CODEGEN_JSON_CODEC", raising=False)
+    assert type(get_codec()) is JsonCodec
+    assert type(get_codec("auto")) is (OrjsonCodec if codec_module.orjson is not None else JsonCodec)
+    with pytest.raises(ValueError, match="Unknown JSON codec"):
+        get_codec("simdjson")
+    monkeypatch.setattr(codec_module, "orjson", None)
+    with pytest.raises(ImportError):
+        get_codec("orjson")
+
+
+@pytest.mark.parametrize("codec", CODECS, ids=lambda codec: codec.name)
+def test_client_sends_and_parses_with_the_codec(stub_server, codec):
+    client = ApiClient(base_url=stub_server.url)
+    client.request_handler.codec = codec
+
+    response = client.post("/pets", payload=PET, expected_status=HTTPStatus.OK)
+
+    assert response["body"] == EXPECTED
+    assert stub_server.requests[0].headers["Content-Type"] == "application/json"
@@ -0,0 +1,77 @@
+import io
+import os
+
+import pytest
+
+from my_codegen.http_clients.api_client import ERROR_BODY_PEEK, ApiClient, StorageS3
+
+PAYLOAD = os.urandom(256 * 1024 + 17)
+
+
+def _blob(request):
+    if request.query.get("status"):
+        return int(request.query["status"]), {"Content-Type": "text/plain"}, b"e" * (ERROR_BODY_PEEK * 50)
+    return 200, {"Content-Type": "application/octet-stream"}, PAYLOAD
+
+
+def test_download_writes_chunks_to_path_and_reports_progress(serve, tmp_path):
+    destination = str(tmp_path / "export.bin")
+    progress = []
+
+    result = ApiClient(base_url=serve(_blob).url).download(
+        "/export", destination, chunk_size=64 * 1024, progress=lambda *p: progress.append(p)
+    )
+
+    with open(destination, "rb") as f:
+        assert f.read() == PAYLOAD
+    assert result.path == destination
+    assert result.bytes_written == result.total_bytes == len(PAYLOAD)
+    assert result.content_type == "application/octet-stream"
+    assert [done for done, _ in progress] == [65536, 131072, 196608, 262144, len(PAYLOAD)]
+    assert {total for _, total in progress} == {len(PAYLOAD)}
+    assert os.listdir(tmp_path) == ["export.bin"]
+
+
+def test_download_to_file_object(serve):
+    buffer = io.BytesIO()
+
+    result = ApiClient(base_url=serve(_blob).url).download("/export", buffer)
+
+    assert buffer.getvalue() == PAYLOAD
+    assert result.path is None and result.bytes_written == len(PAYLOAD)
+
+
+def test_interrupted_download_leaves_no_partial_file(serve, tmp_path):
+    destination = tmp_path / "export.bin"
+
+    def progress(done, total):
+        if done > 64 * 1024:
+            raise RuntimeError("stop")
+
+    with pytest.raises(RuntimeError):
+        ApiClient(base_url=serve(_blob).url).download("/export", str(destination), chunk_size=64 * 1024,
+                                                      progress=progress)
+
+    assert os.listdir(tmp_path) == []
+
+
+def test_error_message_peeks_only_a_capped_prefix(serve, tmp_path):
+    destination = tmp_path / "export.bin"
+
+    with pytest.raises(AssertionError, match="actual status: 500") as error:
+        ApiClient(base_url=serve(_blob).url).download("/export", str(destination), params={"status": 500})
+
+    assert "e" * ERROR_BODY_PEEK in str(error.value)
+    assert "e" * (ERROR_BODY_PEEK + 1) not in str(error.value)
+    assert not destination.exists()
+
+
+def test_storage_download_streams_to_destination(serve, tmp_path):
+    storage = StorageS3(f"{serve(_blob).url}/bucket/export.bin")
+    destination = str(tmp_path / "export.bin")
+
+    result = storage.download(destination, chunk_size=32 * 1024)
+
+    assert result.bytes_written == len(PAYLOAD)
+    with open(destination, "rb") as f:
+        assert f.read() == PAYLOAD
@@ -0,0 +1,86 @@
+import importlib
+import sys
+
+import pytest
+
+from my_codegen.codegen.facade_generator import FacadeGenerator
+from my_codegen.codegen.generate_app_facade import generate_app_facade
+
+CLIENT = '''
+class {name}:
+    closed = False
+
+    def __init__(self, auth_token, base_url, pool_settings, parse_mode=None):
+        self.auth_token = auth_token
+        self.base_url = base_url
+        self.parse_mode = parse_mode
+
+    def close(self):
+        self.closed = True
+'''
+
+
+@pytest.fixture
+def service(tmp_path, monkeypatch):
+    """
+    http_clients/pet_store с фасадом из шаблона и простыми клиентами pets и owners.
+    """
+    service_dir = tmp_path / "http_clients" / "pet_store"
+    (service_dir / "endpoints").mkdir(parents=True)
+    for path in (tmp_path / "http_clients", service_dir, service_dir / "endpoints"):
+        (path / "__init__.py").write_text("")
+    for module, name in (("pets_client", "Pets"), ("owners_client", "Owners")):
+        (service_dir / "endpoints" / f"{module}.py").write_text(CLIENT.format(name=name))
+    FacadeGenerator("PetStoreApi", "facade_template.j2").generate_facade(
+        {"pets_client.py": "Pets", "owners_client.py": "Owners"}, str(service_dir), "facade.py"
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield tmp_path
+    for name in [name for name in sys.modules if name == "http_clients" or name.startswith("http_clients.")]:
+        del sys.modules[name]
+    sys.modules.pop("api_facade", None)
+
+
+def _loaded_clients():
+    return sorted(name.rsplit(".", 1)[-1] for name in sys.modules if name.startswith("http_clients.pet_store.endpoints."))
+
+
+def test_service_facade_imports_clients_on_first_access(service):
+    facade_module = importlib.import_module("http_clients.pet_store.facade")
+    api = facade_module.PetStoreApi("token", "http://api.local", parse_mode="construct")
+    assert _loaded_clients() == []
+    assert set(api._clients) == {"pets", "owners"}
+
+    pets = api.pets
+
+    assert _loaded_clients() == ["pets_client"]
+    assert api.pets is pets
+    assert (pets.auth_token, pets.base_url, pets.parse_mode) == ("token", "http://api.local", "construct")
+    with pytest.raises(AttributeError, match="no client 'vets'"):
+        api.vets
+
+
+def test_close_closes_only_created_clients(service):
+    facade_module = importlib.import_module("http_clients.pet_store.facade")
+    with facade_module.PetStoreApi("token", "http://api.local") as api:
+        pets = api.pets
+
+    assert pets.closed
+    assert _loaded_clients() == ["pets_client"]
+    # После close клиент создаётся заново
+    assert api.pets is not pets
+
+
+def test_app_facade_creates_service_facades_lazily(service):
+    generate_app_facade("app_facade.j2", str(service / "api_facade.py"), str(service / "http_clients"))
+    app = importlib.import_module("api_facade").ApiFacade("token")
+    assert "http_clients.pet_store.facade" not in sys.modules
+
+    pet_store = app.pet_store
+
+    assert type(pet_store).__name__ == "PetStoreApi"
+    assert app.pet_store is pet_store and pet_store.auth_token == "token"
+    with pytest.raises(AttributeError, match="No such API facade"):
+        app.billing
+    app.close()
+    assert "pet_store" not in vars(app)
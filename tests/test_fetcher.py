@@ -0,0 +1,84 @@
+import hashlib
+import json
+
+import pytest
+
+from my_codegen.swagger.fetcher import SpecFetcher
+
+SPEC = json.dumps({"openapi": "3.0.1", "info": {"title": "Pets"}}).encode()
+
+
+def _spec_server(etag='"v1"', last_modified="Wed, 21 Oct 2026 07:28:00 GMT"):
+    state = {"body": SPEC, "etag": etag}
+
+    def handler(request):
+        if state["etag"] and request.headers.get("If-None-Match") == state["etag"]:
+            return 304, {"ETag": state["etag"]}, b""
+        headers = {"Content-Type": "application/json"}
+        if state["etag"]:
+            headers["ETag"] = state["etag"]
+        if last_modified:
+            headers["Last-Modified"] = last_modified
+        return 200, headers, state["body"]
+
+    return handler, state
+
+
+def test_unchanged_remote_spec_costs_one_304(serve, tmp_path):
+    handler, _ = _spec_server()
+    server = serve(handler)
+    fetcher = SpecFetcher(cache_dir=str(tmp_path / "cache"))
+
+    first = fetcher.fetch(f"{server.url}/spec.json", str(tmp_path / "a.json"))
+    second = fetcher.fetch(f"{server.url}/spec.json", str(tmp_path / "b.json"))
+
+    assert not first.not_modified and second.not_modified
+    assert first.digest == second.digest == hashlib.sha256(SPEC).hexdigest()
+    assert (tmp_path / "b.json").read_bytes() == SPEC
+    conditional = server.requests[1].headers
+    assert conditional["If-None-Match"] == '"v1"'
+    assert conditional["If-Modified-Since"] == "Wed, 21 Oct 2026 07:28:00 GMT"
+
+
+def test_changed_remote_spec_is_downloaded_again(serve, tmp_path):
+    handler, state = _spec_server()
+    server = serve(handler)
+    fetcher = SpecFetcher(cache_dir=str(tmp_path / "cache"))
+    fetcher.fetch(f"{server.url}/spec.json", str(tmp_path / "a.json"))
+
+    state.update(body=b'{"openapi": "3.1.0"}', etag='"v2"')
+    result = fetcher.fetch(f"{server.url}/spec.json", str(tmp_path / "b.json"))
+
+    assert not result.not_modified
+    assert result.meta["etag"] == '"v2"'
+    assert (tmp_path / "b.json").read_bytes() == b'{"openapi": "3.1.0"}'
+
+
+def test_cached_copy_is_used_offline_and_when_server_fails(serve, tmp_path):
+    handler, state = _spec_server()
+    server = serve(handler)
+    url = f"{server.url}/spec.json"
+    SpecFetcher(cache_dir=str(tmp_path / "cache")).fetch(url, str(tmp_path / "a.json"))
+
+    offline = SpecFetcher(cache_dir=str(tmp_path / "cache"), offline=True).fetch(url, str(tmp_path / "b.json"))
+    assert offline.not_modified and len(server.requests) == 1
+
+    server.handler = lambda request: (500, {}, b"down")
+    fallback = SpecFetcher(cache_dir=str(tmp_path / "cache")).fetch(url, str(tmp_path / "c.json"))
+    assert fallback.not_modified and (tmp_path / "c.json").read_bytes() == SPEC
+
+    with pytest.raises(FileNotFoundError):
+        SpecFetcher(cache_dir=str(tmp_path / "empty"), offline=True).fetch(url, str(tmp_path / "d.json"))
+
+
+def test_local_spec_is_hashed_and_compared_with_the_last_fetch(tmp_path):
+    spec = tmp_path / "spec.json"
+    spec.write_bytes(SPEC)
+    fetcher = SpecFetcher(cache_dir=str(tmp_path / "cache"))
+
+    assert not fetcher.fetch(str(spec), str(tmp_path / "a.json")).not_modified
+    assert fetcher.fetch(spec.as_uri(), str(tmp_path / "b.json")).digest == hashlib.sha256(SPEC).hexdigest()
+    assert fetcher.fetch(str(spec), str(tmp_path / "c.json")).not_modified
+
+    fetcher.remember(str(spec), service_name="pets")
+    assert fetcher.fetch(str(spec), str(tmp_path / "d.json")).meta["service_name"] == "pets"
@@ -0,0 +1,45 @@
+import pytest
+
+from my_codegen.codegen.formatter import format_files, format_source
+
+UNFORMATTED = "import os\nimport sys\nx = {'a':1}\nprint(sys.argv)\n"
+
+
+def test_format_source_drops_unused_imports_and_applies_black():
+    assert format_source(UNFORMATTED) == 'import sys\n\nx = {"a": 1}\nprint(sys.argv)\n'
+    assert format_source(UNFORMATTED, remove_unused_imports=False).startswith("import os\nimport sys\n")
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_errors_are_returned_per_file(tmp_path, workers):
+    good, also_good, broken = (tmp_path / name for name in ("good.py", "also_good.py", "broken.py"))
+    good.write_text(UNFORMATTED)
+    also_good.write_text(UNFORMATTED)
+    broken.write_text("def broken(:\n")
+
+    errors = format_files([str(good), str(broken), str(also_good)], max_workers=workers)
+
+    assert list(errors) == [str(broken)]
+    assert errors[str(broken)].startswith("InvalidInput")
+    assert good.read_text() == also_good.read_text() == format_source(UNFORMATTED)
+    assert broken.read_text() == "def broken(:\n"
+
+
+def test_autoflake_runs_only_for_selected_files(tmp_path):
+    models, client = tmp_path / "models.py", tmp_path / "client.py"
+    models.write_text(UNFORMATTED)
+    client.write_text(UNFORMATTED)
+
+    assert format_files([str(models), str(client)], unused_imports_paths=[str(models)], max_workers=1) == {}
+
+    assert "import os" not in models.read_text()
+    assert "import os" in client.read_text()
+
+
+def test_unchanged_file_is_not_rewritten(tmp_path):
+    path = tmp_path / "done.py"
+    path.write_text(format_source(UNFORMATTED))
+    mtime = path.stat().st_mtime_ns
+
+    assert format_files([str(path)], max_workers=1) == {}
+    assert path.stat().st_mtime_ns == mtime
@@ -0,0 +1,53 @@
+import json
+import os
+import shutil
+
+import pytest
+
+from my_codegen.main import GenerationOptions, generate_batch, load_sources
+from my_codegen.swagger.fetcher import SpecFetcher
+
+
+def _spec(title: str) -> dict:
+    return {
+        "openapi": "3.0.1",
+        "info": {"title": title, "version": "1.0"},
+        "paths": {"/items": {"get": {
+            "tags": ["items"], "summary": "List items",
+            "responses": {"200": {"description": "ok", "content": {"application/json": {
+                "schema": {"$ref": "#/components/schemas/Item"}}}}},
+        }}},
+        "components": {"schemas": {"Item": {"type": "object", "properties": {"id": {"type": "integer"}}}}},
+    }
+
+
+def test_sources_are_read_from_a_list_or_services_mapping(tmp_path):
+    listed = tmp_path / "list.yaml"
+    listed.write_text("- https://a.example/spec.json\n- ./b.yaml\n")
+    mapped = tmp_path / "mapped.json"
+    mapped.write_text(json.dumps({"services": [{"url": "https://a.example/spec.json"}, "./b.yaml"]}))
+
+    assert load_sources(str(listed)) == load_sources(str(mapped)) == ["https://a.example/spec.json", "./b.yaml"]
+
+
+def test_one_bad_spec_does_not_sink_the_batch(tmp_path):
+    if shutil.which("datamodel-codegen") is None:
+        pytest.skip("datamodel-codegen is not installed")
+    sources = []
+    for title in ("Orders", "Billing"):
+        path = tmp_path / f"{title.lower()}.json"
+        path.write_text(json.dumps(_spec(title)))
+        sources.append(str(path))
+    broken = tmp_path / "broken.json"
+    broken.write_text("{not json")
+    sources.insert(1, str(broken))
+    out = tmp_path / "http_clients"
+
+    failed = generate_batch(
+        sources, str(out), GenerationOptions(), max_workers=2, fetcher=SpecFetcher(cache_dir=str(tmp_path / "cache")),
+    )
+
+    assert failed == [str(broken)]
+    for service in ("orders", "billing"):
+        assert os.path.exists(out / service / "facade.py")
+        assert os.path.exists(out / service / "endpoints" / "items_client.py")
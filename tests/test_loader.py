@@ -0,0 +1,79 @@
+import json
+
+import pytest
+import yaml
+
+from my_codegen.swagger import loader as loader_module
+from my_codegen.swagger.loader import SwaggerLoader
+
+SPEC = {
+    "openapi": "3.0.1",
+    "info": {"title": "Pet Store", "version": "1.0"},
+    "servers": [{"url": "https://pets.example"}],
+    "tags": [{"name": "pets"}],
+    "x-internal": {"owner": "team"},
+    "paths": {"/pets": {"post": {
+        "requestBody": {"content": {"application/json": {
+            "schema": {"$ref": "#/components/schemas/Pet"},
+            "example": {"name": "Rex"},
+        }}},
+        "responses": {"201": {"description": "ok", "examples": {"one": {"value": 1}}}},
+    }}},
+    "components": {"schemas": {"Pet": {
+        "type": "object",
+        "example": {"name": "Rex"},
+        "properties": {"name": {"type": "string"}, "example": {"type": "string"}},
+    }}},
+}
+SELECTED = {key: SPEC[key] for key in ("openapi", "info", "paths", "components")}
+
+
+def _load(path, **kwargs) -> SwaggerLoader:
+    loader = SwaggerLoader(str(path), **kwargs)
+    loader.load()
+    return loader
+
+
+@pytest.fixture
+def json_spec(tmp_path):
+    path = tmp_path / "swagger.json"
+    path.write_text(json.dumps(SPEC))
+    return path
+
+
+@pytest.mark.parametrize("disabled", [("ijson",), ("ijson", "orjson")])
+def test_json_backends_keep_only_needed_sections(json_spec, monkeypatch, disabled):
+    for name in disabled:
+        monkeypatch.setattr(loader_module, name, None)
+    assert _load(json_spec).swagger == SELECTED
+
+
+def test_yaml_matches_json(tmp_path, monkeypatch):
+    monkeypatch.setattr(loader_module, "ijson", None)
+    as_yaml = tmp_path / "spec.yaml"
+    as_yaml.write_text(yaml.safe_dump(SPEC))
+    # Скачанная спека всегда называется swagger.json - YAML узнаётся по содержимому
+    disguised = tmp_path / "swagger.json"
+    disguised.write_text(yaml.safe_dump(SPEC))
+
+    assert _load(as_yaml).swagger == _load(disguised).swagger == SELECTED
+
+
+def test_streaming_parser_drops_operation_examples_only(json_spec):
+    if loader_module.ijson is None or loader_module.ijson.backend != "yajl2_c":
+        pytest.skip("ijson C backend is not installed")
+    swagger = _load(json_spec).swagger
+
+    operation = swagger["paths"]["/pets"]["post"]
+    assert "example" not in operation["requestBody"]["content"]["application/json"]
+    assert "examples" not in operation["responses"]["201"]
+    # Примеры схем и свойство с именем example остаются - они нужны моделям
+    assert swagger["components"] == SPEC["components"]
+    assert set(swagger) == set(SELECTED)
+
+
+def test_all_sections_are_kept_on_request(json_spec, monkeypatch):
+    monkeypatch.setattr(loader_module, "ijson", None)
+    loader = _load(json_spec, sections=None)
+    assert loader.swagger == SPEC
+    assert loader.get_service_name() == "pet_store"
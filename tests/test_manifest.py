@@ -0,0 +1,96 @@
+import os
+
+import pytest
+
+from my_codegen.codegen.manifest import BuildManifest, hash_sources, hash_templates
+
+
+@pytest.fixture
+def service_dir(tmp_path):
+    """
+    Каталог сервиса после сборки: модели, фасад, клиент тега pets и сохранённый манифест.
+    """
+    (tmp_path / "endpoints").mkdir()
+    for name in ("models.py", "facade.py", "endpoints/pets.py"):
+        (tmp_path / name).write_text("")
+    manifest = BuildManifest(str(tmp_path))
+    manifest.record_spec("spec-1")
+    manifest.models_fresh("schemas-1", str(tmp_path / "models.py"))
+    manifest.client_fresh("pets", "pets-1", str(tmp_path / "endpoints" / "pets.py"))
+    manifest.save()
+    return tmp_path
+
+
+def _fresh(service_dir, manifest: BuildManifest):
+    return (
+        manifest.spec_fresh("spec-1"),
+        manifest.models_fresh("schemas-1", str(service_dir / "models.py")),
+        manifest.client_fresh("pets", "pets-1", str(service_dir / "endpoints" / "pets.py")),
+    )
+
+
+def test_unchanged_build_is_fresh(service_dir):
+    assert _fresh(service_dir, BuildManifest(str(service_dir))) == (True, True, True)
+
+
+def test_force_and_changed_inputs_are_not_fresh(service_dir):
+    assert _fresh(service_dir, BuildManifest(str(service_dir), force=True)) == (False, False, False)
+
+    manifest = BuildManifest(str(service_dir))
+    assert not manifest.spec_fresh("spec-2")
+    assert not manifest.models_fresh("schemas-2", str(service_dir / "models.py"))
+    assert not manifest.client_fresh("pets", "pets-2", str(service_dir / "endpoints" / "pets.py"))
+
+
+def test_missing_output_file_is_not_fresh(service_dir):
+    os.remove(service_dir / "endpoints" / "pets.py")
+    assert _fresh(service_dir, BuildManifest(str(service_dir))) == (False, True, False)
+
+
+@pytest.mark.parametrize("key, expected", [
+    ("templates", (False, True, False)),
+    ("models_templates", (True, False, True)),
+    ("generator_source", (False, False, False)),
+    ("generator_version", (False, False, False)),
+])
+def test_toolchain_change_invalidates_affected_stages(service_dir, key, expected):
+    manifest = BuildManifest(str(service_dir))
+    manifest.previous[key] = "something else"
+    assert _fresh(service_dir, manifest) == expected
+
+
+def test_stale_files_and_forget(service_dir):
+    manifest = BuildManifest(str(service_dir))
+    manifest.client_fresh("owners", "owners-1", str(service_dir / "endpoints" / "owners.py"))
+    assert manifest.stale_files() == ["pets.py"]
+
+    manifest.forget(str(service_dir / "models.py"))
+    manifest.save()
+    assert not BuildManifest(str(service_dir)).models_fresh("schemas-1", str(service_dir / "models.py"))
+
+
+def test_template_hash_covers_only_selected_templates(tmp_path):
+    (tmp_path / "client.j2").write_text("client")
+    (tmp_path / "models_init.j2").write_text("models")
+    models_before = hash_templates(str(tmp_path), names=["models_init.j2"])
+    all_before = hash_templates(str(tmp_path))
+
+    (tmp_path / "client.j2").write_text("client v2")
+    assert hash_templates(str(tmp_path), names=["models_init.j2"]) == models_before
+    assert hash_templates(str(tmp_path)) != all_before
+
+    (tmp_path / "models_init.j2").write_text("models v2")
+    assert hash_templates(str(tmp_path), names=["models_init.j2"]) != models_before
+
+
+def test_source_hash_follows_generator_code(tmp_path):
+    (tmp_path / "codegen").mkdir()
+    (tmp_path / "codegen" / "gen.py").write_text("x = 1")
+    (tmp_path / "main.py").write_text("")
+    (tmp_path / "codegen" / "notes.txt").write_text("")
+    before = hash_sources(str(tmp_path), ("main.py", "codegen"))
+
+    (tmp_path / "codegen" / "notes.txt").write_text("not code")
+    assert hash_sources(str(tmp_path), ("main.py", "codegen")) == before
+    (tmp_path / "codegen" / "gen.py").write_text("x = 2")
+    assert hash_sources(str(tmp_path), ("main.py", "codegen")) != before
@@ -0,0 +1,78 @@
+import pytest
+
+from my_codegen.http_clients.api_client import ApiClient
+from my_codegen.http_clients.metrics import MetricKey, MetricsRegistry, metrics
+
+parser = pytest.importorskip("prometheus_client.parser")
+
+PETS = MetricKey("pet_store", "Pets", "/pets", "GET")
+OWNERS = MetricKey("pet_store", "Owners", "/owners", "POST")
+
+
+@pytest.fixture
+def registry():
+    registry = MetricsRegistry(enabled=True)
+    for elapsed in range(1, 101):
+        registry.record(PETS, elapsed / 1000, 200, request_bytes=0, response_bytes=10)
+    registry.record(PETS, 0.5, 503, retries=2)
+    registry.record(OWNERS, 0.02, 201, request_bytes=7)
+    registry.record_error(OWNERS, 1.0, TimeoutError())
+    return registry
+
+
+def _families(text):
+    return {family.name: family for family in parser.text_string_to_metric_families(text)}
+
+
+def _sample(family, suffix="", **labels):
+    matches = [
+        sample for sample in family.samples
+        if sample.name == family.name + suffix and all(sample.labels.get(k) == v for k, v in labels.items())
+    ]
+    assert len(matches) == 1, (family.name + suffix, labels, family.samples)
+    return matches[0].value
+
+
+def test_prometheus_export_parses_into_typed_families(registry):
+    families = _families(registry.to_prometheus())
+
+    duration = families["my_codegen_request_duration_seconds"]
+    assert duration.type == "summary"
+    assert _sample(duration, "_count", client="Pets") == 101
+    assert _sample(duration, client="Pets", quantile="0.5") == pytest.approx(0.051)
+    assert _sample(duration, client="Pets", quantile="0.99") == pytest.approx(0.1)
+    assert _sample(duration, "_sum", client="Owners") == pytest.approx(1.02)
+
+    requests_total = families["my_codegen_requests"]
+    assert requests_total.type == "counter"
+    assert _sample(requests_total, "_total", client="Pets", status="200") == 100
+    assert _sample(requests_total, "_total", client="Pets", status="503") == 1
+    assert _sample(families["my_codegen_request_errors"], "_total", client="Owners") == 1
+    assert _sample(families["my_codegen_request_retries"], "_total", client="Pets") == 2
+    assert _sample(families["my_codegen_request_bytes"], "_total", client="Owners") == 7
+    assert _sample(families["my_codegen_response_bytes"], "_total", client="Pets") == 1000
+    assert all(family.type != "unknown" for family in families.values())
+
+
+def test_empty_registry_exports_headers_only():
+    assert all(not family.samples for family in _families(MetricsRegistry().to_prometheus()).values())
+
+
+def test_client_calls_are_recorded_per_path_template(stub_server):
+    class Pets(ApiClient):
+        _service = "/pet_store"
+
+    metrics.reset()
+    metrics.enable()
+    try:
+        client = Pets(base_url=stub_server.url)
+        client.get("/pets/{pet_id}", path_template="/pets/{pet_id}", pet_id="1")
+        client.get("/pets/{pet_id}", path_template="/pets/{pet_id}", pet_id="2")
+        (item,) = metrics.snapshot()
+    finally:
+        metrics.disable()
+        metrics.reset()
+
+    assert (item["service"], item["client"], item["path"], item["method"]) == ("pet_store", "Pets", "/pets/{pet_id}", "GET")
+    assert item["count"] == 2
+    assert item["statuses"] == {"200": 2}
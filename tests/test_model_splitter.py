@@ -0,0 +1,93 @@
+import importlib
+import sys
+
+import pytest
+
+from my_codegen.codegen.model_splitter import ModelSplitter
+
+MODELS = '''from __future__ import annotations
+
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+
+class Owner(BaseModel):
+    name: str
+
+
+class Pet(BaseModel):
+    name: str
+    owner: Optional[Owner] = None
+
+
+class Node(BaseModel):
+    children: Optional[List[Branch]] = None
+
+
+class Branch(BaseModel):
+    node: Optional[Node] = None
+
+
+class Invoice(BaseModel):
+    total: float
+
+
+Node.update_forward_refs()
+Branch.update_forward_refs()
+'''
+
+
+@pytest.fixture
+def split_package(tmp_path, monkeypatch):
+    """
+    split_package(package, group_by, tag_models) -> импортированный пакет моделей из MODELS.
+    """
+    created = []
+
+    def split(package: str, group_by: str = "schema", tag_models=None):
+        models_path = tmp_path / f"{package}_models.py"
+        models_path.write_text(MODELS)
+        ModelSplitter(str(models_path), str(tmp_path / package), group_by, tag_models).split()
+        created.append(package)
+        return importlib.import_module(package)
+
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield split
+    for name in [name for name in sys.modules if name.split(".")[0] in created]:
+        del sys.modules[name]
+
+
+def test_submodule_is_imported_on_first_access(split_package):
+    models = split_package("schema_models")
+    assert not [name for name in sys.modules if name.startswith("schema_models.")]
+
+    pet = models.Pet(name="Rex", owner={"name": "Ann"})
+
+    loaded = sorted(name for name in sys.modules if name.startswith("schema_models."))
+    assert loaded == ["schema_models.owner", "schema_models.pet"]
+    assert pet.owner.name == "Ann"
+    assert "Invoice" in dir(models) and "Invoice" in models.__all__
+    with pytest.raises(AttributeError, match="Missing"):
+        models.Missing
+
+
+def test_mutually_recursive_models_share_a_module(split_package):
+    models = split_package("cyclic_models")
+
+    tree = models.Node(children=[{"node": {"children": []}}])
+
+    assert models.Node.__module__ == models.Branch.__module__
+    assert isinstance(tree.children[0].node, models.Node)
+
+
+def test_tag_grouping_puts_shared_and_unused_models_apart(split_package):
+    models = split_package("tag_models", "tag", {"pets": ["Pet"], "owners": ["Owner"], "trees": ["Node"]})
+
+    modules = {name: getattr(models, name).__module__.rsplit(".", 1)[-1]
+               for name in ("Pet", "Owner", "Node", "Branch", "Invoice")}
+
+    # Owner нужен и клиенту pets (через Pet), и клиенту owners
+    assert modules == {
+        "Pet": "tag_pets", "Owner": "shared", "Node": "tag_trees", "Branch": "tag_trees", "Invoice": "other",
+    }
@@ -0,0 +1,105 @@
+import time
+from email.utils import formatdate
+
+import pytest
+
+from my_codegen.http_clients.api_client import ApiClient
+from my_codegen.http_clients.policies import DeadlineExceeded, RetryBudget, RetryPolicy, TimeoutPolicy
+
+
+def _unavailable(request):
+    return 503, {"Retry-After": "0"}, b""
+
+
+def test_backoff_is_full_jitter_capped_by_backoff_max(monkeypatch):
+    monkeypatch.setattr("random.uniform", lambda low, high: high)
+    policy = RetryPolicy(backoff_base=0.5, backoff_max=3)
+    assert [policy.backoff(attempt) for attempt in range(1, 6)] == [0.5, 1.0, 2.0, 3, 3]
+
+
+def test_retry_after_seconds_and_date_are_respected():
+    policy = RetryPolicy(max_retry_after=30)
+    assert policy.delay(1, "7") == 7
+    assert 5 < policy.delay(1, formatdate(time.time() + 10, usegmt=True)) <= 10
+    # Сервер просит ждать дольше, чем мы готовы - не повторяем
+    assert policy.delay(1, "120") is None
+    assert 0 <= policy.delay(1, "garbage") <= policy.backoff_base
+
+
+def test_only_idempotent_methods_are_retried_on_status():
+    policy = RetryPolicy(max_attempts=3)
+    assert policy.retry_on_status("GET", 503, attempt=1)
+    assert policy.retry_on_status("delete", 429, attempt=2)
+    assert not policy.retry_on_status("GET", 503, attempt=3)
+    assert not policy.retry_on_status("GET", 500, attempt=1)
+    assert not policy.retry_on_status("POST", 503, attempt=1)
+    assert not policy.retry_on_status("PATCH", 503, attempt=1)
+    assert RetryPolicy(retry_non_idempotent=True).retry_on_status("POST", 503, attempt=1)
+
+
+def test_non_idempotent_methods_are_retried_only_when_connect_failed():
+    policy = RetryPolicy()
+    error = ConnectionError()
+    assert policy.retry_on_error("POST", error, attempt=1, connect_error=True)
+    assert not policy.retry_on_error("POST", error, attempt=1, connect_error=False)
+    assert policy.retry_on_error("GET", error, attempt=1, connect_error=False)
+    assert not RetryPolicy(retry_connection_errors=False).retry_on_error("GET", error, 1, connect_error=True)
+
+
+def test_budget_is_spent_by_retries_and_refilled_by_calls():
+    budget = RetryBudget(ratio=0.5, min_tokens=1, max_tokens=2)
+    assert budget.withdraw()
+    assert not budget.withdraw()
+    budget.deposit()
+    assert not budget.withdraw()
+    budget.deposit()
+    assert budget.withdraw()
+    for _ in range(10):
+        budget.deposit()
+    assert budget.tokens == 2
+
+
+def test_exhausted_budget_stops_retries(serve):
+    server = serve(_unavailable)
+    policy = RetryPolicy(max_attempts=5, backoff_base=0, budget=RetryBudget(ratio=0, min_tokens=1))
+    client = ApiClient(base_url=server.url, retry_policy=policy)
+
+    with pytest.raises(AssertionError, match="503"):
+        client.get("/pets")
+
+    assert len(server.requests) == 2
+    stats = client.request_handler.retry_stats.snapshot()
+    assert stats["retries"] == 1 and stats["budget_exhausted"] == 1
+
+
+def test_post_is_not_retried_on_status(serve):
+    server = serve(_unavailable)
+    client = ApiClient(base_url=server.url, retry_policy=RetryPolicy(max_attempts=3, backoff_base=0))
+
+    with pytest.raises(AssertionError, match="503"):
+        client.post("/pets", payload={"name": "Rex"})
+
+    assert len(server.requests) == 1
+
+
+def test_attempt_timeouts_are_clamped_to_the_deadline():
+    policy = TimeoutPolicy(connect=5, read=30, deadline=10)
+    assert policy.for_attempt(None) == (5, 30)
+    assert policy.for_attempt(2) == (2, 2)
+    with pytest.raises(DeadlineExceeded):
+        policy.for_attempt(0)
+    with pytest.raises(DeadlineExceeded):
+        policy.for_attempt(-0.5)
+
+
+def test_retry_that_would_outlive_the_deadline_is_not_made(serve):
+    server = serve(lambda request: (503, {"Retry-After": "2"}, b""))
+    client = ApiClient(base_url=server.url, timeout_policy=TimeoutPolicy(deadline=1))
+
+    started = time.monotonic()
+    with pytest.raises(AssertionError, match="503"):
+        client.get("/pets")
+
+    assert time.monotonic() - started < 1
+    assert len(server.requests) == 1
+    assert client.request_handler.retry_stats.snapshot()["deadline_exceeded"] == 1
@@ -0,0 +1,73 @@
+from my_codegen.swagger.processor import SwaggerProcessor
+from my_codegen.swagger.resolver import RefResolver
+
+
+def _processor(spec) -> SwaggerProcessor:
+    return SwaggerProcessor(spec, RefResolver(spec))
+
+
+def test_self_referencing_alias_maps_to_its_model():
+    spec = {"paths": {}, "components": {"schemas": {
+        "Tree": {"type": "array", "items": {"$ref": "#/components/schemas/Tree"}},
+        "Names": {"type": "array", "items": {"type": "string"}},
+        "Forest": {"type": "array", "items": {"$ref": "#/components/schemas/Tree"}},
+    }}}
+    processor = _processor(spec)
+
+    assert processor._map_openapi_type_to_python({"$ref": "#/components/schemas/Tree"}) == "List[Tree]"
+    assert processor._map_openapi_type_to_python({"$ref": "#/components/schemas/Forest"}) == "List[List[Tree]]"
+    # Обычные алиасы по-прежнему схлопываются
+    assert processor._map_openapi_type_to_python({"$ref": "#/components/schemas/Names"}) == "List[str]"
+
+
+def test_mutually_recursive_aliases_do_not_recurse_forever():
+    spec = {"paths": {}, "components": {"schemas": {
+        "A": {"type": "array", "items": {"oneOf": [{"type": "string"}, {"$ref": "#/components/schemas/B"}]}},
+        "B": {"type": "array", "items": {"$ref": "#/components/schemas/A"}},
+    }}}
+
+    mapped = _processor(spec)._map_openapi_type_to_python({"$ref": "#/components/schemas/A"})
+
+    assert mapped == "List[Union[str, List[A]]]"
+
+
+def test_endpoints_merge_path_level_parameters_and_skip_non_operations():
+    spec = {"paths": {"/owners/{owner_id}/pets": {
+        "summary": "Pets of an owner",
+        "servers": [{"url": "https://other.example"}],
+        "parameters": [
+            {"name": "owner_id", "in": "path", "required": True, "schema": {"type": "string"}},
+            {"$ref": "#/components/parameters/Limit"},
+            {"name": "X-Trace", "in": "header", "schema": {"type": "string"}},
+        ],
+        "get": {
+            "tags": ["pets", "owners"], "summary": "List owner pets",
+            "parameters": [{"name": "limit", "in": "query", "required": True, "schema": {"type": "integer"}}],
+            "responses": {"200": {"description": "ok"}},
+        },
+        "post": {"operationId": "addPet", "responses": {"201": {"description": "created"}}},
+    }}, "components": {"parameters": {
+        "Limit": {"name": "limit", "in": "query", "schema": {"type": "string"}},
+    }}}
+
+    endpoints = list(_processor(spec).iter_endpoints())
+
+    assert [(e.tag, e.http_method, e.name) for e in endpoints] == [
+        ("pets", "GET", "list_owner_pets"),
+        ("owners", "GET", "list_owner_pets"),
+        ("default", "POST", "addpet"),
+    ]
+    listing = endpoints[0]
+    assert [(p.name, p.type, p.required) for p in listing.path_params] == [("owner_id", "str", True)]
+    # Параметр операции переопределяет одноимённый параметр уровня пути
+    assert [(p.name, p.type, p.required) for p in listing.query_params] == [("limit", "int", True)]
+    assert [p.name for p in endpoints[2].query_params] == ["limit"]
+    assert endpoints[2].expected_status == "CREATED"
+
+
+def test_iter_endpoints_is_lazy():
+    spec = {"paths": {f"/items/{i}": {"get": {"responses": {}}} for i in range(3)}}
+    endpoints = _processor(spec).iter_endpoints()
+
+    assert next(endpoints).path == "/items/0"
+    assert [e.path for e in endpoints] == ["/items/1", "/items/2"]
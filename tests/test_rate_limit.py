@@ -0,0 +1,149 @@
+import threading
+import time
+
+import pytest
+
+from my_codegen.http_clients.api_client import ApiClient
+from my_codegen.http_clients.async_api_client import AsyncApiClient
+from my_codegen.http_clients.policies import DeadlineExceeded, TimeoutPolicy
+from my_codegen.http_clients.rate_limit import InFlightLimit, Limiter, TokenBucket, rate_limits
+
+
+@pytest.fixture
+def limited_service():
+    rate_limits.configure("limited", rate=1, burst=1)
+    try:
+        yield "limited"
+    finally:
+        rate_limits.clear()
+
+
+def test_throttled_caller_does_not_hold_a_slot():
+    limiter = Limiter("svc", TokenBucket(rate=4, burst=1), InFlightLimit(1))
+    limiter.bucket.reserve()
+    entered = threading.Event()
+
+    def throttled():
+        with limiter.acquire():
+            entered.set()
+
+    thread = threading.Thread(target=throttled)
+    thread.start()
+    time.sleep(0.05)
+    # Поток спит в ожидании токена, слот при этом свободен
+    handle = limiter.in_flight.try_acquire()
+    assert handle is not None and not entered.is_set()
+    limiter.in_flight.release(handle)
+    thread.join()
+    assert entered.is_set()
+    assert limiter.stats()["throttled"] == 1
+
+
+def test_token_wait_beyond_deadline_fails_fast_and_refunds():
+    limiter = Limiter("svc", TokenBucket(rate=1, burst=1))
+    with limiter.acquire():
+        pass
+
+    started = time.monotonic()
+    with pytest.raises(DeadlineExceeded, match="token"):
+        with limiter.acquire(deadline=time.monotonic() + 0.1):
+            pass
+    assert time.monotonic() - started < 0.05
+    assert limiter.stats()["deadline_exceeded"] == 1
+    # Токен неудавшегося вызова вернулся: следующий ждёт не дольше секунды
+    assert limiter.bucket.reserve() <= 1.0
+
+
+def test_slot_wait_is_bounded_by_deadline():
+    limiter = Limiter("svc", in_flight=InFlightLimit(1))
+    with limiter.acquire():
+        started = time.monotonic()
+        with pytest.raises(DeadlineExceeded, match="slot"):
+            with limiter.acquire(deadline=time.monotonic() + 0.1):
+                pass
+        assert 0.09 < time.monotonic() - started < 0.5
+
+
+def test_client_call_deadline_covers_rate_limit_wait(stub_server, limited_service):
+    class Limited(ApiClient):
+        _service = limited_service
+
+    client = Limited(base_url=stub_server.url, timeout_policy=TimeoutPolicy(deadline=0.3))
+    client.get("/pets")
+
+    started = time.monotonic()
+    with pytest.raises(DeadlineExceeded):
+        client.get("/pets")
+    assert time.monotonic() - started < 0.3
+    assert len(stub_server.requests) == 1
+    assert client.request_handler.retry_stats.snapshot()["deadline_exceeded"] == 1
+
+
+def test_async_client_call_deadline_covers_rate_limit_wait(stub_server, limited_service, run):
+    class Limited(AsyncApiClient):
+        _service = limited_service
+
+    async def call():
+        async with Limited(base_url=stub_server.url, timeout_policy=TimeoutPolicy(deadline=0.3)) as client:
+            await client.get("/pets")
+            await client.get("/pets")
+
+    with pytest.raises(DeadlineExceeded):
+        run(call())
+    assert len(stub_server.requests) == 1
+
+
+def test_slot_timeout_refunds_the_token():
+    limiter = Limiter("svc", TokenBucket(rate=1, burst=2), InFlightLimit(1))
+    with limiter.acquire():
+        with pytest.raises(DeadlineExceeded, match="slot"):
+            with limiter.acquire(deadline=time.monotonic() + 0.05):
+                pass
+    # Токен неудавшегося вызова вернулся: следующий проходит без ожидания
+    assert limiter.bucket.reserve() == 0.0
+
+
+def test_async_slot_timeout_refunds_the_token(run):
+    limiter = Limiter("svc", TokenBucket(rate=1, burst=2), InFlightLimit(1))
+
+    async def call():
+        async with limiter.acquire_async():
+            with pytest.raises(DeadlineExceeded, match="slot"):
+                async with limiter.acquire_async(deadline=time.monotonic() + 0.05):
+                    pass
+
+    run(call())
+    assert limiter.bucket.reserve() == 0.0
+
+
+def test_service_slot_is_free_while_waiting_for_endpoint_token(limited_service):
+    service = rate_limits.configure(limited_service, max_in_flight=1)
+    endpoint = rate_limits.configure(limited_service, rate=4, burst=1, method="GET", path="/pets")
+    endpoint.bucket.reserve()
+    limits = rate_limits.for_call(limited_service, "GET", "/pets")
+    entered = threading.Event()
+
+    def throttled():
+        with limits.acquire():
+            entered.set()
+
+    thread = threading.Thread(target=throttled)
+    thread.start()
+    time.sleep(0.05)
+    handle = service.in_flight.try_acquire()
+    assert handle is not None and not entered.is_set()
+    service.in_flight.release(handle)
+    thread.join()
+    assert entered.is_set()
+
+
+def test_deadline_on_one_limiter_refunds_tokens_of_the_others(limited_service):
+    service = rate_limits.configure(limited_service, rate=1, burst=1)
+    endpoint = rate_limits.configure(limited_service, rate=1, burst=1, method="GET", path="/pets")
+    endpoint.bucket.reserve()
+    limits = rate_limits.for_call(limited_service, "GET", "/pets")
+
+    with pytest.raises(DeadlineExceeded, match="token"):
+        with limits.acquire(remaining=0.1):
+            pass
+    assert service.bucket.reserve() == 0.0
@@ -0,0 +1,78 @@
+import json
+
+import pytest
+
+from my_codegen.http_clients.api_client import ApiClient
+from my_codegen.utils import logger as logger_module
+from my_codegen.utils.logger import ReportMode, RequestReporter, _as_text
+
+
+@pytest.fixture
+def attachments(monkeypatch):
+    """
+    Вложения Allure вместо настоящего листенера: (имя, текст).
+    """
+    attached = []
+    monkeypatch.setattr(RequestReporter, "allure_active", staticmethod(lambda: True))
+    monkeypatch.setattr(logger_module.allure, "attach",
+                        lambda body, name=None, attachment_type=None, extension=None: attached.append((name, body)))
+    return attached
+
+
+def _client(server_url: str, reporter: RequestReporter) -> ApiClient:
+    client = ApiClient(base_url=server_url)
+    client.request_handler.reporter = reporter
+    return client
+
+
+def _large(request):
+    return 200, {"Content-Type": "application/json"}, json.dumps({"items": ["x" * 100] * 2000}).encode()
+
+
+def test_full_mode_caps_response_body(serve, attachments):
+    client = _client(serve(_large).url, RequestReporter(ReportMode.FULL, max_body_bytes=1024))
+
+    client.get("/pets")
+
+    response = next(body for name, body in attachments if "Response" in name)
+    assert len(response) < 1200
+    assert "truncated" in response
+
+
+def test_summary_mode_attaches_one_line(stub_server, attachments):
+    _client(stub_server.url, RequestReporter(ReportMode.SUMMARY)).get("/pets")
+
+    assert len(attachments) == 1
+    name, body = attachments[0]
+    assert name == "GET 200"
+    assert body.startswith(f"GET {stub_server.url}/pets -> 200 in ")
+
+
+def test_off_mode_and_inactive_allure_attach_nothing(stub_server, attachments, monkeypatch):
+    _client(stub_server.url, RequestReporter(ReportMode.OFF)).get("/pets")
+    monkeypatch.setattr(RequestReporter, "allure_active", staticmethod(lambda: False))
+    _client(stub_server.url, RequestReporter(ReportMode.FULL)).get("/pets")
+
+    assert attachments == []
+
+
+def test_on_failure_mode_attaches_buffered_requests_only_on_failure(stub_server, attachments):
+    client = _client(stub_server.url, RequestReporter(ReportMode.ON_FAILURE, buffer_size=2))
+    for _ in range(3):
+        client.get("/pets")
+    assert attachments == []
+
+    with pytest.raises(AssertionError, match="actual status: 404"):
+        client.get("/pets", params={"status": 404})
+
+    responses = [name for name, _ in attachments if "Response" in name]
+    assert responses == ["⬅️ GET 200 -  Response", "⬅️ GET 404 -  Response"]
+    assert not client.request_handler.reporter._buffer()
+
+
+def test_as_text_decodes_only_the_kept_prefix():
+    text = _as_text("я".encode() * 100, max_bytes=11)
+
+    assert text.startswith("яяяяя�")
+    assert text.endswith("truncated, 200 bytes total")
+    assert _as_text(b"{}", max_bytes=None) == "{}"
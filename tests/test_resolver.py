@@ -0,0 +1,119 @@
+import json
+import os
+import shutil
+
+import pytest
+import yaml
+
+from my_codegen.codegen.manifest import MANIFEST_FILE
+from my_codegen.main import GenerationOptions, generate_service
+from my_codegen.swagger.fetcher import SpecFetcher
+from my_codegen.swagger.resolver import CircularRefError, RefResolver
+
+SPEC = {
+    "openapi": "3.0.1",
+    "info": {"title": "Pets", "version": "1.0"},
+    "paths": {},
+    "components": {"schemas": {
+        "Pet": {"type": "object", "properties": {"owner": {"$ref": "#/components/schemas/Owner"}}},
+        "Owner": {"$ref": "#/components/schemas/Person"},
+        "Person": {"type": "object", "properties": {"name": {"type": "string"}}},
+        "a/b": {"type": "string"},
+    }},
+}
+
+
+def test_index_resolves_pointers_and_ref_chains():
+    resolver = RefResolver(SPEC)
+
+    assert resolver.index["/components/schemas/Pet/properties/owner"] == {"$ref": "#/components/schemas/Owner"}
+    assert resolver.resolve("#/components/schemas/Owner") is SPEC["components"]["schemas"]["Person"]
+    assert resolver.resolve("#/components/schemas/a~1b") == {"type": "string"}
+    assert resolver.deref({"$ref": "#/components/schemas/Person"})["type"] == "object"
+    assert resolver.deref({"type": "string"}) == {"type": "string"}
+    assert not resolver.bundled
+
+
+def test_resolved_chains_are_memoized():
+    resolver = RefResolver(SPEC)
+    resolver.resolve("#/components/schemas/Owner")
+    resolver.index.clear()
+    # Ответ из кэша, по индексу уже не ходим
+    assert resolver.resolve("#/components/schemas/Owner")["type"] == "object"
+    with pytest.raises(KeyError):
+        resolver.resolve("#/components/schemas/Pet")
+
+
+def test_circular_ref_chain_is_reported():
+    resolver = RefResolver({"components": {"schemas": {
+        "A": {"$ref": "#/components/schemas/B"},
+        "B": {"$ref": "#/components/schemas/A"},
+    }}})
+    with pytest.raises(CircularRefError, match="A -> .*B -> .*A"):
+        resolver.resolve("#/components/schemas/A")
+
+
+def test_external_refs_are_bundled(tmp_path):
+    (tmp_path / "common.yaml").write_text(yaml.safe_dump({"components": {"schemas": {
+        "Error": {"type": "object", "properties": {"detail": {"$ref": "#/components/schemas/Detail"}}},
+        "Detail": {"type": "string"},
+    }}, "responses": {"NotFound": {"description": "missing"}}}))
+    (tmp_path / "tag.yaml").write_text(yaml.safe_dump({"type": "object", "properties": {"label": {"type": "string"}}}))
+    spec = {
+        "paths": {"/pets": {"get": {"responses": {
+            "404": {"$ref": "common.yaml#/responses/NotFound"},
+            "500": {"description": "oops", "content": {"application/json": {
+                "schema": {"$ref": "common.yaml#/components/schemas/Error"}}}},
+        }}}},
+        "components": {"schemas": {"Tag": {"$ref": "tag.yaml"}}},
+    }
+
+    resolver = RefResolver(spec, base_uri=str(tmp_path / "api.yaml"))
+
+    assert resolver.bundled
+    assert resolver.external_documents == [str(tmp_path / "common.yaml"), str(tmp_path / "tag.yaml")]
+    responses = resolver.spec["paths"]["/pets"]["get"]["responses"]
+    assert responses["404"] == {"description": "missing"}
+    schemas = resolver.spec["components"]["schemas"]
+    assert responses["500"]["content"]["application/json"]["schema"] == {"$ref": "#/components/schemas/Error"}
+    assert schemas["Error"]["properties"]["detail"] == {"$ref": "#/components/schemas/Detail"}
+    assert schemas["Tag"] == {"$ref": "#/components/schemas/tag"}
+    assert resolver.resolve("#/components/schemas/Tag")["properties"]["label"] == {"type": "string"}
+
+
+def test_change_in_external_document_rebuilds_the_service(tmp_path):
+    if shutil.which("datamodel-codegen") is None:
+        pytest.skip("datamodel-codegen is not installed")
+    common = tmp_path / "common.json"
+    common.write_text(json.dumps({"components": {"schemas": {
+        "Pet": {"type": "object", "properties": {"name": {"type": "string"}}},
+    }}}))
+    spec_path = tmp_path / "pets.json"
+    spec_path.write_text(json.dumps({
+        "openapi": "3.0.1",
+        "info": {"title": "Pets", "version": "1.0"},
+        "paths": {"/pets": {"get": {"tags": ["pets"], "summary": "List pets", "responses": {"200": {
+            "description": "ok",
+            "content": {"application/json": {"schema": {"$ref": "common.json#/components/schemas/Pet"}}},
+        }}}}},
+    }))
+
+    def build() -> str:
+        return generate_service(
+            str(spec_path), str(tmp_path / "out"), GenerationOptions(format_workers=1),
+            SpecFetcher(cache_dir=str(tmp_path / "cache")),
+        )
+
+    service_dir = tmp_path / "out" / build()
+    manifest = service_dir / MANIFEST_FILE
+    built_at = os.stat(manifest).st_mtime_ns
+
+    build()
+    # Ничего не поменялось - сборка пропущена целиком, манифест не переписан
+    assert os.stat(manifest).st_mtime_ns == built_at
+
+    common.write_text(json.dumps({"components": {"schemas": {
+        "Pet": {"type": "object", "properties": {"name": {"type": "string"}, "nickname": {"type": "string"}}},
+    }}}))
+    build()
+    assert "nickname" in (service_dir / "models.py").read_text()
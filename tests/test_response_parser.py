@@ -0,0 +1,68 @@
+import pydantic
+import pytest
+from pydantic import BaseModel
+
+from my_codegen.http_clients.api_client import ApiClient
+from my_codegen.http_clients.response_parser import (
+    LazyModelList,
+    ParseMode,
+    parse_model,
+    parse_model_list,
+    sample_indices,
+)
+
+
+class Pet(BaseModel):
+    id: int
+    name: str
+
+
+ITEMS = [{"id": i, "name": f"pet{i}"} for i in range(10)]
+BROKEN = [{"id": i, "name": f"pet{i}"} for i in range(9)] + [{"id": "x", "name": "bad"}]
+
+
+def test_lazy_list_validates_elements_on_access():
+    pets = parse_model_list(Pet, BROKEN, ParseMode.LAZY)
+
+    assert isinstance(pets, LazyModelList) and len(pets) == 10
+    assert pets[0] == Pet(id=0, name="pet0")
+    assert pets[0] is pets[0]
+    assert repr(pets) == "LazyModelList[Pet](10 items, 1 built)"
+    assert [pet.id for pet in pets[2:5]] == [2, 3, 4]
+    with pytest.raises(pydantic.ValidationError):
+        pets[-1]
+
+
+def test_construct_skips_validation():
+    pets = parse_model_list(Pet, BROKEN, ParseMode.CONSTRUCT)
+
+    assert pets[-1].id == "x"
+    assert parse_model(Pet, {"id": "1", "name": "Rex"}, ParseMode.CONSTRUCT).id == "1"
+    assert parse_model(Pet, {"id": "1", "name": "Rex"}, ParseMode.VALIDATE).id == 1
+    with pytest.raises(pydantic.ValidationError):
+        parse_model_list(Pet, BROKEN, ParseMode.VALIDATE)
+
+
+def test_sampled_validates_first_last_and_evenly_spaced():
+    assert sample_indices(10, 3) == {0, 4, 9}
+    assert sample_indices(10, 1) == {0}
+    assert sample_indices(3, 10) == {0, 1, 2}
+    assert sample_indices(0, 10) == set()
+
+    with pytest.raises(pydantic.ValidationError):
+        parse_model_list(Pet, BROKEN, ParseMode.SAMPLED, sample_size=2)
+    unchecked = [{"id": 0, "name": "a"}, {"id": "x", "name": "b"}, {"id": 2, "name": "c"}]
+    assert parse_model_list(Pet, unchecked, ParseMode.SAMPLED, sample_size=2)[1].id == "x"
+
+
+def test_mode_from_class_is_overridden_per_client_and_instance(stub_server):
+    class LazyClient(ApiClient):
+        parse_mode = ParseMode.LAZY
+
+    assert LazyClient(base_url=stub_server.url).parse_mode is ParseMode.LAZY
+    client = LazyClient(base_url=stub_server.url, parse_mode="construct")
+    assert client.parse_mode is ParseMode.CONSTRUCT
+    assert isinstance(client._parse_list(Pet, ITEMS), list)
+
+    client.parse_mode = ParseMode.LAZY
+    assert isinstance(client._parse_list(Pet, ITEMS), LazyModelList)
@@ -0,0 +1,120 @@
+import importlib
+import json
+import shutil
+import sys
+
+import pytest
+
+from my_codegen.http_clients.api_client import ApiClient
+from my_codegen.http_clients.session_pool import PoolSettings, SessionRegistry, session_registry
+from my_codegen.main import GenerationOptions, generate_service
+from my_codegen.swagger.fetcher import SpecFetcher
+
+PETS = {
+    "openapi": "3.0.1",
+    "info": {"title": "Pets", "version": "1.0"},
+    "paths": {
+        "/pets": {
+            "get": {
+                "tags": ["pets"], "summary": "List pets",
+                "responses": {"200": {"description": "ok", "content": {"application/json": {
+                    "schema": {"$ref": "#/components/schemas/Page"}}}}},
+            },
+        },
+    },
+    "components": {"schemas": {
+        "Page": {"type": "object", "properties": {"method": {"type": "string"}}},
+    }},
+}
+
+
+def _page(request):
+    return 200, {"Content-Type": "application/json"}, json.dumps({"method": request.method}).encode()
+
+
+def test_session_lives_while_referenced():
+    registry = SessionRegistry()
+    first = registry.acquire("http://api.local/a")
+    second = registry.acquire("http://api.local/b")
+    assert first is second
+    assert registry.stats() == {"http://api.local": 2}
+
+    registry.release("http://api.local/a")
+    assert registry.stats() == {"http://api.local": 1}
+    registry.release("http://api.local/b")
+    assert registry.stats() == {}
+    # После последнего release ключ открывает новую сессию
+    assert registry.acquire("http://api.local") is not first
+
+
+def test_sessions_are_keyed_by_origin_and_pool_settings():
+    registry = SessionRegistry()
+    session = registry.acquire("http://API.local:8080/v1")
+    assert registry.acquire("http://api.local:8080/v2") is session
+    assert registry.acquire("https://api.local:8080/v1") is not session
+    assert registry.acquire("http://api.local:8081/v1") is not session
+    assert registry.acquire("http://api.local:8080/v1", PoolSettings(pool_maxsize=50)) is not session
+    registry.close_all()
+
+
+def test_shared_session_does_not_leak_cookies_between_clients(serve):
+    def login(request):
+        if request.path == "/login":
+            return 200, {"Set-Cookie": "sid=alice; Path=/"}, b"{}"
+        return 200, {"Content-Type": "application/json"}, json.dumps({"cookie": request.headers.get("Cookie")}).encode()
+
+    server = serve(login)
+    alice, bob = ApiClient(base_url=server.url), ApiClient(base_url=server.url)
+    assert alice.request_handler.session is bob.request_handler.session
+
+    alice.get("/login")
+    assert alice.get("/me") == {"cookie": "sid=alice"}
+    assert bob.get("/me") == {"cookie": None}
+    assert not alice.request_handler.session.cookies
+
+
+def test_request_after_warm_up_reuses_warmed_connection(serve):
+    server = serve(_page)
+    client = ApiClient(base_url=server.url)
+
+    assert client.warm_up() == 1
+    client.get("/pets")
+
+    head, get = server.requests
+    assert head.method == "HEAD"
+    assert get.client_port == head.client_port
+
+
+@pytest.fixture
+def generated_service(tmp_path, monkeypatch):
+    if shutil.which("datamodel-codegen") is None:
+        pytest.skip("datamodel-codegen is not installed")
+    spec_path = tmp_path / "pets.json"
+    spec_path.write_text(json.dumps(PETS))
+    service = generate_service(
+        str(spec_path),
+        str(tmp_path / "http_clients"),
+        GenerationOptions(format_workers=1),
+        SpecFetcher(cache_dir=str(tmp_path / "cache")),
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield service
+    for name in [name for name in sys.modules if name == "http_clients" or name.startswith("http_clients.")]:
+        del sys.modules[name]
+
+
+def test_facade_keeps_warmed_session_until_close(generated_service, serve):
+    server = serve(_page)
+    facade_module = importlib.import_module(f"http_clients.{generated_service}.facade")
+    api = facade_module.PetsApi(base_url=server.url)
+
+    assert api.warm_up() == 1
+    # Клиент создаётся лениво уже после прогрева и получает ту же тёплую сессию
+    api.pets.list_pets()
+    head, get = server.requests
+    assert get.client_port == head.client_port
+
+    origin = session_registry.key(server.url, api.pool_settings)[0]
+    assert session_registry.stats()[origin] == 2
+    api.close()
+    assert origin not in session_registry.stats()
@@ -0,0 +1,130 @@
+import os
+
+import pytest
+import requests
+
+from my_codegen.http_clients.api_client import StorageS3
+from my_codegen.http_clients.policies import RetryPolicy, TimeoutPolicy
+
+from conftest import S3StandIn
+
+PART_SIZE = 64 * 1024
+
+
+@pytest.fixture
+def large_file(tmp_path):
+    path = tmp_path / "large.bin"
+    path.write_bytes(os.urandom(PART_SIZE * 5 + 123))
+    return str(path)
+
+
+def _storage(server) -> StorageS3:
+    return StorageS3(f"{server.url}/bucket/large.bin")
+
+
+def test_parts_are_uploaded_concurrently_and_completed(serve, large_file):
+    s3 = S3StandIn(part_delay=0.1)
+    storage = _storage(serve(s3))
+    progress = []
+
+    result = storage.upload_large(large_file, part_size=PART_SIZE, max_workers=4, progress=lambda *p: progress.append(p))
+
+    with open(large_file, "rb") as f:
+        assert s3.objects == [f.read()]
+    assert result.multipart and result.parts == 6 and result.retried_parts == 0
+    assert result.bytes_sent == os.path.getsize(large_file)
+    assert s3.max_in_flight > 1
+    assert s3.max_in_flight <= 4
+    assert progress[-1] == (result.bytes_sent, result.bytes_sent)
+    assert not s3.aborted
+
+
+def test_failed_part_is_retried_alone(serve, large_file):
+    s3 = S3StandIn(fail_parts={3: 1})
+    storage = _storage(serve(s3))
+
+    result = storage.upload_large(large_file, part_size=PART_SIZE, max_workers=2)
+
+    assert result.retried_parts == 1
+    assert s3.part_attempts == {1: 1, 2: 1, 3: 2, 4: 1, 5: 1, 6: 1}
+    with open(large_file, "rb") as f:
+        assert s3.objects == [f.read()]
+
+
+def test_part_failing_every_attempt_aborts_upload(serve, large_file):
+    s3 = S3StandIn(fail_parts={2: 10})
+    server = serve(s3)
+
+    with pytest.raises(AssertionError, match="actual status: 500"):
+        _storage(server).upload_large(large_file, part_size=PART_SIZE, max_workers=2, max_attempts=2)
+
+    assert len(s3.aborted) == 1
+    assert not s3.objects
+    assert [r.method for r in server.requests if "uploadId" in r.query and "partNumber" not in r.query] == ["DELETE"]
+
+
+def test_falls_back_to_streaming_put_without_multipart(serve, large_file):
+    s3 = S3StandIn(multipart=False)
+    server = serve(s3)
+
+    result = _storage(server).upload_large(large_file, part_size=PART_SIZE)
+
+    assert not result.multipart and result.parts == 1
+    with open(large_file, "rb") as f:
+        assert s3.objects == [f.read()]
+    assert [(r.method, sorted(r.query)) for r in server.requests] == [("POST", ["uploads"]), ("PUT", [])]
+
+
+def test_small_file_goes_as_single_put(serve, tmp_path):
+    s3 = S3StandIn()
+    server = serve(s3)
+    path = tmp_path / "small.bin"
+    path.write_bytes(b"x" * 100)
+
+    result = _storage(server).upload_large(str(path), part_size=PART_SIZE)
+
+    assert not result.multipart
+    assert s3.objects == [b"x" * 100]
+    assert [r.method for r in server.requests] == ["PUT"]
+
+
+def test_throughput_is_reported(serve, large_file):
+    result = _storage(serve(S3StandIn())).upload_large(large_file, part_size=PART_SIZE)
+
+    assert result.elapsed > 0
+    assert result.mb_per_second == pytest.approx(result.bytes_sent / (1024 * 1024) / result.elapsed)
+    assert result.mb_per_second > 0
+
+
+def test_hung_part_times_out_and_aborts(serve, large_file):
+    s3 = S3StandIn(part_delay=2)
+    storage = StorageS3(
+        f"{serve(s3).url}/bucket/large.bin",
+        retry_policy=RetryPolicy(max_attempts=1),
+        timeout_policy=TimeoutPolicy(connect=1, read=0.2, deadline=5),
+    )
+
+    with pytest.raises(requests.Timeout):
+        storage.upload_large(large_file, part_size=PART_SIZE, max_workers=2, max_attempts=1)
+
+    assert len(s3.aborted) == 1
+
+
+def test_part_503_is_retried_by_client_policy(serve, large_file):
+    s3 = S3StandIn()
+    replies = iter([(503, {"Retry-After": "0"}, b"")])
+
+    def flaky_part(request):
+        if request.query.get("partNumber") == "2":
+            return next(replies, None) or s3(request)
+        return s3(request)
+
+    server = serve(flaky_part)
+
+    result = StorageS3(f"{server.url}/bucket/large.bin").upload_large(large_file, part_size=PART_SIZE)
+
+    # Повтор сделал RetryPolicy внутри одной попытки upload_part
+    assert result.retried_parts == 0
+    assert [r.query.get("partNumber") for r in server.requests].count("2") == 2
+    with open(large_file, "rb") as f:
+        assert s3.objects == [f.read()]
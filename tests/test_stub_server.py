@@ -0,0 +1,96 @@
+import json
+import threading
+import types
+
+import pytest
+from pydantic import BaseModel
+
+from my_codegen.codegen.data_models import Endpoint
+from my_codegen.http_clients.api_client import ApiClient
+from my_codegen.stub.server import FaultProfile, StubApp, load_endpoints, serve
+
+
+class Pet(BaseModel):
+    id: int
+    name: str
+
+
+MODELS = types.SimpleNamespace(Pet=Pet)
+
+ENDPOINTS = [
+    Endpoint("pets", "list_pets", "GET", "/pets", return_type="List[Pet]"),
+    Endpoint("pets", "get_pet", "GET", "/pets/{pet_id}", return_type="Pet"),
+    Endpoint("pets", "get_my_pet", "GET", "/pets/mine", return_type="str"),
+    Endpoint("pets", "create_pet", "POST", "/pets", expected_status="CREATED", return_type="Pet"),
+    Endpoint("pets", "delete_pet", "DELETE", "pets/{pet_id}", expected_status="NO_CONTENT"),
+    # Та же операция под вторым тегом
+    Endpoint("owners", "list_pets", "GET", "/pets", return_type="List[Pet]"),
+]
+
+
+def test_routes_literal_segments_before_parameters_with_optional_prefix():
+    app = StubApp(ENDPOINTS, service_name="pet-store", models=MODELS)
+
+    assert len(app.routes["GET"]) == 3
+    assert app.match("GET", "/pets/mine").endpoint.name == "get_my_pet"
+    assert app.match("GET", "/pet-store/pets/7?full=1").endpoint.name == "get_pet"
+    assert app.match("DELETE", "/pets/7/").status == 204
+    assert app.match("GET", "/other/pets") is None
+    assert app.match("PUT", "/pets") is None
+
+
+def test_bodies_follow_return_type_and_are_cached():
+    app = StubApp(ENDPOINTS, models=MODELS)
+
+    status, body, delay = app.respond("GET", "/pets")
+    pets = json.loads(body)
+    assert status == 200 and delay == 0
+    assert len(pets) == 3 and [Pet(**pet) for pet in pets]
+    assert app.respond("GET", "/pets")[1] is body
+    assert app.respond("POST", "/pets")[0] == 201
+    assert app.respond("DELETE", "/pets/1")[:2] == (204, b"")
+    assert app.respond("GET", "/missing")[0] == 404
+    # Без модуля моделей тело модели - пустой объект
+    assert StubApp(ENDPOINTS).respond("GET", "/pets/1")[1] == b"{}"
+
+
+def test_fault_profile_injects_errors_and_latency():
+    app = StubApp(ENDPOINTS, models=MODELS, seed=1,
+                  faults=FaultProfile(latency_ms=10, jitter_ms=5, error_rate=1, error_statuses=(503,)))
+
+    status, body, delay = app.respond("GET", "/pets")
+
+    assert status == 503 and json.loads(body) == {"detail": "injected error"}
+    assert 0.010 <= delay <= 0.015
+    slow = FaultProfile(slow_rate=1, slow_ms=200)
+    assert slow.delay(app._rng) == pytest.approx(0.2)
+    assert FaultProfile().error(app._rng) is None
+
+
+def test_generated_client_talks_to_stub_built_from_spec(tmp_path):
+    spec = {
+        "openapi": "3.0.0",
+        "info": {"title": "Pet Store", "version": "1"},
+        "servers": [{"url": "/pet-store"}],
+        "paths": {"/pets/{pet_id}": {"get": {
+            "tags": ["pets"], "summary": "Get pet",
+            "parameters": [{"name": "pet_id", "in": "path", "required": True, "schema": {"type": "integer"}}],
+            "responses": {"200": {"description": "ok", "content": {"application/json": {
+                "schema": {"$ref": "#/components/schemas/Pet"}}}}},
+        }}},
+        "components": {"schemas": {"Pet": {"type": "object", "properties": {
+            "id": {"type": "integer"}, "name": {"type": "string"}}}}},
+    }
+    spec_path = tmp_path / "openapi.json"
+    spec_path.write_text(json.dumps(spec))
+    service_name, endpoints = load_endpoints(str(spec_path))
+    server = serve(StubApp(endpoints, service_name, MODELS), port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        host, port = server.server_address[:2]
+        client = ApiClient(base_url=f"http://{host}:{port}")
+
+        assert Pet(**client.get("/{service}/pets/{pet_id}", service=service_name, pet_id=1))
+    finally:
+        server.shutdown()
+        server.server_close()